@@ -9,4 +9,7 @@ db-init: ## Run docker/mysql/init.sh
 	$(call ask_confirmation_if_prod)
 	@env $(call load_env,$(ENV_FILE)) MYSQL_CONTAINER_NAME=$(call get_database_container_name_by_mode,$(call get_mode)) bash docker/mysql/init.sh
 
+db-index-advisor: ## Report query plan filter columns without index
+	poetry run python -m shop_project.infrastructure.persistence.database.index_advisor
+
 endif
\ No newline at end of file
@@ -23,4 +23,7 @@ tests-with-integration: ## Run all tests including integration
 profile-with-integration: ## Run all tests including integration with profiling
 	$(call RUN_TESTS, -m "not inmemory" --real-db --real-broker --profile --element-number 100)
 
+benchmarks: ## Run benchmarks only
+	$(call RUN_TESTS,-m "benchmark" --benchmark)
+
 endif
@@ -35,12 +35,15 @@ from shop_project.application.shared.interfaces.interface_resource_container imp
 )
 from shop_project.application.shared.interfaces.interface_session_service import (
     ISessionService,
+    SessionRefresh,
 )
 from shop_project.application.shared.interfaces.interface_totp_service import (
     ITotpService,
 )
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWork,
     IUnitOfWorkFactory,
+    RetryPolicy,
 )
 from shop_project.domain.entities.customer import Customer
 from shop_project.domain.entities.employee import Employee
@@ -94,16 +97,9 @@ class AuthenticationService:
     async def _refresh_session(
         self, subject_type: Type[Subject], refresh_token: str
     ) -> SessionRefreshSchema:
-        async with self._unit_of_work_factory.create(
-            self._query_builder_type(mutating=True)
-            .load(AuthSession)
-            .from_attribute("refresh_token_fingerprint", [refresh_token])
-            .for_update()
-            .load(subject_type)
-            .from_previous(0)
-            .for_share()
-            .build()
-        ) as uow:
+        # Из двух одновременных обновлений по одному токену проходит одно:
+        # второе повторяется и уже не находит сессию со старым токеном
+        async def refresh(uow: IUnitOfWork) -> SessionRefresh:
             resources = uow.get_resources()
 
             auth_session = _get_one_auth_session_or_abort(resources)
@@ -114,6 +110,21 @@ class AuthenticationService:
             )
             uow.mark_commit()
 
+            return session_refresh
+
+        session_refresh = await self._unit_of_work_factory.run(
+            lambda: self._query_builder_type(mutating=True)
+            .load(AuthSession)
+            .from_attribute("refresh_token_fingerprint", [refresh_token])
+            .optimistic()
+            .load(subject_type)
+            .from_previous(0)
+            .for_share()
+            .build(),
+            refresh,
+            retry=RetryPolicy(),
+        )
+
         return SessionRefreshSchema.model_validate(
             session_refresh, from_attributes=True
         )
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Generic, Type, TypeVar
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class TaskHandlerRegistry:
@@ -35,6 +35,20 @@ class NullTaskParams(BaseTaskParams):
     pass
 
 
+class BatchTaskParams(BaseTaskParams):
+    # Каждая пачка обрабатывается в своей транзакции
+    chunk_size: int = Field(default=100, gt=0)
+    # Сущности делятся между параллельными задачами по хэшу entity_id
+    partition_count: int = Field(default=1, gt=0)
+    partition_index: int = Field(default=0, ge=0)
+
+    @model_validator(mode="after")
+    def _check_partition(self) -> "BatchTaskParams":
+        if self.partition_index >= self.partition_count:
+            raise ValueError("partition_index must be less than partition_count")
+        return self
+
+
 T = TypeVar("T", bound=BaseTaskParams | None)
 
 
@@ -0,0 +1,52 @@
+from typing import Type
+from uuid import UUID
+
+from shop_project.application.background.base_task_handler import (
+    BaseTaskHandler,
+    BatchTaskParams,
+)
+from shop_project.application.shared.interfaces.interface_inventory_ledger_service import (
+    IInventoryLedgerService,
+)
+from shop_project.application.shared.interfaces.interface_query_builder import (
+    IQueryBuilder,
+)
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWorkFactory,
+)
+from shop_project.application.shared.scenarios.batch import (
+    complete_batch_task,
+    read_batch_task_params,
+)
+
+
+class InventoryLedgerCompactionTaskHandler(BaseTaskHandler[BatchTaskParams]):
+    handler_name = "inventory_ledger_compaction"
+
+    def __init__(
+        self,
+        unit_of_work_factory: IUnitOfWorkFactory,
+        query_builder_type: Type[IQueryBuilder],
+        inventory_ledger_service: IInventoryLedgerService,
+    ) -> None:
+        self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
+        self._query_builder_type: Type[IQueryBuilder] = query_builder_type
+        self._inventory_ledger_service: IInventoryLedgerService = (
+            inventory_ledger_service
+        )
+
+    async def handle(self, task_id: UUID) -> None:
+        params = await read_batch_task_params(
+            self._unit_of_work_factory,
+            self._query_builder_type,
+            task_id,
+            BatchTaskParams,
+        )
+
+        # Свёрнутые движения помечаются в той же транзакции, повторная
+        # доставка их не задвоит
+        await self._inventory_ledger_service.compact(params.chunk_size)
+
+        await complete_batch_task(
+            self._unit_of_work_factory, self._query_builder_type, task_id
+        )
@@ -4,10 +4,11 @@ from uuid import UUID
 
 from shop_project.application.background.base_task_handler import (
     BaseTaskHandler,
-    NullTaskParams,
+    BatchTaskParams,
+)
+from shop_project.application.entities.operation_log.operation_code import (
+    OperationCodeEnum,
 )
-from shop_project.application.background.exceptions import RetryException
-from shop_project.application.entities.task import Task
 from shop_project.application.shared.dto.mapper import to_dto
 from shop_project.application.shared.interfaces.interface_payment_gateway import (
     CreatePaymentRequest,
@@ -27,6 +28,18 @@ from shop_project.application.shared.operation_log_payload_factories.purchase im
     create_pay_purchase_payload,
     create_refund_purchase_payload,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
+from shop_project.application.shared.scenarios.batch import (
+    complete_batch_task,
+    iterate_partition_chunks,
+    read_batch_task_params,
+)
+from shop_project.application.shared.scenarios.inventory import (
+    append_deferred_restocks,
+    create_product_inventory,
+)
 from shop_project.application.shared.scenarios.operation_log import log_operation
 from shop_project.application.shared.scenarios.payment import (
     get_payment_state_map,
@@ -34,7 +47,6 @@ from shop_project.application.shared.scenarios.payment import (
 from shop_project.application.shared.scenarios.purchase import (
     get_escrow_purchase_active_map,
 )
-from shop_project.application.shared.scenarios.task import capture_task
 from shop_project.domain.entities.escrow_account import (
     EscrowAccount,
     EscrowAccountState,
@@ -42,7 +54,6 @@ from shop_project.domain.entities.escrow_account import (
 from shop_project.domain.entities.product import Product
 from shop_project.domain.entities.purchase_active import PurchaseActive
 from shop_project.domain.entities.purchase_summary import PurchaseSummary
-from shop_project.domain.helpers.product_inventory import ProductInventory
 from shop_project.domain.services.purchase_activation_service import (
     PurchaseActivationService,
 )
@@ -50,7 +61,7 @@ from shop_project.domain.services.purchase_claim_service import PurchaseClaimSer
 from shop_project.domain.services.purchase_return_service import PurchaseReturnService
 
 
-class BatchWaitPaymentTaskHandler(BaseTaskHandler[NullTaskParams]):
+class BatchWaitPaymentTaskHandler(BaseTaskHandler[BatchTaskParams]):
     handler_name = "batch_wait_payment"
 
     def __init__(
@@ -72,19 +83,37 @@ class BatchWaitPaymentTaskHandler(BaseTaskHandler[NullTaskParams]):
         self._payment_gateway: IPaymentGateway = payment_gateway
 
     async def handle(self, task_id: UUID) -> None:
+        params = await read_batch_task_params(
+            self._unit_of_work_factory,
+            self._query_builder_type,
+            task_id,
+            BatchTaskParams,
+        )
+
+        async for escrow_ids in iterate_partition_chunks(
+            self._unit_of_work_factory,
+            self._query_builder_type(mutating=False)
+            .load(EscrowAccount)
+            .from_attribute("state", [EscrowAccountState.PENDING.value]),
+            params,
+        ):
+            await self._handle_chunk(escrow_ids)
+
+        await complete_batch_task(
+            self._unit_of_work_factory, self._query_builder_type, task_id
+        )
+
+    async def _handle_chunk(self, escrow_ids: list[UUID]) -> None:
         async with self._unit_of_work_factory.create(
             self._query_builder_type(mutating=True)
-            .load(Task)
-            .from_attribute("entity_id", [task_id])
-            .for_update(no_wait=True)
             .load(EscrowAccount)
+            .from_id(escrow_ids)
+            .and_()
             .from_attribute("state", [EscrowAccountState.PENDING.value])
-            .for_update()
-            .build(),
-            exception_on_nowait=RetryException,
+            .for_update(skip_locked=True)
+            .build()
         ) as uow:
             resources = uow.get_resources()
-            capture_task(resources, task_id)
             state_map = await get_payment_state_map(resources, self._payment_gateway)
 
             for escrow_account in state_map.get(PaymentState.PAID, []):
@@ -119,7 +148,7 @@ class BatchWaitPaymentTaskHandler(BaseTaskHandler[NullTaskParams]):
         )
 
 
-class BatchFinalizeNotPaidTasksHandler(BaseTaskHandler[NullTaskParams]):
+class BatchFinalizeNotPaidTasksHandler(BaseTaskHandler[BatchTaskParams]):
     handler_name = "batch_finalize_not_paid"
 
     def __init__(
@@ -130,6 +159,7 @@ class BatchFinalizeNotPaidTasksHandler(BaseTaskHandler[NullTaskParams]):
         purchase_claim_service: PurchaseClaimService,
         purchase_return_service: PurchaseReturnService,
         payment_gateway: IPaymentGateway,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
@@ -139,32 +169,59 @@ class BatchFinalizeNotPaidTasksHandler(BaseTaskHandler[NullTaskParams]):
         self._purchase_claim_service: PurchaseClaimService = purchase_claim_service
         self._purchase_return_service: PurchaseReturnService = purchase_return_service
         self._payment_gateway: IPaymentGateway = payment_gateway
+        self._inventory_reservation_policy: InventoryReservationPolicy = (
+            inventory_reservation_policy
+        )
 
     async def handle(self, task_id: UUID) -> None:
-        async with self._unit_of_work_factory.create(
+        params = await read_batch_task_params(
+            self._unit_of_work_factory,
+            self._query_builder_type,
+            task_id,
+            BatchTaskParams,
+        )
+
+        async for escrow_ids in iterate_partition_chunks(
+            self._unit_of_work_factory,
+            self._query_builder_type(mutating=False)
+            .load(EscrowAccount)
+            .from_attribute("state", [EscrowAccountState.PAYMENT_CANCELLED.value]),
+            params,
+        ):
+            await self._handle_chunk(escrow_ids)
+
+        await complete_batch_task(
+            self._unit_of_work_factory, self._query_builder_type, task_id
+        )
+
+    async def _handle_chunk(self, escrow_ids: list[UUID]) -> None:
+        ledger = self._inventory_reservation_policy.ledger
+        query_builder = (
             self._query_builder_type(mutating=True)
-            .load(Task)
-            .from_attribute("entity_id", [task_id])
-            .for_update(no_wait=True)
             .load(EscrowAccount)
+            .from_id(escrow_ids)
+            .and_()
             .from_attribute("state", [EscrowAccountState.PAYMENT_CANCELLED.value])
-            .for_update()
+            .for_update(skip_locked=True)
             .load(PurchaseActive)
             .from_previous()
             .for_update()
             .load(Product)
             .from_previous()
-            .for_update()
-            .build(),
-            exception_on_nowait=RetryException,
-        ) as uow:
+        )
+        query_builder = (
+            query_builder.no_lock() if ledger else query_builder.for_update()
+        )
+
+        async with self._unit_of_work_factory.create(query_builder.build()) as uow:
             resources = uow.get_resources()
-            capture_task(resources, task_id)
 
             escrow_purchase_map: list[tuple[EscrowAccount, PurchaseActive]] = (
                 get_escrow_purchase_active_map(resources)
             )
-            product_inventory = ProductInventory(resources.get_all(Product))
+            product_inventory = create_product_inventory(
+                resources.get_all(Product), ledger
+            )
 
             for escrow, purchase in escrow_purchase_map:
                 summary = self._purchase_return_service.handle_cancelled_payment(
@@ -175,6 +232,10 @@ class BatchFinalizeNotPaidTasksHandler(BaseTaskHandler[NullTaskParams]):
                 resources.delete(PurchaseActive, purchase)
                 resources.put(PurchaseSummary, summary)
 
+            append_deferred_restocks(
+                uow, product_inventory, OperationCodeEnum.FINALIZE_CANCELLED_PURCHASE
+            )
+
             for escrow, _ in escrow_purchase_map:
                 summary: PurchaseSummary = resources.get_one_by_attribute(
                     PurchaseSummary, "escrow_account_id", escrow.entity_id
@@ -188,7 +249,7 @@ class BatchFinalizeNotPaidTasksHandler(BaseTaskHandler[NullTaskParams]):
             uow.mark_commit()
 
 
-class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[NullTaskParams]):
+class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[BatchTaskParams]):
     handler_name = "batch_paid_reservation_time_out"
 
     def __init__(
@@ -199,6 +260,7 @@ class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[NullTaskParams]):
         purchase_claim_service: PurchaseClaimService,
         purchase_return_service: PurchaseReturnService,
         payment_gateway: IPaymentGateway,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
@@ -208,16 +270,40 @@ class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[NullTaskParams]):
         self._purchase_claim_service: PurchaseClaimService = purchase_claim_service
         self._purchase_return_service: PurchaseReturnService = purchase_return_service
         self._payment_gateway: IPaymentGateway = payment_gateway
+        self._inventory_reservation_policy: InventoryReservationPolicy = (
+            inventory_reservation_policy
+        )
 
     async def handle(self, task_id: UUID) -> None:
-        async with self._unit_of_work_factory.create(
+        params = await read_batch_task_params(
+            self._unit_of_work_factory,
+            self._query_builder_type,
+            task_id,
+            BatchTaskParams,
+        )
+
+        async for escrow_ids in iterate_partition_chunks(
+            self._unit_of_work_factory,
+            self._query_builder_type(mutating=False)
+            .load(EscrowAccount)
+            .from_attribute("state", [EscrowAccountState.PAID.value]),
+            params,
+        ):
+            await self._handle_chunk(escrow_ids)
+
+        await complete_batch_task(
+            self._unit_of_work_factory, self._query_builder_type, task_id
+        )
+
+    async def _handle_chunk(self, escrow_ids: list[UUID]) -> None:
+        ledger = self._inventory_reservation_policy.ledger
+        query_builder = (
             self._query_builder_type(mutating=True)
-            .load(Task)
-            .from_attribute("entity_id", [task_id])
-            .for_update(no_wait=True)
             .load(EscrowAccount)
+            .from_id(escrow_ids)
+            .and_()
             .from_attribute("state", [EscrowAccountState.PAID.value])
-            .for_update()
+            .for_update(skip_locked=True)
             .load(PurchaseActive)
             .from_previous()
             .and_()
@@ -225,17 +311,20 @@ class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[NullTaskParams]):
             .for_update()
             .load(Product)
             .from_previous()
-            .for_update()
-            .build(),
-            exception_on_nowait=RetryException,
-        ) as uow:
+        )
+        query_builder = (
+            query_builder.no_lock() if ledger else query_builder.for_update()
+        )
+
+        async with self._unit_of_work_factory.create(query_builder.build()) as uow:
             resources = uow.get_resources()
-            capture_task(resources, task_id)
 
             escrow_purchase_map: list[tuple[EscrowAccount, PurchaseActive]] = (
                 get_escrow_purchase_active_map(resources)
             )
-            product_inventory = ProductInventory(resources.get_all(Product))
+            product_inventory = create_product_inventory(
+                resources.get_all(Product), ledger
+            )
 
             for escrow, purchase in escrow_purchase_map:
                 summary = self._purchase_return_service.unclaim(
@@ -247,6 +336,10 @@ class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[NullTaskParams]):
                 resources.delete(PurchaseActive, purchase)
                 resources.put(PurchaseSummary, summary)
 
+            append_deferred_restocks(
+                uow, product_inventory, OperationCodeEnum.AUTO_UNCLAIM_PURCHASE
+            )
+
             await self._payment_gateway.start_refunds(
                 [str(item[0].entity_id) for item in escrow_purchase_map]
             )
@@ -266,7 +359,7 @@ class BatchPaidReservationTimeOutTaskHandler(BaseTaskHandler[NullTaskParams]):
             uow.mark_commit()
 
 
-class BatchWaitRefundTaskHandler(BaseTaskHandler[NullTaskParams]):
+class BatchWaitRefundTaskHandler(BaseTaskHandler[BatchTaskParams]):
     handler_name = "batch_wait_refund"
 
     def __init__(
@@ -288,19 +381,37 @@ class BatchWaitRefundTaskHandler(BaseTaskHandler[NullTaskParams]):
         self._payment_gateway: IPaymentGateway = payment_gateway
 
     async def handle(self, task_id: UUID) -> None:
+        params = await read_batch_task_params(
+            self._unit_of_work_factory,
+            self._query_builder_type,
+            task_id,
+            BatchTaskParams,
+        )
+
+        async for escrow_ids in iterate_partition_chunks(
+            self._unit_of_work_factory,
+            self._query_builder_type(mutating=False)
+            .load(EscrowAccount)
+            .from_attribute("state", [EscrowAccountState.REFUNDING.value]),
+            params,
+        ):
+            await self._handle_chunk(escrow_ids)
+
+        await complete_batch_task(
+            self._unit_of_work_factory, self._query_builder_type, task_id
+        )
+
+    async def _handle_chunk(self, escrow_ids: list[UUID]) -> None:
         async with self._unit_of_work_factory.create(
             self._query_builder_type(mutating=True)
-            .load(Task)
-            .from_attribute("entity_id", [task_id])
-            .for_update(no_wait=True)
             .load(EscrowAccount)
+            .from_id(escrow_ids)
+            .and_()
             .from_attribute("state", [EscrowAccountState.REFUNDING.value])
-            .for_update()
-            .build(),
-            exception_on_nowait=RetryException,
+            .for_update(skip_locked=True)
+            .build()
         ) as uow:
             resources = uow.get_resources()
-            capture_task(resources, task_id)
 
             state_map = await get_payment_state_map(resources, self._payment_gateway)
 
@@ -0,0 +1,49 @@
+from typing import Type
+from uuid import UUID
+
+from shop_project.application.background.base_task_handler import (
+    BaseTaskHandler,
+    BatchTaskParams,
+)
+from shop_project.application.shared.interfaces.interface_query_builder import (
+    IQueryBuilder,
+)
+from shop_project.application.shared.interfaces.interface_stock_shard_service import (
+    IStockShardService,
+)
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWorkFactory,
+)
+from shop_project.application.shared.scenarios.batch import (
+    complete_batch_task,
+    read_batch_task_params,
+)
+
+
+class StockShardRebalanceTaskHandler(BaseTaskHandler[BatchTaskParams]):
+    handler_name = "stock_shard_rebalance"
+
+    def __init__(
+        self,
+        unit_of_work_factory: IUnitOfWorkFactory,
+        query_builder_type: Type[IQueryBuilder],
+        stock_shard_service: IStockShardService,
+    ) -> None:
+        self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
+        self._query_builder_type: Type[IQueryBuilder] = query_builder_type
+        self._stock_shard_service: IStockShardService = stock_shard_service
+
+    async def handle(self, task_id: UUID) -> None:
+        params = await read_batch_task_params(
+            self._unit_of_work_factory,
+            self._query_builder_type,
+            task_id,
+            BatchTaskParams,
+        )
+
+        # Выравнивание идемпотентно, повторная доставка просто пройдёт ещё раз
+        await self._stock_shard_service.rebalance(params.chunk_size)
+
+        await complete_batch_task(
+            self._unit_of_work_factory, self._query_builder_type, task_id
+        )
@@ -5,6 +5,7 @@ from shop_project.application.customer.schemas.claim_token_schema import (
     ClaimTokenSchema,
 )
 from shop_project.application.customer.schemas.purchase_active_schema import (
+    ActivatePurchaseDraftsSchema,
     PurchaseActivationSchema,
     PurchaseActiveSchema,
 )
@@ -12,6 +13,9 @@ from shop_project.application.customer.schemas.purchase_summary_schema import (
     PurchaseSummarySchema,
 )
 from shop_project.application.entities.claim_token import ClaimToken
+from shop_project.application.entities.operation_log.operation_code import (
+    OperationCodeEnum,
+)
 from shop_project.application.shared.access_token_payload import AccessTokenPayload
 from shop_project.application.shared.dto.mapper import to_dto
 from shop_project.application.shared.interfaces.interface_claim_token_service import (
@@ -24,17 +28,28 @@ from shop_project.application.shared.interfaces.interface_payment_gateway import
 from shop_project.application.shared.interfaces.interface_query_builder import (
     IQueryBuilder,
 )
+from shop_project.application.shared.interfaces.interface_query_plan import IQueryPlan
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConditionalDecrementException,
+    IUnitOfWork,
     IUnitOfWorkFactory,
+    RetryPolicy,
 )
 from shop_project.application.shared.operation_log_payload_factories.purchase import (
     create_activate_purchase_payload,
     create_manual_unclaim_purchase_payload,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.application.shared.policies.refund_initiation_policy import (
     RefundInitiationPolicy,
 )
 from shop_project.application.shared.scenarios.entity import get_one_or_raise_not_found
+from shop_project.application.shared.scenarios.inventory import (
+    append_deferred_restocks,
+    create_product_inventory,
+)
 from shop_project.application.shared.scenarios.operation_log import log_operation
 from shop_project.application.shared.scenarios.subject import (
     ensure_subject_type_or_raise_forbidden,
@@ -44,9 +59,11 @@ from shop_project.domain.entities.product import Product
 from shop_project.domain.entities.purchase_active import PurchaseActive
 from shop_project.domain.entities.purchase_draft import PurchaseDraft
 from shop_project.domain.entities.purchase_summary import PurchaseSummary
-from shop_project.domain.helpers.product_inventory import ProductInventory
+from shop_project.domain.exceptions import DomainConflictError
+from shop_project.domain.helpers.product_inventory import DeferredProductInventory
 from shop_project.domain.interfaces.subject import SubjectEnum
 from shop_project.domain.services.purchase_activation_service import (
+    PurchaseActivation,
     PurchaseActivationService,
 )
 from shop_project.domain.services.purchase_claim_service import PurchaseClaimService
@@ -64,6 +81,7 @@ class PurchaseActiveCustomerService:
         payment_gateway: IPaymentGateway,
         claim_token_service: IClaimTokenService,
         refund_initiation_policy: RefundInitiationPolicy,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
@@ -77,6 +95,9 @@ class PurchaseActiveCustomerService:
         self._refund_initiation_policy: RefundInitiationPolicy = (
             refund_initiation_policy
         )
+        self._inventory_reservation_policy: InventoryReservationPolicy = (
+            inventory_reservation_policy
+        )
 
     async def get_claim_token(
         self, access_payload: AccessTokenPayload
@@ -114,44 +135,7 @@ class PurchaseActiveCustomerService:
     ) -> PurchaseActivationSchema:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
 
-        async with self._unit_of_work_factory.create(
-            self._query_builder_type(mutating=True)
-            .load(PurchaseDraft)
-            .from_id([purchase_draft_id])
-            .and_()
-            .from_attribute("customer_id", [access_payload.account_id])
-            .for_update()
-            .load(Product)
-            .from_previous()
-            .for_update()
-            .build()
-        ) as uow:
-            resources = uow.get_resources()
-            purchase_draft: PurchaseDraft = get_one_or_raise_not_found(
-                resources, PurchaseDraft, purchase_draft_id
-            )
-
-            product_inventory = ProductInventory(resources.get_all(Product))
-
-            activation = self._purchase_activation_service.activate(
-                product_inventory=product_inventory, purchase_draft=purchase_draft
-            )
-
-            resources.delete(PurchaseDraft, purchase_draft)
-            resources.put(PurchaseActive, activation.purchase_active)
-            resources.put(EscrowAccount, activation.escrow_account)
-
-            operation_log = create_activate_purchase_payload(
-                access_token_payload=access_payload,
-                purchase_active_dto=to_dto(activation.purchase_active),
-                escrow_account_dto=to_dto(activation.escrow_account),
-                product_dtos=[
-                    to_dto(product) for product in resources.get_all(Product)
-                ],
-            )
-            log_operation(resources, operation_log)
-
-            uow.mark_commit()
+        (activation,) = await self._activate_drafts(access_payload, [purchase_draft_id])
 
         payment_request = CreatePaymentRequest(
             payment_id=str(activation.escrow_account.entity_id),
@@ -169,12 +153,145 @@ class PurchaseActiveCustomerService:
             payment_url=payment_url,
         )
 
+    async def activate_drafts(
+        self,
+        access_payload: AccessTokenPayload,
+        activate: ActivatePurchaseDraftsSchema,
+    ) -> list[PurchaseActivationSchema]:
+        ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
+
+        purchase_draft_ids = list(dict.fromkeys(activate.purchase_draft_ids))
+        activations = await self._activate_drafts(access_payload, purchase_draft_ids)
+
+        # Платежи всех покупок создаются одним вызовом шлюза
+        payment_urls = await self._payment_gateway.create_payments(
+            [
+                CreatePaymentRequest(
+                    payment_id=str(activation.escrow_account.entity_id),
+                    amount=activation.escrow_account.total_amount,
+                )
+                for activation in activations
+            ]
+        )
+
+        return [
+            PurchaseActivationSchema(
+                purchase_active=PurchaseActiveSchema.create(
+                    to_dto(activation.purchase_active),
+                    to_dto(activation.escrow_account),
+                ),
+                payment_url=payment_urls[str(activation.escrow_account.entity_id)],
+            )
+            for activation in activations
+        ]
+
+    async def _activate_drafts(
+        self, access_payload: AccessTokenPayload, purchase_draft_ids: list[UUID]
+    ) -> list[PurchaseActivation]:
+        # Горячие товары: при дедлоке/таймауте блокировки активация
+        # повторяется целиком, платежи создаются только после коммита
+        async def activate(uow: IUnitOfWork) -> list[PurchaseActivation]:
+            resources = uow.get_resources()
+            purchase_drafts: list[PurchaseDraft] = [
+                get_one_or_raise_not_found(resources, PurchaseDraft, purchase_draft_id)
+                for purchase_draft_id in purchase_draft_ids
+            ]
+
+            # Остаток проверяется и резервируется одним проходом по всем
+            # черновикам: следующий видит резерв предыдущих
+            products = resources.get_all(Product)
+            product_inventory = create_product_inventory(products, atomic_decrement)
+
+            activations: list[PurchaseActivation] = []
+            for purchase_draft in purchase_drafts:
+                activation = self._purchase_activation_service.activate(
+                    product_inventory=product_inventory, purchase_draft=purchase_draft
+                )
+                activations.append(activation)
+
+                product_dtos = [to_dto(product) for product in products]
+                if isinstance(product_inventory, DeferredProductInventory):
+                    # В журнал - остаток на момент чтения за вычетом резерва
+                    product_dtos = [
+                        dto.model_copy(
+                            update={
+                                "amount": dto.amount
+                                - product_inventory.reservations.get(dto.entity_id, 0)
+                            }
+                        )
+                        for dto in product_dtos
+                    ]
+
+                resources.delete(PurchaseDraft, purchase_draft)
+                resources.put(PurchaseActive, activation.purchase_active)
+                resources.put(EscrowAccount, activation.escrow_account)
+
+                operation_log = create_activate_purchase_payload(
+                    access_token_payload=access_payload,
+                    purchase_active_dto=to_dto(activation.purchase_active),
+                    escrow_account_dto=to_dto(activation.escrow_account),
+                    product_dtos=product_dtos,
+                )
+                log_operation(resources, operation_log)
+
+            if isinstance(product_inventory, DeferredProductInventory):
+                # Товары прочитаны без блокировки, остаток уменьшит условный
+                # UPDATE при коммите - один на все черновики
+                uow.conditional_decrement(
+                    Product,
+                    "amount",
+                    product_inventory.reservations,
+                    reason=(
+                        OperationCodeEnum.ACTIVATE_PURCHASE.value
+                        if self._inventory_reservation_policy.ledger
+                        else None
+                    ),
+                )
+
+            uow.mark_commit()
+
+            return activations
+
+        atomic_decrement = (
+            self._inventory_reservation_policy.atomic_decrement
+            or self._inventory_reservation_policy.ledger
+        )
+
+        # План строится на каждую попытку run
+        def build_query_plan() -> IQueryPlan:
+            query_builder = (
+                self._query_builder_type(mutating=True)
+                .load(PurchaseDraft)
+                .from_id(purchase_draft_ids)
+                .and_()
+                .from_attribute("customer_id", [access_payload.account_id])
+                .for_update()
+                .load(Product)
+                .from_previous()
+            )
+            query_builder = (
+                query_builder.no_lock()
+                if atomic_decrement
+                else query_builder.for_update()
+            )
+            return query_builder.build()
+
+        try:
+            return await self._unit_of_work_factory.run(
+                build_query_plan, activate, retry=RetryPolicy()
+            )
+        except ConditionalDecrementException as e:
+            raise DomainConflictError(
+                f"Not enough stock for product {e.entity_ids[0]}"
+            ) from e
+
     async def unclaim(
         self, access_payload: AccessTokenPayload, purchase_active_id: UUID
     ):
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
 
-        async with self._unit_of_work_factory.create(
+        ledger = self._inventory_reservation_policy.ledger
+        query_builder = (
             self._query_builder_type(mutating=True)
             .load(EscrowAccount)
             .from_id([purchase_active_id])
@@ -186,9 +303,12 @@ class PurchaseActiveCustomerService:
             .for_update()
             .load(Product)
             .from_previous()
-            .for_update()
-            .build()
-        ) as uow:
+        )
+        query_builder = (
+            query_builder.no_lock() if ledger else query_builder.for_update()
+        )
+
+        async with self._unit_of_work_factory.create(query_builder.build()) as uow:
             resources = uow.get_resources()
             purchase_active = get_one_or_raise_not_found(
                 resources, PurchaseActive, purchase_active_id
@@ -197,11 +317,17 @@ class PurchaseActiveCustomerService:
                 resources, EscrowAccount, purchase_active_id
             )
 
+            product_inventory = create_product_inventory(
+                resources.get_all(Product), ledger
+            )
             summary = self._purchase_return_service.unclaim(
-                product_inventory=ProductInventory(resources.get_all(Product)),
+                product_inventory=product_inventory,
                 purchase_active=purchase_active,
                 escrow_account=escrow_account,
             )
+            append_deferred_restocks(
+                uow, product_inventory, OperationCodeEnum.MANUAL_UNCLAIM_PURCHASE
+            )
 
             resources.delete(PurchaseActive, purchase_active)
             resources.put(PurchaseSummary, summary)
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Sequence, Type
 from uuid import UUID, uuid4
 
 from shop_project.application.customer.schemas.purchase_draft_schema import (
@@ -12,7 +12,9 @@ from shop_project.application.shared.interfaces.interface_query_builder import (
     IQueryBuilder,
 )
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWork,
     IUnitOfWorkFactory,
+    RetryPolicy,
 )
 from shop_project.application.shared.scenarios.entity import (
     get_one_or_raise_forbidden,
@@ -97,21 +99,11 @@ class PurchaseDraftCustomerService:
     ) -> PurchaseDraftSchema:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
 
-        async with self._unit_of_work_factory.create(
-            self._query_builder_type(mutating=True)
-            .load(Customer)
-            .from_id([access_payload.account_id])
-            .for_share()
-            .load(PurchaseDraft)
-            .from_id([draft_id])
-            .and_()
-            .from_attribute("customer_id", [access_payload.account_id])
-            .for_update()
-            .load(Product)
-            .from_id([item.product_id for item in change.items])
-            .for_share()
-            .build()
-        ) as uow:
+        # Правки черновика друг друга не ждут: конфликт обнаруживается по
+        # версии черновика при коммите, и правка повторяется
+        async def change_products(
+            uow: IUnitOfWork,
+        ) -> tuple[PurchaseDraft, Sequence[Product]]:
             resources = uow.get_resources()
             customer = get_one_or_raise_forbidden(
                 resources, Customer, access_payload.account_id
@@ -135,6 +127,26 @@ class PurchaseDraftCustomerService:
 
             uow.mark_commit()
 
+            return purchase_draft, products
+
+        purchase_draft, products = await self._unit_of_work_factory.run(
+            lambda: self._query_builder_type(mutating=True)
+            .load(Customer)
+            .from_id([access_payload.account_id])
+            .for_share()
+            .load(PurchaseDraft)
+            .from_id([draft_id])
+            .and_()
+            .from_attribute("customer_id", [access_payload.account_id])
+            .optimistic()
+            .load(Product)
+            .from_id([item.product_id for item in change.items])
+            .no_lock()
+            .build(),
+            change_products,
+            retry=RetryPolicy(),
+        )
+
         return PurchaseDraftSchema.create(
             to_dto(purchase_draft), [to_dto(product) for product in products]
         )
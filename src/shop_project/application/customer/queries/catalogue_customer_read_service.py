@@ -36,11 +36,19 @@ class CatalogueCustomerReadService:
 
         return res
 
-    async def get_products(self, offset: int, limit: int) -> list[ProductSchema]:
+    async def get_products(
+        self,
+        offset: int,
+        limit: int,
+        after: UUID | None = None,
+        before: UUID | None = None,
+    ) -> list[ProductSchema]:
         async with self._unit_of_work_factory.create(
             self._query_builder_type(mutating=False)
             .load(Product)
             .order_by("entity_id", desc=True)
+            .after(after)
+            .before(before)
             .offset(offset)
             .limit(limit)
             .no_lock()
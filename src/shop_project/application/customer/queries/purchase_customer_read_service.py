@@ -147,7 +147,12 @@ class PurchaseCustomerReadService:
         return res
 
     async def get_actives(
-        self, access_payload: AccessTokenPayload, offset: int, limit: int
+        self,
+        access_payload: AccessTokenPayload,
+        offset: int,
+        limit: int,
+        after: UUID | None = None,
+        before: UUID | None = None,
     ) -> list[PurchaseActiveSchema]:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
 
@@ -156,6 +161,8 @@ class PurchaseCustomerReadService:
             .load(PurchaseActive)
             .from_attribute("customer_id", [access_payload.account_id])
             .order_by("entity_id", desc=True)
+            .after(after)
+            .before(before)
             .offset(offset)
             .limit(limit)
             .no_lock()
@@ -182,7 +189,12 @@ class PurchaseCustomerReadService:
         return res
 
     async def get_drafts(
-        self, access_payload: AccessTokenPayload, offset: int, limit: int
+        self,
+        access_payload: AccessTokenPayload,
+        offset: int,
+        limit: int,
+        after: UUID | None = None,
+        before: UUID | None = None,
     ) -> list[PurchaseDraftSchema]:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
 
@@ -191,6 +203,8 @@ class PurchaseCustomerReadService:
             .load(PurchaseDraft)
             .from_attribute("customer_id", [access_payload.account_id])
             .order_by("entity_id", desc=True)
+            .after(after)
+            .before(before)
             .offset(offset)
             .limit(limit)
             .no_lock()
@@ -215,7 +229,12 @@ class PurchaseCustomerReadService:
         return res
 
     async def get_summaries(
-        self, access_payload: AccessTokenPayload, offset: int, limit: int
+        self,
+        access_payload: AccessTokenPayload,
+        offset: int,
+        limit: int,
+        after: UUID | None = None,
+        before: UUID | None = None,
     ) -> list[PurchaseSummarySchema]:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.CUSTOMER)
 
@@ -224,6 +243,8 @@ class PurchaseCustomerReadService:
             .load(PurchaseSummary)
             .from_attribute("customer_id", [access_payload.account_id])
             .order_by("entity_id", desc=True)
+            .after(after)
+            .before(before)
             .offset(offset)
             .limit(limit)
             .no_lock()
@@ -2,6 +2,8 @@ from decimal import Decimal
 from typing import Self
 from uuid import UUID
 
+from pydantic import Field
+
 from shop_project.application.shared.base_schema import BaseSchema
 from shop_project.application.shared.dto.escrow_account_dto import EscrowAccountDTO
 from shop_project.application.shared.dto.purchase_active_dto import PurchaseActiveDTO
@@ -40,3 +42,7 @@ class PurchaseActiveSchema(BaseSchema):
 class PurchaseActivationSchema(BaseSchema):
     purchase_active: PurchaseActiveSchema
     payment_url: str
+
+
+class ActivatePurchaseDraftsSchema(BaseSchema):
+    purchase_draft_ids: list[UUID] = Field(min_length=1, max_length=20)
@@ -22,6 +22,11 @@ class OperationCodeEnum(Enum):
     CREATE_PRODUCT = "CREATE_PRODUCT"
     UPDATE_PRODUCT = "UPDATE_PRODUCT"
     DELETE_PRODUCT = "DELETE_PRODUCT"
+    SET_PRODUCT_STOCK_SHARDS = "SET_PRODUCT_STOCK_SHARDS"
 
     MANUAL_TRIGGER_PURCHASE_FLOW = "MANUAL_TRIGGER_PURCHASE_FLOW"
     MANUAL_REDELIVER_TASKS = "MANUAL_REDELIVER_TASKS"
+    MANUAL_TRIGGER_STOCK_SHARD_REBALANCE = "MANUAL_TRIGGER_STOCK_SHARD_REBALANCE"
+    MANUAL_TRIGGER_INVENTORY_LEDGER_COMPACTION = (
+        "MANUAL_TRIGGER_INVENTORY_LEDGER_COMPACTION"
+    )
@@ -21,3 +21,19 @@ class ManualRedeliverTasksOperationLogPayload(
 ):
     subject_type: SubjectEnum
     subject_id: UUID
+
+
+class ManualTriggerStockShardRebalanceOperationLogPayload(
+    BaseOperationLogPayload[OperationCodeEnum.MANUAL_TRIGGER_STOCK_SHARD_REBALANCE]
+):
+    subject_type: SubjectEnum
+    subject_id: UUID
+
+
+class ManualTriggerInventoryLedgerCompactionOperationLogPayload(
+    BaseOperationLogPayload[
+        OperationCodeEnum.MANUAL_TRIGGER_INVENTORY_LEDGER_COMPACTION
+    ]
+):
+    subject_type: SubjectEnum
+    subject_id: UUID
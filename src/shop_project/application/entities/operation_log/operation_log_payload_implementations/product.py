@@ -30,6 +30,15 @@ class UpdateProductOperationLogPayload(
     product_price: Decimal
 
 
+class SetProductStockShardsOperationLogPayload(
+    BaseOperationLogPayload[OperationCodeEnum.SET_PRODUCT_STOCK_SHARDS]
+):
+    subject_type: SubjectEnum
+    subject_id: UUID
+    product_id: UUID
+    shard_count: int
+
+
 class DeleteProductOperationLogPayload(
     BaseOperationLogPayload[OperationCodeEnum.DELETE_PRODUCT]
 ):
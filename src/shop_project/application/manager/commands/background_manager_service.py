@@ -1,12 +1,19 @@
 from typing import Type
+from uuid import UUID
 
-from shop_project.application.background.base_task_handler import NullTaskParams
+from shop_project.application.background.base_task_handler import BatchTaskParams
+from shop_project.application.background.implementations.inventory_ledger_handler import (
+    InventoryLedgerCompactionTaskHandler,
+)
 from shop_project.application.background.implementations.purchase_flow_handler import (
     BatchFinalizeNotPaidTasksHandler,
     BatchPaidReservationTimeOutTaskHandler,
     BatchWaitPaymentTaskHandler,
     BatchWaitRefundTaskHandler,
 )
+from shop_project.application.background.implementations.stock_shard_handler import (
+    StockShardRebalanceTaskHandler,
+)
 from shop_project.application.entities.task import Task, create_task
 from shop_project.application.shared.access_token_payload import AccessTokenPayload
 from shop_project.application.shared.interfaces.interface_query_builder import (
@@ -18,7 +25,12 @@ from shop_project.application.shared.interfaces.interface_unit_of_work import (
 )
 from shop_project.application.shared.operation_log_payload_factories.background import (
     create_manual_redeliver_tasks_payload,
+    create_manual_trigger_inventory_ledger_compaction_payload,
     create_manual_trigger_purchase_flow_payload,
+    create_manual_trigger_stock_shard_rebalance_payload,
+)
+from shop_project.application.shared.policies.batch_processing_policy import (
+    BatchProcessingPolicy,
 )
 from shop_project.application.shared.scenarios.entity import (
     get_one_or_raise_forbidden,
@@ -37,10 +49,12 @@ class BackgroundManagerService:
         unit_of_work_factory: IUnitOfWorkFactory,
         query_builder_type: Type[IQueryBuilder],
         task_sender_service: ITaskSender,
+        batch_processing_policy: BatchProcessingPolicy,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
         self._task_sender_service: ITaskSender = task_sender_service
+        self._batch_processing_policy: BatchProcessingPolicy = batch_processing_policy
 
     async def trigger_purchase_flow(self, access_payload: AccessTokenPayload) -> None:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
@@ -57,11 +71,23 @@ class BackgroundManagerService:
                 resources, Manager, access_payload.account_id
             )
 
+            policy = self._batch_processing_policy
             tasks = [
-                create_task(BatchWaitPaymentTaskHandler, NullTaskParams()),
-                create_task(BatchWaitRefundTaskHandler, NullTaskParams()),
-                create_task(BatchPaidReservationTimeOutTaskHandler, NullTaskParams()),
-                create_task(BatchFinalizeNotPaidTasksHandler, NullTaskParams()),
+                create_task(
+                    handler_type,
+                    BatchTaskParams(
+                        chunk_size=policy.chunk_size,
+                        partition_count=policy.partition_count,
+                        partition_index=partition_index,
+                    ),
+                )
+                for handler_type in (
+                    BatchWaitPaymentTaskHandler,
+                    BatchWaitRefundTaskHandler,
+                    BatchPaidReservationTimeOutTaskHandler,
+                    BatchFinalizeNotPaidTasksHandler,
+                )
+                for partition_index in range(policy.partition_count)
             ]
 
             for task in tasks:
@@ -74,6 +100,74 @@ class BackgroundManagerService:
 
             uow.mark_commit()
 
+    async def trigger_stock_shard_rebalance(
+        self, access_payload: AccessTokenPayload
+    ) -> None:
+        ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
+
+        async with self._unit_of_work_factory.create(
+            self._query_builder_type(mutating=True)
+            .load(Manager)
+            .from_id([access_payload.account_id])
+            .for_share()
+            .build()
+        ) as uow:
+            resources = uow.get_resources()
+            manager = get_one_or_raise_forbidden(
+                resources, Manager, access_payload.account_id
+            )
+
+            resources.put(
+                Task,
+                create_task(
+                    StockShardRebalanceTaskHandler,
+                    BatchTaskParams(
+                        chunk_size=self._batch_processing_policy.chunk_size
+                    ),
+                ),
+            )
+
+            operation_log = create_manual_trigger_stock_shard_rebalance_payload(
+                access_payload,
+            )
+            log_operation(resources, operation_log)
+
+            uow.mark_commit()
+
+    async def trigger_inventory_ledger_compaction(
+        self, access_payload: AccessTokenPayload
+    ) -> None:
+        ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
+
+        async with self._unit_of_work_factory.create(
+            self._query_builder_type(mutating=True)
+            .load(Manager)
+            .from_id([access_payload.account_id])
+            .for_share()
+            .build()
+        ) as uow:
+            resources = uow.get_resources()
+            manager = get_one_or_raise_forbidden(
+                resources, Manager, access_payload.account_id
+            )
+
+            resources.put(
+                Task,
+                create_task(
+                    InventoryLedgerCompactionTaskHandler,
+                    BatchTaskParams(
+                        chunk_size=self._batch_processing_policy.chunk_size
+                    ),
+                ),
+            )
+
+            operation_log = create_manual_trigger_inventory_ledger_compaction_payload(
+                access_payload,
+            )
+            log_operation(resources, operation_log)
+
+            uow.mark_commit()
+
     async def manual_redeliver_tasks(self, access_payload: AccessTokenPayload) -> None:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
         TASKS_PER_ITERATION = 100
@@ -98,7 +192,7 @@ class BackgroundManagerService:
             uow.mark_commit()
 
         check_more_tasks_flag = True
-        already_checked_tasks = 0
+        last_checked_task_id: UUID | None = None
 
         while check_more_tasks_flag:
             async with self._unit_of_work_factory.create(
@@ -108,8 +202,8 @@ class BackgroundManagerService:
                 .no_lock()
                 .load(Task)
                 .order_by("entity_id", desc=False)
+                .after(last_checked_task_id)
                 .limit(TASKS_PER_ITERATION)
-                .offset(already_checked_tasks)
                 .no_lock()
                 .build()
             ) as uow:
@@ -126,4 +220,5 @@ class BackgroundManagerService:
                 for task in tasks:
                     await self._task_sender_service.send(task)
 
-                already_checked_tasks += len(tasks)
+                if tasks:
+                    last_checked_task_id = max(task.entity_id for task in tasks)
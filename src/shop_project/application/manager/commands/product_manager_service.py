@@ -7,12 +7,18 @@ from shop_project.application.shared.dto.mapper import to_dto
 from shop_project.application.shared.interfaces.interface_query_builder import (
     IQueryBuilder,
 )
+from shop_project.application.shared.interfaces.interface_stock_shard_service import (
+    IStockShardService,
+)
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWork,
     IUnitOfWorkFactory,
+    RetryPolicy,
 )
 from shop_project.application.shared.operation_log_payload_factories.product import (
     create_create_product_payload,
     create_delete_product_payload,
+    create_set_product_stock_shards_payload,
     create_update_product_payload,
 )
 from shop_project.application.shared.scenarios.entity import (
@@ -27,6 +33,7 @@ from shop_project.application.shared.schemas.product_schema import (
     ChangeProductSchema,
     CreateProductSchema,
     ProductSchema,
+    SetProductStockShardsSchema,
 )
 from shop_project.domain.entities.manager import Manager
 from shop_project.domain.entities.product import Product
@@ -38,9 +45,11 @@ class ProductManagerService:
         self,
         unit_of_work_factory: IUnitOfWorkFactory,
         query_builder_type: Type[IQueryBuilder],
+        stock_shard_service: IStockShardService,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
+        self._stock_shard_service: IStockShardService = stock_shard_service
 
     async def create_product(
         self, access_payload: AccessTokenPayload, product_schema: CreateProductSchema
@@ -120,6 +129,47 @@ class ProductManagerService:
     ) -> ProductSchema:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
 
+        # Товар не блокируется: активации покупок его не ждут, а при
+        # конкурентном изменении правка повторяется по свежей версии
+        async def change_product(uow: IUnitOfWork) -> Product:
+            resources = uow.get_resources()
+            manager = get_one_or_raise_forbidden(
+                resources, Manager, access_payload.account_id
+            )
+            product = get_one_or_raise_not_found(resources, Product, change.entity_id)
+
+            product.name = change.name
+            product.price = change.price
+
+            operation_log = create_update_product_payload(
+                access_payload, to_dto(product)
+            )
+            log_operation(resources, operation_log)
+
+            uow.mark_commit()
+
+            return product
+
+        product = await self._unit_of_work_factory.run(
+            lambda: self._query_builder_type(mutating=True)
+            .load(Manager)
+            .from_id([access_payload.account_id])
+            .for_share()
+            .load(Product)
+            .from_id([change.entity_id])
+            .optimistic()
+            .build(),
+            change_product,
+            retry=RetryPolicy(),
+        )
+
+        return ProductSchema.model_validate(to_dto(product))
+
+    async def set_stock_shards(
+        self, access_payload: AccessTokenPayload, change: SetProductStockShardsSchema
+    ) -> None:
+        ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
+
         async with self._unit_of_work_factory.create(
             self._query_builder_type(mutating=True)
             .load(Manager)
@@ -127,23 +177,23 @@ class ProductManagerService:
             .for_share()
             .load(Product)
             .from_id([change.entity_id])
-            .for_update()
+            .no_lock()
             .build()
         ) as uow:
             resources = uow.get_resources()
             manager = get_one_or_raise_forbidden(
                 resources, Manager, access_payload.account_id
             )
-            product = get_one_or_raise_not_found(resources, Product, change.entity_id)
+            get_one_or_raise_not_found(resources, Product, change.entity_id)
 
-            product.name = change.name
-            product.price = change.price
-
-            operation_log = create_update_product_payload(
-                access_payload, to_dto(product)
+            operation_log = create_set_product_stock_shards_payload(
+                access_payload, change.entity_id, change.shard_count
             )
             log_operation(resources, operation_log)
 
             uow.mark_commit()
 
-        return ProductSchema.model_validate(to_dto(product))
+        # Остаток переносится в своей транзакции, под блокировкой строки товара
+        await self._stock_shard_service.set_shard_count(
+            change.entity_id, change.shard_count
+        )
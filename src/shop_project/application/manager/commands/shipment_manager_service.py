@@ -1,6 +1,9 @@
 from typing import Type
 from uuid import UUID
 
+from shop_project.application.entities.operation_log.operation_code import (
+    OperationCodeEnum,
+)
 from shop_project.application.manager.schemas.shipment_schema import (
     CreateShipmentSchema,
     ShipmentSchema,
@@ -19,10 +22,17 @@ from shop_project.application.shared.operation_log_payload_factories.shipment im
     create_cancel_shipment_payload,
     create_receive_shipment_payload,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.application.shared.scenarios.entity import (
     get_one_or_raise_forbidden,
     get_one_or_raise_not_found,
 )
+from shop_project.application.shared.scenarios.inventory import (
+    append_deferred_restocks,
+    create_product_inventory,
+)
 from shop_project.application.shared.scenarios.operation_log import log_operation
 from shop_project.application.shared.scenarios.subject import (
     ensure_subject_type_or_raise_forbidden,
@@ -49,6 +59,7 @@ class ShipmentManagerService:
         shipment_activation_service: ShipmentActivationService,
         shipment_cancel_service: ShipmentCancelService,
         shipment_receive_service: ShipmentReceiveService,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
@@ -59,6 +70,9 @@ class ShipmentManagerService:
         self._shipment_receive_service: ShipmentReceiveService = (
             shipment_receive_service
         )
+        self._inventory_reservation_policy: InventoryReservationPolicy = (
+            inventory_reservation_policy
+        )
 
     async def create_shipment(
         self,
@@ -143,7 +157,8 @@ class ShipmentManagerService:
     ) -> ShipmentSummarySchema:
         ensure_subject_type_or_raise_forbidden(access_payload, SubjectEnum.MANAGER)
 
-        async with self._unit_of_work_factory.create(
+        ledger = self._inventory_reservation_policy.ledger
+        query_builder = (
             self._query_builder_type(mutating=True)
             .load(Manager)
             .from_id([access_payload.account_id])
@@ -153,9 +168,12 @@ class ShipmentManagerService:
             .for_update()
             .load(Product)
             .from_previous()
-            .for_update()
-            .build()
-        ) as uow:
+        )
+        query_builder = (
+            query_builder.no_lock() if ledger else query_builder.for_update()
+        )
+
+        async with self._unit_of_work_factory.create(query_builder.build()) as uow:
             resources = uow.get_resources()
             manager = get_one_or_raise_forbidden(
                 resources, Manager, access_payload.account_id
@@ -163,8 +181,9 @@ class ShipmentManagerService:
             shipment = get_one_or_raise_not_found(resources, Shipment, shipment_id)
             products = resources.get_all(Product)
 
-            inventory = ProductInventory(products)
+            inventory = create_product_inventory(products, ledger)
             summary = self._shipment_receive_service.receive(inventory, shipment)
+            append_deferred_restocks(uow, inventory, OperationCodeEnum.RECEIVE_SHIPMENT)
 
             resources.put(ShipmentSummary, summary)
             resources.delete(Shipment, shipment)
@@ -1,6 +1,9 @@
 from typing import Type
 from uuid import UUID
 
+from shop_project.application.entities.operation_log.operation_code import (
+    OperationCodeEnum,
+)
 from shop_project.application.exceptions import ApplicationConflictError
 from shop_project.application.shared.dto.mapper import to_dto
 from shop_project.application.shared.interfaces.interface_query_builder import (
@@ -15,15 +18,21 @@ from shop_project.application.shared.operation_log_payload_factories.purchase im
     create_pay_purchase_payload,
     create_refund_purchase_payload,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.application.shared.scenarios.entity import (
     get_one_or_raise_not_found,
 )
+from shop_project.application.shared.scenarios.inventory import (
+    append_deferred_restocks,
+    create_product_inventory,
+)
 from shop_project.application.shared.scenarios.operation_log import log_operation
 from shop_project.domain.entities.escrow_account import EscrowAccount
 from shop_project.domain.entities.product import Product
 from shop_project.domain.entities.purchase_active import PurchaseActive
 from shop_project.domain.entities.purchase_summary import PurchaseSummary
-from shop_project.domain.helpers.product_inventory import ProductInventory
 from shop_project.domain.services.purchase_return_service import PurchaseReturnService
 
 
@@ -33,10 +42,14 @@ class PaymentService:
         unit_of_work_factory: IUnitOfWorkFactory,
         query_builder_type: Type[IQueryBuilder],
         purchase_return_service: PurchaseReturnService,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> None:
         self._unit_of_work_factory: IUnitOfWorkFactory = unit_of_work_factory
         self._query_builder_type: Type[IQueryBuilder] = query_builder_type
         self._purchase_return_service: PurchaseReturnService = purchase_return_service
+        self._inventory_reservation_policy: InventoryReservationPolicy = (
+            inventory_reservation_policy
+        )
 
     async def confirm_payment(self, purchase_id: UUID) -> None:
         async with self._unit_of_work_factory.create(
@@ -102,7 +115,8 @@ class PaymentService:
             uow.mark_commit()
 
     async def finalize_not_paid(self, purchase_id: UUID) -> None:
-        async with self._unit_of_work_factory.create(
+        ledger = self._inventory_reservation_policy.ledger
+        query_builder = (
             self._query_builder_type(mutating=True)
             .load(EscrowAccount)
             .from_id([purchase_id])
@@ -112,9 +126,12 @@ class PaymentService:
             .for_update()
             .load(Product)
             .from_previous()
-            .for_update()
-            .build()
-        ) as uow:
+        )
+        query_builder = (
+            query_builder.no_lock() if ledger else query_builder.for_update()
+        )
+
+        async with self._unit_of_work_factory.create(query_builder.build()) as uow:
             resources = uow.get_resources()
             escrow: EscrowAccount = get_one_or_raise_not_found(
                 resources, EscrowAccount, purchase_id
@@ -123,13 +140,18 @@ class PaymentService:
                 resources, PurchaseActive, purchase_id
             )
 
-            product_inventory = ProductInventory(resources.get_all(Product))
+            product_inventory = create_product_inventory(
+                resources.get_all(Product), ledger
+            )
 
             summary = self._purchase_return_service.handle_cancelled_payment(
                 escrow_account=escrow,
                 product_inventory=product_inventory,
                 purchase_active=purchase,
             )
+            append_deferred_restocks(
+                uow, product_inventory, OperationCodeEnum.FINALIZE_CANCELLED_PURCHASE
+            )
 
             resources.delete(PurchaseActive, purchase)
             resources.put(PurchaseSummary, summary)
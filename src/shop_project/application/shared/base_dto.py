@@ -12,14 +12,25 @@ T = TypeVar("T", bound=PersistableEntity)
 
 class DTODynamicRegistry:
     map: Any = {}
+    domain_types: Any = {}
 
     @classmethod
     def register(cls, domain_type: Any, dto_type: Any) -> None:
         cls.map[domain_type] = dto_type
+        cls.domain_types[dto_type] = domain_type
 
     @classmethod
     def get(cls, domain_type: Any) -> Any:
-        return cls.map[domain_type]
+        if domain_type in cls.map:
+            return cls.map[domain_type]
+
+        # Подклассы доменных типов (например, обёртки только для чтения)
+        # используют DTO ближайшего зарегистрированного предка
+        for base in domain_type.__mro__[1:]:
+            if base in cls.map:
+                return cls.map[base]
+
+        raise KeyError(domain_type)
 
 
 class BaseVODTO(BaseModel, ABC):
@@ -38,6 +49,12 @@ class BaseDTO(BaseModel, Generic[T]):
 
     @classmethod
     def _get_one_generic_type(cls) -> Any:
+        # Вызывается на каждый экземпляр (model_post_init), поэтому после
+        # регистрации тип берется из реестра, а не из метаданных generic
+        domain_type = DTODynamicRegistry.domain_types.get(cls)
+        if domain_type is not None:
+            return domain_type
+
         bases = cls.__bases__
         for base in bases:
             meta = getattr(base, "__pydantic_generic_metadata__", None)
@@ -0,0 +1,10 @@
+from typing import Protocol
+
+
+class IInventoryLedgerService(Protocol):
+    async def compact(self, chunk_size: int = 100) -> int:
+        """
+        Сворачивает несвёрнутые движения журнала остатков в остатки товаров,
+        каждый товар - в своей транзакции. Возвращает число свёрнутых движений.
+        """
+        ...
@@ -32,7 +32,11 @@ class IPaymentGateway:
         self, request: CreatePaymentRequest
     ) -> str: ...
 
-    async def create_payments(self, requests: list[CreatePaymentRequest]) -> None: ...
+    async def create_payments(
+        self, requests: list[CreatePaymentRequest]
+    ) -> dict[str, str]:
+        """Возвращает ссылки на оплату по payment_id"""
+        ...
 
     async def get_states(self, payment_ids: list[str]) -> dict[str, PaymentState]: ...
 
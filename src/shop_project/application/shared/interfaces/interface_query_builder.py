@@ -20,6 +20,10 @@ class IQueryBuilder(Protocol):
 
     def offset(self, offset: int) -> Self: ...
 
+    def after(self, cursor: Any | None) -> Self: ...
+
+    def before(self, cursor: Any | None) -> Self: ...
+
     def load(self, entity_type: Type[PersistableEntity]) -> Self: ...
 
     def and_(self) -> Self: ...
@@ -36,10 +40,12 @@ class IQueryBuilder(Protocol):
 
     def from_id(self, attribute_values: list[UUID]) -> Self: ...
 
-    def for_update(self, no_wait: bool = False) -> Self: ...
+    def for_update(self, no_wait: bool = False, skip_locked: bool = False) -> Self: ...
 
     def for_share(self, no_wait: bool = False) -> Self: ...
 
+    def optimistic(self) -> Self: ...
+
     def no_lock(self) -> Self: ...
 
     def from_previous(self, query_index: int | None = None) -> Self: ...
@@ -9,7 +9,7 @@ T = TypeVar("T", bound=PersistableEntity)
 class IResourceContainer(Protocol):
     def __init__(self, resources_registry: list[Type[PersistableEntity]]) -> None: ...
 
-    def _get_resource_by_type(self, resource_type: Type[T]) -> list[T]: ...
+    def _get_resource_by_type(self, resource_type: Type[T]) -> dict[UUID, T]: ...
 
     def get_by_attribute(
         self, model_type: Type[T], attribute_name: str, values: list[Any]
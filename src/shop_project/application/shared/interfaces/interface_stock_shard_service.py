@@ -0,0 +1,18 @@
+from typing import Protocol
+from uuid import UUID
+
+
+class IStockShardService(Protocol):
+    async def set_shard_count(self, product_id: UUID, shard_count: int) -> None:
+        """
+        Разбивает остаток товара на shard_count строк-шардов (0 - собирает
+        обратно в одну). Общий остаток не меняется.
+        """
+        ...
+
+    async def rebalance(self, chunk_size: int = 100) -> int:
+        """
+        Выравнивает остатки шардов каждого шардированного товара, каждый
+        товар - в своей транзакции. Возвращает число изменённых товаров.
+        """
+        ...
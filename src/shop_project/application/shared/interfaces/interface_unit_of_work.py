@@ -1,4 +1,14 @@
-from typing import AsyncContextManager, Protocol, Type
+from dataclasses import dataclass
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Mapping,
+    Protocol,
+    Type,
+    TypeVar,
+)
 from uuid import UUID
 
 from shop_project.application.shared.interfaces.interface_query_plan import IQueryPlan
@@ -24,6 +34,40 @@ class DeadlockDetectedException(ConcurrencyException):
     """Deadlock detected, operation should be retried."""
 
 
+class ConcurrentModificationException(ConcurrencyException):
+    """Entity version changed since optimistic read, operation should be retried."""
+
+
+class ConditionalDecrementException(Exception):
+    """Guarded decrement matched no row: entity is missing or value is too low."""
+
+    def __init__(self, entity_ids: list[UUID]) -> None:
+        super().__init__(f"Conditional decrement failed for {entity_ids}")
+        self.entity_ids: list[UUID] = entity_ids
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Повтор единицы работы при конфликтах блокировок и версий: экспоненциальная
+    задержка со случайным разбросом, не больше max_attempts попыток и
+    budget_ms общего времени.
+    """
+
+    max_attempts: int = 3
+    base_delay_ms: float = 20
+    max_delay_ms: float = 500
+    budget_ms: float = 2000
+    retry_on: tuple[Type[Exception], ...] = (
+        DeadlockDetectedException,
+        LockTimeoutException,
+        ConcurrentModificationException,
+    )
+
+
+T = TypeVar("T")
+
+
 class IUnitOfWork(Protocol):
     def get_resources(self) -> IResourceContainer: ...
 
@@ -31,6 +75,37 @@ class IUnitOfWork(Protocol):
 
     def mark_commit(self) -> None: ...
 
+    def conditional_decrement(
+        self,
+        model_type: type[PersistableEntity],
+        attribute_name: str,
+        amounts: Mapping[UUID, int],
+        reason: str | None = None,
+    ) -> None:
+        """
+        При коммите, до остальных изменений, уменьшает attribute_name на
+        amounts[entity_id] одним UPDATE ... WHERE attribute_name >= amount
+        на сущность. Если хоть одна строка не подошла - коммит прерывается
+        с ConditionalDecrementException. Загруженные сущности не меняются.
+        С reason списание записывается и в журнал движений модели.
+        """
+        ...
+
+    def append_movements(
+        self,
+        model_type: type[PersistableEntity],
+        attribute_name: str,
+        deltas: Mapping[UUID, int],
+        reason: str,
+    ) -> None:
+        """
+        При коммите дописывает deltas[entity_id] в журнал движений
+        attribute_name, не блокируя и не меняя строки сущностей: значение
+        атрибута при чтении включает ещё не свёрнутые движения. Загруженные
+        сущности не меняются.
+        """
+        ...
+
     @property
     def commit_requested(self) -> bool: ...
 
@@ -41,4 +116,21 @@ class IUnitOfWorkFactory(Protocol):
         query_plan: IQueryPlan,
         exception_on_nowait: Type[Exception] | None = None,
         wait_timeout_ms: int | None = None,
+        read_your_writes: bool = False,
     ) -> AsyncContextManager[IUnitOfWork]: ...
+
+    def stream_ids(
+        self,
+        query_plan: IQueryPlan,
+        chunk_size: int = 100,
+        read_your_writes: bool = False,
+    ) -> AsyncIterator[list[UUID]]: ...
+
+    async def run(
+        self,
+        build_query_plan: Callable[[], IQueryPlan],
+        fn: Callable[[IUnitOfWork], Awaitable[T]],
+        retry: RetryPolicy | None = None,
+        exception_on_nowait: Type[Exception] | None = None,
+        wait_timeout_ms: int | None = None,
+    ) -> T: ...
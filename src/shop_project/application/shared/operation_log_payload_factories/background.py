@@ -1,6 +1,8 @@
 from shop_project.application.entities.operation_log.operation_log_payload_implementations.background import (
     ManualRedeliverTasksOperationLogPayload,
+    ManualTriggerInventoryLedgerCompactionOperationLogPayload,
     ManualTriggerPurchaseFlowOperationLogPayload,
+    ManualTriggerStockShardRebalanceOperationLogPayload,
 )
 from shop_project.application.shared.access_token_payload import AccessTokenPayload
 
@@ -21,3 +23,21 @@ def create_manual_redeliver_tasks_payload(
         subject_type=access_token_payload.subject_type,
         subject_id=access_token_payload.account_id,
     )
+
+
+def create_manual_trigger_stock_shard_rebalance_payload(
+    access_token_payload: AccessTokenPayload,
+) -> ManualTriggerStockShardRebalanceOperationLogPayload:
+    return ManualTriggerStockShardRebalanceOperationLogPayload(
+        subject_type=access_token_payload.subject_type,
+        subject_id=access_token_payload.account_id,
+    )
+
+
+def create_manual_trigger_inventory_ledger_compaction_payload(
+    access_token_payload: AccessTokenPayload,
+) -> ManualTriggerInventoryLedgerCompactionOperationLogPayload:
+    return ManualTriggerInventoryLedgerCompactionOperationLogPayload(
+        subject_type=access_token_payload.subject_type,
+        subject_id=access_token_payload.account_id,
+    )
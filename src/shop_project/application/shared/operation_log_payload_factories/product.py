@@ -1,6 +1,9 @@
+from uuid import UUID
+
 from shop_project.application.entities.operation_log.operation_log_payload_implementations.product import (
     CreateProductOperationLogPayload,
     DeleteProductOperationLogPayload,
+    SetProductStockShardsOperationLogPayload,
     UpdateProductOperationLogPayload,
 )
 from shop_project.application.shared.access_token_payload import AccessTokenPayload
@@ -31,6 +34,17 @@ def create_update_product_payload(
     )
 
 
+def create_set_product_stock_shards_payload(
+    access_token_payload: AccessTokenPayload, product_id: UUID, shard_count: int
+) -> SetProductStockShardsOperationLogPayload:
+    return SetProductStockShardsOperationLogPayload(
+        subject_type=access_token_payload.subject_type,
+        subject_id=access_token_payload.account_id,
+        product_id=product_id,
+        shard_count=shard_count,
+    )
+
+
 def create_delete_product_payload(
     access_token_payload: AccessTokenPayload, product_dto: ProductDTO
 ) -> DeleteProductOperationLogPayload:
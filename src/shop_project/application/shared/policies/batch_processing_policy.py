@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BatchProcessingPolicy:
+    chunk_size: int
+    partition_count: int
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class InventoryReservationPolicy:
+    # Списание остатка одним условным UPDATE на товар, без FOR UPDATE
+    atomic_decrement: bool
+    # Пополнения остатка - строками журнала движений, без блокировки товаров
+    # (сворачиваются в остаток задачей inventory_ledger_compaction); списания
+    # идут как при atomic_decrement и тоже пишутся в журнал
+    ledger: bool
@@ -0,0 +1,117 @@
+from typing import AsyncIterator, Type, TypeVar
+from uuid import UUID
+
+from shop_project.application.background.base_task_handler import BatchTaskParams
+from shop_project.application.background.exceptions import (
+    AlreadyDoneException,
+    RetryException,
+)
+from shop_project.application.entities.task import Task
+from shop_project.application.shared.interfaces.interface_query_builder import (
+    IQueryBuilder,
+)
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWorkFactory,
+)
+from shop_project.application.shared.scenarios.task import capture_task
+
+T = TypeVar("T", bound=BatchTaskParams)
+
+
+# Партиции - равные диапазоны entity_id (128-битное число): границы
+# диапазона переводятся в условия запроса, и каждая задача читает из БД
+# только свои строки
+_ID_SPACE_BITS = 128
+
+
+def is_in_partition(entity_id: UUID, params: BatchTaskParams) -> bool:
+    return (
+        entity_id.int * params.partition_count
+    ) >> _ID_SPACE_BITS == params.partition_index
+
+
+def _get_partition_start(partition_index: int, partition_count: int) -> int:
+    # Наименьшее entity_id.int, для которого is_in_partition дает partition_index
+    return -(-(partition_index << _ID_SPACE_BITS) // partition_count)
+
+
+def _filter_partition(
+    query_builder: IQueryBuilder, params: BatchTaskParams
+) -> IQueryBuilder:
+    if params.partition_index > 0:
+        start = _get_partition_start(params.partition_index, params.partition_count)
+        # Строгое сравнение: граница start входит в партицию
+        query_builder = query_builder.and_().greater_than(
+            "entity_id", UUID(int=start - 1)
+        )
+
+    if params.partition_index < params.partition_count - 1:
+        end = _get_partition_start(params.partition_index + 1, params.partition_count)
+        query_builder = query_builder.and_().less_than("entity_id", UUID(int=end))
+
+    return query_builder
+
+
+async def read_batch_task_params(
+    unit_of_work_factory: IUnitOfWorkFactory,
+    query_builder_type: Type[IQueryBuilder],
+    task_id: UUID,
+    params_type: Type[T],
+) -> T:
+    async with unit_of_work_factory.create(
+        query_builder_type(mutating=False)
+        .load(Task)
+        .from_id([task_id])
+        .no_lock()
+        .build(),
+        # Задача могла быть записана только что и ещё не дойти до реплики
+        read_your_writes=True,
+    ) as uow:
+        task = uow.get_resources().get_by_id_or_none(Task, task_id)
+
+        if task is None:
+            raise AlreadyDoneException("Task is already done")
+
+        return params_type.model_validate_json(task.params_json)
+
+
+async def iterate_partition_chunks(
+    unit_of_work_factory: IUnitOfWorkFactory,
+    query_builder: IQueryBuilder,
+    params: BatchTaskParams,
+) -> AsyncIterator[list[UUID]]:
+    """
+    entity_id сущностей из своей партиции пачками по chunk_size.
+
+    query_builder: read-only построитель с загрузкой и условиями отбора
+    единственного запроса; диапазон партиции и no_lock добавляются здесь.
+    План пачки должен повторить условия отбора и брать корневые сущности
+    через for_update(skip_locked=True): параллельная задача могла уже
+    захватить или обработать часть из них.
+    """
+    query_plan = _filter_partition(query_builder, params).no_lock().build()
+
+    async for entity_ids in unit_of_work_factory.stream_ids(
+        query_plan, chunk_size=params.chunk_size
+    ):
+        yield entity_ids
+
+
+async def complete_batch_task(
+    unit_of_work_factory: IUnitOfWorkFactory,
+    query_builder_type: Type[IQueryBuilder],
+    task_id: UUID,
+) -> None:
+    # Задача удаляется после всех пачек: при сбое посередине повторная
+    # доставка доделает оставшиеся
+    async with unit_of_work_factory.create(
+        query_builder_type(mutating=True)
+        .load(Task)
+        .from_id([task_id])
+        .for_update(no_wait=True)
+        .build(),
+        exception_on_nowait=RetryException,
+    ) as uow:
+        capture_task(uow.get_resources(), task_id)
+
+        uow.mark_commit()
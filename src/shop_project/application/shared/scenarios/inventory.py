@@ -0,0 +1,35 @@
+from typing import Sequence
+
+from shop_project.application.entities.operation_log.operation_code import (
+    OperationCodeEnum,
+)
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    IUnitOfWork,
+)
+from shop_project.domain.entities.product import Product
+from shop_project.domain.helpers.product_inventory import (
+    DeferredProductInventory,
+    ProductInventory,
+)
+
+
+def create_product_inventory(
+    products: Sequence[Product], deferred: bool
+) -> ProductInventory:
+    if deferred:
+        return DeferredProductInventory(products)
+
+    return ProductInventory(products)
+
+
+def append_deferred_restocks(
+    uow: IUnitOfWork,
+    product_inventory: ProductInventory,
+    operation_code: OperationCodeEnum,
+) -> None:
+    # Пополнения отложенного учёта уходят в журнал движений, строки товаров
+    # не блокируются и не меняются
+    if isinstance(product_inventory, DeferredProductInventory):
+        uow.append_movements(
+            Product, "amount", product_inventory.restocks, operation_code.value
+        )
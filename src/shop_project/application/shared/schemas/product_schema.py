@@ -1,6 +1,8 @@
 from decimal import Decimal
 from uuid import UUID
 
+from pydantic import Field
+
 from shop_project.application.shared.base_schema import BaseSchema
 
 
@@ -17,6 +19,12 @@ class ChangeProductSchema(BaseSchema):
     price: Decimal
 
 
+class SetProductStockShardsSchema(BaseSchema):
+    entity_id: UUID
+    # 0 - остаток хранится в строке товара
+    shard_count: int = Field(ge=0, le=64)
+
+
 class CreateProductSchema(BaseSchema):
     name: str
     amount: int
@@ -0,0 +1,82 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Literal, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    after: UUID | None = None
+    before: UUID | None = None
+
+    @property
+    def is_first_page(self) -> bool:
+        return self.after is None and self.before is None
+
+
+def encode_cursor(direction: Literal["after", "before"], key: UUID) -> str:
+    raw = f"{direction}:{key.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> PageCursor:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        direction, key = base64.urlsafe_b64decode(padded).decode().split(":")
+        key_uuid = UUID(hex=key)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if direction == "after":
+        return PageCursor(after=key_uuid)
+    if direction == "before":
+        return PageCursor(before=key_uuid)
+
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_page_cursor(cursor: str | None, offset: int = 0) -> PageCursor:
+    if cursor is None:
+        return PageCursor()
+
+    if offset:
+        raise HTTPException(
+            status_code=400,
+            detail="Specify only one of 'cursor' or 'offset'",
+        )
+
+    return decode_cursor(cursor)
+
+
+def set_cursor_headers(
+    response: Response,
+    page_cursor: PageCursor,
+    keys: Sequence[UUID],
+    limit: int,
+    offset: int = 0,
+    desc: bool = True,
+) -> None:
+    """
+    Выставляет курсоры соседних страниц. keys - значения entity_id страницы,
+    отсортированной по entity_id (desc задает направление сортировки).
+    """
+    if not keys:
+        return
+
+    first, last = (max(keys), min(keys)) if desc else (min(keys), max(keys))
+
+    if len(keys) == limit or page_cursor.before is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor("after", last)
+
+    has_previous = page_cursor.after is not None or offset > 0
+    if page_cursor.before is not None:
+        has_previous = len(keys) == limit
+
+    if has_previous:
+        response.headers[PREV_CURSOR_HEADER] = encode_cursor("before", first)
@@ -2,7 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from shop_project.application.customer.commands.purchase_active_customer_service import (
     PurchaseActiveCustomerService,
@@ -17,6 +17,7 @@ from shop_project.application.customer.schemas.claim_token_schema import (
     ClaimTokenSchema,
 )
 from shop_project.application.customer.schemas.purchase_active_schema import (
+    ActivatePurchaseDraftsSchema,
     PurchaseActivationSchema,
     PurchaseActiveSchema,
 )
@@ -29,6 +30,10 @@ from shop_project.application.customer.schemas.purchase_summary_schema import (
 )
 from shop_project.application.shared.access_token_payload import AccessTokenPayload
 from shop_project.controllers.fastapi.dependencies.auth import get_access_payload
+from shop_project.controllers.fastapi.pagination import (
+    parse_page_cursor,
+    set_cursor_headers,
+)
 
 router = APIRouter(route_class=DishkaRoute, prefix="/customer")
 
@@ -59,6 +64,21 @@ async def activate_purchase_draft(
     )
 
 
+@router.post(
+    "/purchase-drafts/activate",
+    response_model=list[PurchaseActivationSchema],
+)
+async def activate_purchase_drafts(
+    access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
+    service: FromDishka[PurchaseActiveCustomerService],
+    activate: ActivatePurchaseDraftsSchema,
+) -> list[PurchaseActivationSchema]:
+    return await service.activate_drafts(
+        access_payload=access_payload,
+        activate=activate,
+    )
+
+
 @router.post(
     "/purchases/{purchase_active_id}/unclaim",
     response_model=PurchaseSummarySchema,
@@ -168,47 +188,95 @@ async def get_purchase_summaries_by_ids(
     response_model=list[PurchaseActiveSchema],
 )
 async def list_purchase_actives(
+    response: Response,
     access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
     service: FromDishka[PurchaseCustomerReadService],
     offset: int = Query(0, ge=0),
     limit: int = Query(20, gt=0, le=100),
+    cursor: str | None = Query(None),
 ) -> list[PurchaseActiveSchema]:
-    return await service.get_actives(
+    page_cursor = parse_page_cursor(cursor, offset)
+
+    purchase_actives = await service.get_actives(
         access_payload=access_payload,
         offset=offset,
         limit=limit,
+        after=page_cursor.after,
+        before=page_cursor.before,
     )
 
+    set_cursor_headers(
+        response,
+        page_cursor,
+        [item.entity_id for item in purchase_actives],
+        limit,
+        offset,
+    )
+
+    return purchase_actives
+
 
 @router.get(
     "/purchase-drafts",
     response_model=list[PurchaseDraftSchema],
 )
 async def list_purchase_drafts(
+    response: Response,
     access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
     service: FromDishka[PurchaseCustomerReadService],
     offset: int = Query(0, ge=0),
     limit: int = Query(20, gt=0, le=100),
+    cursor: str | None = Query(None),
 ) -> list[PurchaseDraftSchema]:
-    return await service.get_drafts(
+    page_cursor = parse_page_cursor(cursor, offset)
+
+    purchase_drafts = await service.get_drafts(
         access_payload=access_payload,
         offset=offset,
         limit=limit,
+        after=page_cursor.after,
+        before=page_cursor.before,
+    )
+
+    set_cursor_headers(
+        response,
+        page_cursor,
+        [item.entity_id for item in purchase_drafts],
+        limit,
+        offset,
     )
 
+    return purchase_drafts
+
 
 @router.get(
     "/purchase-summaries",
     response_model=list[PurchaseSummarySchema],
 )
 async def list_purchase_summaries(
+    response: Response,
     access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
     service: FromDishka[PurchaseCustomerReadService],
     offset: int = Query(0, ge=0),
     limit: int = Query(20, gt=0, le=100),
+    cursor: str | None = Query(None),
 ) -> list[PurchaseSummarySchema]:
-    return await service.get_summaries(
+    page_cursor = parse_page_cursor(cursor, offset)
+
+    purchase_summaries = await service.get_summaries(
         access_payload=access_payload,
         offset=offset,
         limit=limit,
+        after=page_cursor.after,
+        before=page_cursor.before,
     )
+
+    set_cursor_headers(
+        response,
+        page_cursor,
+        [item.entity_id for item in purchase_summaries],
+        limit,
+        offset,
+    )
+
+    return purchase_summaries
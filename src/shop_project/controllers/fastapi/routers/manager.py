@@ -36,6 +36,7 @@ from shop_project.application.shared.schemas.product_schema import (
     ChangeProductSchema,
     CreateProductSchema,
     ProductSchema,
+    SetProductStockShardsSchema,
 )
 from shop_project.controllers.fastapi.dependencies.auth import get_access_payload
 
@@ -69,6 +70,15 @@ async def change_product(
     return await service.change_product(access_payload, product_schema)
 
 
+@router.put("/products/stock-shards", status_code=204)
+async def set_product_stock_shards(
+    access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
+    service: FromDishka[ProductManagerService],
+    schema: SetProductStockShardsSchema,
+) -> None:
+    await service.set_stock_shards(access_payload, schema)
+
+
 @router.get("/operation-logs")
 async def list_operation_logs(
     access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
@@ -220,6 +230,32 @@ async def trigger_purchase_flow(
     )
 
 
+@router.post(
+    "/background/stock-shards/rebalance",
+    status_code=204,
+)
+async def trigger_stock_shard_rebalance(
+    access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
+    service: FromDishka[BackgroundManagerService],
+) -> None:
+    await service.trigger_stock_shard_rebalance(
+        access_payload=access_payload,
+    )
+
+
+@router.post(
+    "/background/inventory-ledger/compact",
+    status_code=204,
+)
+async def trigger_inventory_ledger_compaction(
+    access_payload: Annotated[AccessTokenPayload, Depends(get_access_payload)],
+    service: FromDishka[BackgroundManagerService],
+) -> None:
+    await service.trigger_inventory_ledger_compaction(
+        access_payload=access_payload,
+    )
+
+
 @router.post(
     "/background/tasks/redeliver",
     status_code=204,
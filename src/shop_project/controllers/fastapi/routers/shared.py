@@ -1,7 +1,7 @@
 from uuid import UUID
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
 from shop_project.application.customer.queries.catalogue_customer_read_service import (
     CatalogueCustomerReadService,
@@ -9,6 +9,10 @@ from shop_project.application.customer.queries.catalogue_customer_read_service i
 from shop_project.application.shared.schemas.product_schema import (
     ProductSchema,
 )
+from shop_project.controllers.fastapi.pagination import (
+    parse_page_cursor,
+    set_cursor_headers,
+)
 
 router = APIRouter(route_class=DishkaRoute, prefix="")
 
@@ -29,11 +33,27 @@ async def get_catalogue_products_by_ids(
     response_model=list[ProductSchema],
 )
 async def list_catalogue_products(
+    response: Response,
     service: FromDishka[CatalogueCustomerReadService],
     offset: int = Query(0, ge=0),
     limit: int = Query(20, gt=0, le=100),
+    cursor: str | None = Query(None),
 ) -> list[ProductSchema]:
-    return await service.get_products(
+    page_cursor = parse_page_cursor(cursor, offset)
+
+    products = await service.get_products(
         offset=offset,
         limit=limit,
+        after=page_cursor.after,
+        before=page_cursor.before,
     )
+
+    set_cursor_headers(
+        response,
+        page_cursor,
+        [product.entity_id for product in products],
+        limit,
+        offset,
+    )
+
+    return products
@@ -47,3 +47,38 @@ class ProductInventory:
 
     def get_item(self, product_id: UUID) -> Product:
         return self._stock[product_id]
+
+
+class DeferredProductInventory(ProductInventory):
+    """
+    Проверяет наличие по загруженным товарам, но не меняет их: списания
+    копятся в reservations и выполняются хранилищем атомарно, с повторной
+    проверкой остатка; пополнения копятся в restocks.
+    """
+
+    def __init__(self, stock: Sequence[Product]) -> None:
+        super().__init__(stock)
+        self.reservations: dict[UUID, int] = {}
+        self.restocks: dict[UUID, int] = {}
+
+    def _ensure_stock_is_sufficient(self, items: Sequence[StockItem]) -> None:
+        for order_item in items:
+            available = self._stock[order_item.product_id].amount - (
+                self.reservations.get(order_item.product_id, 0)
+            )
+            if order_item.amount > available:
+                raise DomainConflictError(
+                    f"Not enough stock for product {order_item.product_id}"
+                )
+
+    def _decrease_stock(self, items: Sequence[StockItem]) -> None:
+        for order_item in items:
+            self.reservations[order_item.product_id] = (
+                self.reservations.get(order_item.product_id, 0) + order_item.amount
+            )
+
+    def _increase_stock(self, items: Sequence[StockItem]) -> None:
+        for order_item in items:
+            self.restocks[order_item.product_id] = (
+                self.restocks.get(order_item.product_id, 0) + order_item.amount
+            )
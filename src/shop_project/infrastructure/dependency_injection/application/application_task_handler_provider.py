@@ -5,21 +5,36 @@ from dishka import Provider, Scope, provide
 from shop_project.application.background.implementations.example_task_handler import (
     ExampleTaskHandler,
 )
+from shop_project.application.background.implementations.inventory_ledger_handler import (
+    InventoryLedgerCompactionTaskHandler,
+)
 from shop_project.application.background.implementations.purchase_flow_handler import (
     BatchFinalizeNotPaidTasksHandler,
     BatchPaidReservationTimeOutTaskHandler,
     BatchWaitPaymentTaskHandler,
     BatchWaitRefundTaskHandler,
 )
+from shop_project.application.background.implementations.stock_shard_handler import (
+    StockShardRebalanceTaskHandler,
+)
+from shop_project.application.shared.interfaces.interface_inventory_ledger_service import (
+    IInventoryLedgerService,
+)
 from shop_project.application.shared.interfaces.interface_payment_gateway import (
     IPaymentGateway,
 )
 from shop_project.application.shared.interfaces.interface_query_builder import (
     IQueryBuilder,
 )
+from shop_project.application.shared.interfaces.interface_stock_shard_service import (
+    IStockShardService,
+)
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
     IUnitOfWorkFactory,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.domain.services.purchase_activation_service import (
     PurchaseActivationService,
 )
@@ -69,6 +84,7 @@ class ApplicationTaskHandlerProvider(Provider):
         purchase_claim_service: PurchaseClaimService,
         purchase_return_service: PurchaseReturnService,
         payment_gateway: IPaymentGateway,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> BatchFinalizeNotPaidTasksHandler:
         return BatchFinalizeNotPaidTasksHandler(
             unit_of_work_factory=unit_of_work_factory,
@@ -77,6 +93,7 @@ class ApplicationTaskHandlerProvider(Provider):
             purchase_claim_service=purchase_claim_service,
             purchase_return_service=purchase_return_service,
             payment_gateway=payment_gateway,
+            inventory_reservation_policy=inventory_reservation_policy,
         )
 
     @provide
@@ -88,6 +105,7 @@ class ApplicationTaskHandlerProvider(Provider):
         purchase_claim_service: PurchaseClaimService,
         purchase_return_service: PurchaseReturnService,
         payment_gateway: IPaymentGateway,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> BatchPaidReservationTimeOutTaskHandler:
         return BatchPaidReservationTimeOutTaskHandler(
             unit_of_work_factory=unit_of_work_factory,
@@ -96,6 +114,7 @@ class ApplicationTaskHandlerProvider(Provider):
             purchase_claim_service=purchase_claim_service,
             purchase_return_service=purchase_return_service,
             payment_gateway=payment_gateway,
+            inventory_reservation_policy=inventory_reservation_policy,
         )
 
     @provide
@@ -116,3 +135,29 @@ class ApplicationTaskHandlerProvider(Provider):
             purchase_return_service=purchase_return_service,
             payment_gateway=payment_gateway,
         )
+
+    @provide
+    async def stock_shard_rebalance_task_handler(
+        self,
+        unit_of_work_factory: IUnitOfWorkFactory,
+        query_builder_type: Type[IQueryBuilder],
+        stock_shard_service: IStockShardService,
+    ) -> StockShardRebalanceTaskHandler:
+        return StockShardRebalanceTaskHandler(
+            unit_of_work_factory=unit_of_work_factory,
+            query_builder_type=query_builder_type,
+            stock_shard_service=stock_shard_service,
+        )
+
+    @provide
+    async def inventory_ledger_compaction_task_handler(
+        self,
+        unit_of_work_factory: IUnitOfWorkFactory,
+        query_builder_type: Type[IQueryBuilder],
+        inventory_ledger_service: IInventoryLedgerService,
+    ) -> InventoryLedgerCompactionTaskHandler:
+        return InventoryLedgerCompactionTaskHandler(
+            unit_of_work_factory=unit_of_work_factory,
+            query_builder_type=query_builder_type,
+            inventory_ledger_service=inventory_ledger_service,
+        )
@@ -27,6 +27,9 @@ from shop_project.application.shared.interfaces.interface_query_builder import (
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
     IUnitOfWorkFactory,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.application.shared.policies.refund_initiation_policy import (
     RefundInitiationPolicy,
 )
@@ -62,6 +65,7 @@ class CustomerApplicationProvider(Provider):
         payment_gateway: IPaymentGateway,
         claim_token_service: IClaimTokenService,
         refund_initiation_policy: RefundInitiationPolicy,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> PurchaseActiveCustomerService:
         return PurchaseActiveCustomerService(
             unit_of_work_factory=unit_of_work_factory,
@@ -72,6 +76,7 @@ class CustomerApplicationProvider(Provider):
             payment_gateway=payment_gateway,
             claim_token_service=claim_token_service,
             refund_initiation_policy=refund_initiation_policy,
+            inventory_reservation_policy=inventory_reservation_policy,
         )
 
     @provide
@@ -23,10 +23,19 @@ from shop_project.application.manager.queries.operation_log_read_service import
 from shop_project.application.shared.interfaces.interface_query_builder import (
     IQueryBuilder,
 )
+from shop_project.application.shared.interfaces.interface_stock_shard_service import (
+    IStockShardService,
+)
 from shop_project.application.shared.interfaces.interface_task_sender import ITaskSender
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
     IUnitOfWorkFactory,
 )
+from shop_project.application.shared.policies.batch_processing_policy import (
+    BatchProcessingPolicy,
+)
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.domain.services.shipment_activation_service import (
     ShipmentActivationService,
 )
@@ -42,10 +51,12 @@ class ManagerApplicationProvider(Provider):
         self,
         unit_of_work_factory: IUnitOfWorkFactory,
         query_builder_type: Type[IQueryBuilder],
+        stock_shard_service: IStockShardService,
     ) -> ProductManagerService:
         return ProductManagerService(
             unit_of_work_factory=unit_of_work_factory,
             query_builder_type=query_builder_type,
+            stock_shard_service=stock_shard_service,
         )
 
     @provide
@@ -56,6 +67,7 @@ class ManagerApplicationProvider(Provider):
         shipment_activation_service: ShipmentActivationService,
         shipment_cancel_service: ShipmentCancelService,
         shipment_receive_service: ShipmentReceiveService,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> ShipmentManagerService:
         return ShipmentManagerService(
             unit_of_work_factory=unit_of_work_factory,
@@ -63,6 +75,7 @@ class ManagerApplicationProvider(Provider):
             shipment_activation_service=shipment_activation_service,
             shipment_cancel_service=shipment_cancel_service,
             shipment_receive_service=shipment_receive_service,
+            inventory_reservation_policy=inventory_reservation_policy,
         )
 
     @provide
@@ -104,9 +117,11 @@ class ManagerApplicationProvider(Provider):
         unit_of_work_factory: IUnitOfWorkFactory,
         query_builder_type: Type[IQueryBuilder],
         task_sender_service: ITaskSender,
+        batch_processing_policy: BatchProcessingPolicy,
     ) -> BackgroundManagerService:
         return BackgroundManagerService(
             unit_of_work_factory=unit_of_work_factory,
             query_builder_type=query_builder_type,
             task_sender_service=task_sender_service,
+            batch_processing_policy=batch_processing_policy,
         )
@@ -9,6 +9,9 @@ from shop_project.application.shared.interfaces.interface_query_builder import (
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
     IUnitOfWorkFactory,
 )
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.domain.services.purchase_return_service import PurchaseReturnService
 
 
@@ -21,9 +24,11 @@ class PaymentApplicationProvider(Provider):
         unit_of_work_factory: IUnitOfWorkFactory,
         query_builder_type: Type[IQueryBuilder],
         purchase_return_service: PurchaseReturnService,
+        inventory_reservation_policy: InventoryReservationPolicy,
     ) -> PaymentService:
         return PaymentService(
             unit_of_work_factory=unit_of_work_factory,
             query_builder_type=query_builder_type,
             purchase_return_service=purchase_return_service,
+            inventory_reservation_policy=inventory_reservation_policy,
         )
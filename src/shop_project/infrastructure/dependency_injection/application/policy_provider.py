@@ -1,5 +1,11 @@
 from dishka import Provider, Scope, provide
 
+from shop_project.application.shared.policies.batch_processing_policy import (
+    BatchProcessingPolicy,
+)
+from shop_project.application.shared.policies.inventory_reservation_policy import (
+    InventoryReservationPolicy,
+)
 from shop_project.application.shared.policies.refund_initiation_policy import (
     RefundInitiationPolicy,
 )
@@ -17,3 +23,21 @@ class PolicyProvider(Provider):
             start_immediately=get_env("REFUND_INITIATION_POLICY_START_IMMEDIATELY")
             == "true"
         )
+
+    @provide
+    async def inventory_reservation_policy(
+        self,
+    ) -> InventoryReservationPolicy:
+        return InventoryReservationPolicy(
+            atomic_decrement=get_env("INVENTORY_ATOMIC_DECREMENT", "false") == "true",
+            ledger=get_env("INVENTORY_LEDGER", "false") == "true",
+        )
+
+    @provide
+    async def batch_processing_policy(
+        self,
+    ) -> BatchProcessingPolicy:
+        return BatchProcessingPolicy(
+            chunk_size=int(get_env("BATCH_CHUNK_SIZE", "100")),
+            partition_count=int(get_env("BATCH_PARTITION_COUNT", "1")),
+        )
@@ -4,15 +4,32 @@ from typing import AsyncGenerator, Callable, Type
 from dishka import BaseScope, Component, Provider, Scope, alias, provide
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from shop_project.application.shared.interfaces.interface_inventory_ledger_service import (
+    IInventoryLedgerService,
+)
 from shop_project.application.shared.interfaces.interface_query_builder import (
     IQueryBuilder,
 )
+from shop_project.application.shared.interfaces.interface_stock_shard_service import (
+    IStockShardService,
+)
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
     IUnitOfWorkFactory,
 )
+from shop_project.infrastructure.env_loader import get_env
 from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.inventory_ledger_service import (
+    InventoryLedgerService,
+)
+from shop_project.infrastructure.persistence.persistence_stats_logger import (
+    PersistenceStatsLogger,
+)
 from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.stock_shard_service import (
+    StockShardService,
+)
 from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+from shop_project.infrastructure.persistence.uow_retry import RetryMetrics
 
 
 class PersistenceProvider(Provider):
@@ -48,9 +65,36 @@ class PersistenceProvider(Provider):
             if session is not None:
                 await session.close()
 
+    @provide(scope=Scope.APP)
+    async def retry_metrics(self) -> RetryMetrics:
+        return RetryMetrics()
+
+    @provide(scope=Scope.APP)
+    async def persistence_stats_logger(
+        self, database: Database, retry_metrics: RetryMetrics
+    ) -> PersistenceStatsLogger:
+        return PersistenceStatsLogger(database, retry_metrics)
+
+    @provide(scope=Scope.REQUEST)
+    async def unit_of_work_factory(
+        self, database: Database, retry_metrics: RetryMetrics
+    ) -> UnitOfWorkFactory:
+        return UnitOfWorkFactory(
+            database,
+            freeze_read_only=get_env("UOW_FREEZE_READ_ONLY", "false") == "true",
+            read_inventory_ledger=get_env("INVENTORY_LEDGER", "false") == "true",
+            retry_metrics=retry_metrics,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    async def stock_shard_service(self, database: Database) -> StockShardService:
+        return StockShardService(database)
+
     @provide(scope=Scope.REQUEST)
-    async def unit_of_work_factory(self, database: Database) -> UnitOfWorkFactory:
-        return UnitOfWorkFactory(database)
+    async def inventory_ledger_service(
+        self, database: Database
+    ) -> InventoryLedgerService:
+        return InventoryLedgerService(database)
 
     @provide(scope=Scope.APP)
     async def query_builder_type(self) -> Type[QueryBuilder]:
@@ -58,3 +102,7 @@ class PersistenceProvider(Provider):
 
     query_builder_type_proto = alias(Type[QueryBuilder], provides=Type[IQueryBuilder])
     unit_of_work_proto = alias(UnitOfWorkFactory, provides=IUnitOfWorkFactory)
+    stock_shard_service_proto = alias(StockShardService, provides=IStockShardService)
+    inventory_ledger_service_proto = alias(
+        InventoryLedgerService, provides=IInventoryLedgerService
+    )
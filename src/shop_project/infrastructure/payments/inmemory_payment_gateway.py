@@ -21,9 +21,15 @@ class InMemoryPaymentGateway(IPaymentGateway):
         self.map[request.payment_id] = PaymentState.PENDING
         return f"example.com/payments/{request.payment_id}"
 
-    async def create_payments(self, requests: list[CreatePaymentRequest]) -> None:
+    async def create_payments(
+        self, requests: list[CreatePaymentRequest]
+    ) -> dict[str, str]:
         for request in requests:
             self.map[request.payment_id] = PaymentState.PENDING
+        return {
+            request.payment_id: f"example.com/payments/{request.payment_id}"
+            for request in requests
+        }
 
     async def get_states(self, payment_ids: list[str]) -> dict[str, PaymentState]:
         return {
@@ -1,6 +1,6 @@
 import sqlite3
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Self
+from typing import Any, AsyncGenerator, Self, Sequence
 
 from sqlalchemy import StaticPool, event, text
 from sqlalchemy.engine import URL
@@ -13,9 +13,28 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import Mapper
 
 from shop_project.infrastructure.env_loader import get_env
+from shop_project.infrastructure.persistence.database.pool import (
+    PoolSettings,
+    PoolStats,
+    PoolTelemetry,
+)
+from shop_project.infrastructure.persistence.database.replica_balancer import (
+    REPLICA_BALANCERS,
+    PReplicaBalancer,
+    RoundRobinReplicaBalancer,
+)
 from shop_project.infrastructure.persistence.repositories import init_repositories
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    RepositoryRegistry,
+)
+from shop_project.infrastructure.persistence.repositories.orm_mapper import (
+    OrmMapperRegistry,
+)
 
 init_repositories.init_repositories()
+OrmMapperRegistry.init(
+    [repository.get_dto_type() for repository in RepositoryRegistry.get_map().values()]
+)
 
 
 def _index_object(session: AsyncSession, instance: Any):
@@ -36,40 +55,118 @@ def index_object(session: AsyncSession, instance: Any):
     _index_object(session, instance)
 
 
+# Ключ в info пулового соединения: таймаут блокировок, уже выставленный
+# в сессии БД этого соединения
+_LOCK_TIMEOUT_INFO_KEY = "lock_wait_timeout"
+
+
+def _reset_lock_timeout_marker(dbapi_connection: Any, connection_record: Any) -> None:
+    # Новое соединение к БД - значение по умолчанию сервера
+    connection_record.info.pop(_LOCK_TIMEOUT_INFO_KEY, None)
+
+
+def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+
 class Database:
+    """
+    Основной движок и необязательный набор реплик. Реплики используются
+    только для чтения (session(..., use_replica=True)), выбор реплики -
+    через balancer.
+    """
+
     debug = False
 
-    def __init__(self, db_url: str, echo: bool = False) -> None:
-        self._engine = create_async_engine(db_url, echo=self.debug, future=True)
-        self._session_factory = async_sessionmaker(
-            bind=self._engine, expire_on_commit=False, class_=AsyncSession
+    def __init__(
+        self,
+        db_url: str,
+        echo: bool = False,
+        replica_urls: Sequence[str] = (),
+        balancer: PReplicaBalancer | None = None,
+        pool_settings: PoolSettings | None = None,
+    ) -> None:
+        pool_kwargs = pool_settings.to_engine_kwargs() if pool_settings else {}
+        self._init_engines(
+            create_async_engine(db_url, echo=self.debug, future=True, **pool_kwargs),
+            [
+                create_async_engine(
+                    replica_url, echo=self.debug, future=True, **pool_kwargs
+                )
+                for replica_url in replica_urls
+            ],
+            balancer,
         )
 
+    def _init_engines(
+        self,
+        engine: AsyncEngine,
+        replica_engines: Sequence[AsyncEngine],
+        balancer: PReplicaBalancer | None,
+    ) -> None:
+        self._engine = engine
+        self._session_factory = _create_session_factory(engine)
+        self._replica_engines: list[AsyncEngine] = list(replica_engines)
+        self._replica_session_factories: dict[
+            AsyncEngine, async_sessionmaker[AsyncSession]
+        ] = {
+            replica_engine: _create_session_factory(replica_engine)
+            for replica_engine in self._replica_engines
+        }
+        self._balancer: PReplicaBalancer = balancer or RoundRobinReplicaBalancer()
+        for pool_engine in [engine, *self._replica_engines]:
+            event.listen(
+                pool_engine.sync_engine.pool, "connect", _reset_lock_timeout_marker
+            )
+        self._pool_telemetry: dict[AsyncEngine, PoolTelemetry] = {
+            pool_engine: PoolTelemetry(pool_engine)
+            for pool_engine in [engine, *self._replica_engines]
+        }
+
     @classmethod
-    def from_engine(cls, engine: AsyncEngine) -> Self:
+    def from_engine(
+        cls,
+        engine: AsyncEngine,
+        replica_engines: Sequence[AsyncEngine] = (),
+        balancer: PReplicaBalancer | None = None,
+    ) -> Self:
         obj = cls.__new__(cls)
-        obj._engine = engine
-        obj._session_factory = async_sessionmaker(
-            bind=engine, expire_on_commit=False, class_=AsyncSession
-        )
+        obj._init_engines(engine, replica_engines, balancer)
 
         return obj
 
     @classmethod
-    def get_url_from_env(cls) -> str:
+    def get_url_from_env(cls, host: str | None = None, port: int | None = None) -> str:
         return URL.create(
             drivername=get_env("DB_DRIVER"),
             username=get_env("DB_USER"),
             password=get_env("DB_PASSWORD"),
-            host=get_env("DB_HOST"),
-            port=int(get_env("DB_PORT")),
+            host=host or get_env("DB_HOST"),
+            port=port or int(get_env("DB_PORT")),
             database=get_env("DB_NAME"),
         ).render_as_string(hide_password=False)
 
+    @classmethod
+    def get_replica_urls_from_env(cls) -> list[str]:
+        # DB_REPLICA_HOSTS=host1:3306,host2:3306
+        replica_urls: list[str] = []
+        for address in get_env("DB_REPLICA_HOSTS", "").split(","):
+            if not address.strip():
+                continue
+            host, _, port = address.strip().partition(":")
+            replica_urls.append(cls.get_url_from_env(host, int(port) if port else None))
+
+        return replica_urls
+
     @classmethod
     def from_env(cls) -> Self:
         obj = cls.__new__(cls)
-        obj.__init__(cls.get_url_from_env())
+        obj.__init__(
+            cls.get_url_from_env(),
+            replica_urls=cls.get_replica_urls_from_env(),
+            balancer=REPLICA_BALANCERS[get_env("DB_REPLICA_BALANCER", "round_robin")](),
+            pool_settings=PoolSettings.from_env(),
+        )
         return obj
 
     @classmethod
@@ -87,14 +184,30 @@ class Database:
         )
         return cls.from_engine(engine)
 
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replica_engines)
+
     @asynccontextmanager
     async def session(
-        self, lock_wait_timeout_ms: int
+        self, lock_wait_timeout_ms: int | None, use_replica: bool = False
     ) -> AsyncGenerator[AsyncSession, None]:
-        """Асинхронный контекстный менеджер для работы с сессией"""
-        session_instance = self._session_factory()
+        """
+        Асинхронный контекстный менеджер для работы с сессией
+
+        lock_wait_timeout_ms: None - таймаут блокировок не трогается (сессии
+        без блокирующих запросов)
+        use_replica: сессия на одной из реплик, если они заданы; данные
+        реплики могут отставать от основной БД
+        """
+        if use_replica and self._replica_engines:
+            replica_engine = self._balancer.choose(self._replica_engines)
+            session_instance = self._replica_session_factories[replica_engine]()
+        else:
+            session_instance = self._session_factory()
         try:
-            await self._apply_lock_timeout(session_instance, lock_wait_timeout_ms)
+            if lock_wait_timeout_ms is not None:
+                await self._apply_lock_timeout(session_instance, lock_wait_timeout_ms)
             yield session_instance
         finally:
             await session_instance.close()
@@ -105,26 +218,45 @@ class Database:
         timeout_ms: int,
     ) -> None:
         dialect = session.bind.dialect.name
+        # MySQL принимает секунды (int >= 1)
+        timeout = max(1, timeout_ms // 1000) if dialect == "mysql" else int(timeout_ms)
 
-        if dialect == "mysql":
-            # MySQL принимает секунды (int >= 1)
-            timeout_seconds = max(1, timeout_ms // 1000)
+        # Значение переживает возврат соединения в пул, поэтому запрос нужен,
+        # только если соединение ещё не настроено на этот таймаут
+        connection_info = (await (await session.connection()).get_raw_connection()).info
+        if connection_info.get(_LOCK_TIMEOUT_INFO_KEY) == timeout:
+            return
 
+        if dialect == "mysql":
             await session.execute(
                 text("SET SESSION innodb_lock_wait_timeout = :timeout"),
-                {"timeout": timeout_seconds},
+                {"timeout": timeout},
             )
 
         elif dialect == "sqlite":
             await session.execute(
-                text(f"PRAGMA busy_timeout = {int(timeout_ms)}")
+                text(f"PRAGMA busy_timeout = {timeout}")
             )  # sqlite doesn't support locks, but let this be just in case
 
+        connection_info[_LOCK_TIMEOUT_INFO_KEY] = timeout
+
     def get_engine(self) -> AsyncEngine:
         return self._engine
 
+    def get_replica_engines(self) -> list[AsyncEngine]:
+        return list(self._replica_engines)
+
+    def get_pool_stats(self) -> dict[str, PoolStats]:
+        stats = {"primary": self._pool_telemetry[self._engine].get_stats()}
+        for index, replica_engine in enumerate(self._replica_engines):
+            stats[f"replica_{index}"] = self._pool_telemetry[replica_engine].get_stats()
+
+        return stats
+
     def create_session(self) -> AsyncSession:
         return self._session_factory()
 
     async def close(self) -> None:
         await self._engine.dispose()
+        for replica_engine in self._replica_engines:
+            await replica_engine.dispose()
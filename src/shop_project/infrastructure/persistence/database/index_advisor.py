@@ -0,0 +1,264 @@
+"""
+Ищет колонки, по которым фильтруют планы запросов, но для которых нет индекса.
+
+Источники фильтров:
+- DomainReferenceRegistry (from_previous);
+- цепочки QueryBuilder в модулях application (разбираются через ast).
+
+Колонка считается покрытой, если в таблице есть индекс (или первичный ключ),
+который начинается с одной из колонок того же запроса и содержит её.
+
+Запуск: python -m shop_project.infrastructure.persistence.database.index_advisor
+"""
+
+import ast
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Type, TypeGuard
+
+from sqlalchemy import Table, UniqueConstraint
+
+import shop_project.application
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    BaseRepository,
+    RepositoryRegistry,
+    get_local_table,
+)
+from shop_project.infrastructure.persistence.repositories.init_repositories import (
+    init_repositories,
+)
+from shop_project.infrastructure.registries.load_resolution_registry import (
+    DomainReferenceRegistry,
+)
+
+_CRITERIA_METHODS = {"from_attribute", "greater_than", "less_than", "order_by"}
+
+
+@dataclass(frozen=True)
+class FilteredQuery:
+    entity_type: Type[PersistableEntity]
+    attribute_names: tuple[str, ...]
+    source: str
+
+
+@dataclass(frozen=True)
+class MissingIndex:
+    table_name: str
+    column_name: str
+    source: str
+
+    def __str__(self) -> str:
+        return f"{self.table_name}.{self.column_name} ({self.source})"
+
+
+def collect_reference_queries() -> list[FilteredQuery]:
+    result: list[FilteredQuery] = []
+
+    for source_type, targets in DomainReferenceRegistry.get_map().items():
+        for target_type, descriptor in targets.items():
+            result.append(
+                FilteredQuery(
+                    entity_type=target_type,
+                    attribute_names=(descriptor.attribute_name,),
+                    source=f"from_previous {source_type.__name__}",
+                )
+            )
+
+    return result
+
+
+def collect_service_queries(
+    entity_types: Iterable[Type[PersistableEntity]],
+    root: Path | None = None,
+) -> list[FilteredQuery]:
+    if root is None:
+        root = Path(next(iter(shop_project.application.__path__)))
+
+    types_by_name = {entity_type.__name__: entity_type for entity_type in entity_types}
+    result: list[FilteredQuery] = []
+
+    for path in sorted(root.rglob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        for node in ast.walk(tree):
+            if _is_chain_tail(node):
+                result.extend(
+                    _queries_from_chain(
+                        node, types_by_name, f"{path.relative_to(root.parent)}"
+                    )
+                )
+
+    return result
+
+
+def find_missing_indexes(queries: Iterable[FilteredQuery]) -> list[MissingIndex]:
+    repositories = RepositoryRegistry.get_map()
+    result: list[MissingIndex] = []
+    seen: set[tuple[str, str]] = set()
+
+    for query in queries:
+        repository_type = repositories.get(query.entity_type)
+        if repository_type is None:
+            continue
+
+        columns_by_table: dict[str, tuple[Table, set[str]]] = {}
+        for attribute_name in query.attribute_names:
+            table, column_name = _resolve_column(repository_type, attribute_name)
+            columns_by_table.setdefault(table.name, (table, set()))[1].add(column_name)
+
+        for table, column_names in columns_by_table.values():
+            for column_name in sorted(column_names):
+                if is_indexed(table, column_name, column_names):
+                    continue
+                if (table.name, column_name) in seen:
+                    continue
+
+                seen.add((table.name, column_name))
+                result.append(MissingIndex(table.name, column_name, query.source))
+
+    return result
+
+
+def is_indexed(
+    table: Table, column_name: str, query_column_names: Iterable[str] = ()
+) -> bool:
+    leading_candidates = {column_name, *query_column_names}
+
+    for index_columns in _iter_index_columns(table):
+        if index_columns[0] in leading_candidates and column_name in index_columns:
+            return True
+
+    return False
+
+
+def _iter_index_columns(table: Table) -> Iterator[list[str]]:
+    if table.primary_key.columns:
+        yield [column.name for column in table.primary_key.columns]
+
+    for index in table.indexes:
+        yield [column.name for column in index.columns]
+
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            yield [column.name for column in constraint.columns]
+
+
+def _resolve_column(
+    repository_type: Type[BaseRepository[Any, Any, Any]], attribute_name: str
+) -> tuple[Table, str]:
+    if "." not in attribute_name:
+        return get_local_table(repository_type.get_orm_type()), attribute_name
+
+    container_name, column_name = attribute_name.split(".", 1)
+    for child_descriptor in getattr(repository_type, "child_descriptors", []):
+        if child_descriptor.parent_dto_child_container_field_name == container_name:
+            return get_local_table(child_descriptor.child_orm), column_name
+
+    raise ValueError(
+        f"Unknown child container {container_name} for {repository_type.__name__}"
+    )
+
+
+def _is_chain_tail(node: ast.AST) -> TypeGuard[ast.Call]:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "build"
+    )
+
+
+def _queries_from_chain(
+    tail: ast.Call,
+    types_by_name: dict[str, Type[PersistableEntity]],
+    source: str,
+) -> list[FilteredQuery]:
+    # (вызов, имя метода) от начала цепочки к build()
+    calls: list[tuple[ast.Call, str]] = []
+    node: ast.AST = tail
+    while isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        calls.append((node, node.func.attr))
+        node = node.func.value
+    calls.reverse()
+
+    loads: list[tuple[Type[PersistableEntity] | None, list[str], int]] = []
+    for call, method in calls:
+        if method == "load":
+            entity_type = None
+            if call.args and isinstance(call.args[0], ast.Name):
+                entity_type = types_by_name.get(call.args[0].id)
+            loads.append((entity_type, [], call.lineno))
+        elif not loads:
+            continue
+        elif method in _CRITERIA_METHODS:
+            if (
+                call.args
+                and isinstance(call.args[0], ast.Constant)
+                and isinstance(call.args[0].value, str)
+            ):
+                loads[-1][1].append(call.args[0].value)
+        elif method == "from_id":
+            loads[-1][1].append("entity_id")
+        elif method == "from_previous":
+            attribute_name = _from_previous_attribute(call, loads)
+            if attribute_name is not None:
+                loads[-1][1].append(attribute_name)
+
+    return [
+        FilteredQuery(entity_type, tuple(attribute_names), f"{source}:{lineno}")
+        for entity_type, attribute_names, lineno in loads
+        if entity_type is not None and attribute_names
+    ]
+
+
+def _from_previous_attribute(
+    call: ast.Call,
+    loads: list[tuple[Type[PersistableEntity] | None, list[str], int]],
+) -> str | None:
+    # Текущий запрос последний в loads, from_previous ссылается на предыдущие
+    query_index = len(loads) - 2
+    if call.args:
+        if not isinstance(call.args[0], ast.Constant) or not isinstance(
+            call.args[0].value, int
+        ):
+            return None
+        query_index = call.args[0].value
+
+    if query_index < 0 or query_index >= len(loads) - 1:
+        return None
+
+    previous_type = loads[query_index][0]
+
+    current_type = loads[-1][0]
+    if previous_type is None or current_type is None:
+        return None
+
+    try:
+        descriptor = DomainReferenceRegistry.get_reference_descriptor(
+            previous_type, current_type
+        )
+    except NotImplementedError:
+        return None
+
+    return descriptor.attribute_name
+
+
+def main() -> int:
+    init_repositories()
+
+    queries = collect_reference_queries() + collect_service_queries(
+        RepositoryRegistry.get_map().keys()
+    )
+    missing = find_missing_indexes(queries)
+
+    for missing_index in missing:
+        print(f"missing index: {missing_index}")
+
+    if not missing:
+        print(f"all filtered columns are indexed ({len(queries)} queries checked)")
+
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@ from typing import Any
 from uuid import UUID
 
 from pydantic import SecretStr
-from sqlalchemy import PrimaryKeyConstraint, String
+from sqlalchemy import Index, PrimaryKeyConstraint, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shop_project.infrastructure.persistence.database.models.base import Base
@@ -18,7 +18,12 @@ class Account(Base):
     phone_number: Mapped[str | None] = mapped_column(String(50), nullable=True)
     email: Mapped[str | None] = mapped_column(String(50), nullable=True)
 
-    __table_args__ = (PrimaryKeyConstraint("entity_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("entity_id"),
+        Index("ix_account_login", "login"),
+        Index("ix_account_phone_number", "phone_number"),
+        Index("ix_account_email", "email"),
+    )
 
     def repopulate(
         self,
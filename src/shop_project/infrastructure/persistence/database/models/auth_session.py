@@ -4,6 +4,8 @@ from uuid import UUID
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
+    Integer,
     PrimaryKeyConstraint,
     String,
 )
@@ -28,6 +30,9 @@ class AuthSession(Base):
     expiration: Mapped[datetime] = mapped_column(
         UTCDateTime(timezone=True), nullable=False
     )
+    version: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=1, server_default="1"
+    )
 
     account: Mapped["Account"] = relationship(
         lazy="raise",
@@ -36,8 +41,13 @@ class AuthSession(Base):
     __table_args__ = (
         PrimaryKeyConstraint("entity_id"),
         ForeignKeyConstraint(["account_id"], ["account.entity_id"]),
+        Index("ix_auth_session_account_id", "account_id"),
+        Index("ix_auth_session_refresh_token_fingerprint", "refresh_token_fingerprint"),
     )
 
+    # Версию увеличивает репозиторий при каждом изменении (см. BaseRepository)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+
     def repopulate(
         self,
         entity_id: UUID,
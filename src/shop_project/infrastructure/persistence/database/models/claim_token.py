@@ -4,6 +4,7 @@ from uuid import UUID
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
     PrimaryKeyConstraint,
     String,
 )
@@ -36,6 +37,7 @@ class ClaimToken(Base):
     __table_args__ = (
         PrimaryKeyConstraint("entity_id"),
         ForeignKeyConstraint(["entity_id"], ["customer.entity_id"]),
+        Index("ix_claim_token_token_fingerprint", "token_fingerprint"),
     )
 
     def repopulate(
@@ -2,7 +2,13 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-from sqlalchemy import ForeignKeyConstraint, Numeric, PrimaryKeyConstraint, String
+from sqlalchemy import (
+    ForeignKeyConstraint,
+    Index,
+    Numeric,
+    PrimaryKeyConstraint,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shop_project.infrastructure.persistence.database.models.base import Base
@@ -28,6 +34,8 @@ class EscrowAccount(Base):
     __table_args__ = (
         PrimaryKeyConstraint("entity_id"),
         ForeignKeyConstraint(["customer_id"], ["customer.entity_id"]),
+        Index("ix_escrow_account_customer_id", "customer_id"),
+        Index("ix_escrow_account_state", "state"),
     )
 
     def repopulate(
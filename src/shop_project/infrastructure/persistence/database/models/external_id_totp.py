@@ -3,7 +3,7 @@ from typing import Any
 from uuid import UUID
 
 from pydantic import SecretStr
-from sqlalchemy import PrimaryKeyConstraint, String
+from sqlalchemy import Index, PrimaryKeyConstraint, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shop_project.infrastructure.persistence.database.models.base import Base
@@ -24,7 +24,14 @@ class ExternalIdTotp(Base):
         UTCDateTime(timezone=True), nullable=False
     )
 
-    __table_args__ = (PrimaryKeyConstraint("entity_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("entity_id"),
+        Index(
+            "ix_external_id_totp_external_id_external_id_type",
+            "external_id",
+            "external_id_type",
+        ),
+    )
 
     def repopulate(
         self,
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Boolean, Index, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shop_project.infrastructure.persistence.database.models.base import Base
+from shop_project.infrastructure.persistence.database.seq_type import SeqType
+from shop_project.infrastructure.persistence.database.utc_datetime import UTCDateTime
+
+
+class InventoryMovement(Base):
+    __tablename__ = "inventory_movement"
+
+    seq: Mapped[int] = mapped_column(
+        SeqType(), nullable=False, autoincrement=True
+    )  # let database generate on its own
+    # Без внешнего ключа: журнал переживает удаление товара
+    product_id: Mapped[UUID] = mapped_column(nullable=False)
+    delta: Mapped[int] = mapped_column(Integer(), nullable=False)
+    reason: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Движение уже учтено в product.amount (свёрнуто или записано списанием)
+    applied: Mapped[bool] = mapped_column(Boolean(), nullable=False)
+    occured_at: Mapped[datetime] = mapped_column(
+        UTCDateTime(timezone=True), nullable=False
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("seq"),
+        Index("ix_inventory_movement_product_id_applied", "product_id", "applied"),
+    )
+
+    def repopulate(
+        self,
+        product_id: UUID,
+        delta: int,
+        reason: str,
+        applied: bool,
+        occured_at: datetime,
+        **kw: Any,
+    ) -> None:
+        self.product_id = product_id
+        self.delta = delta
+        self.reason = reason
+        self.applied = applied
+        self.occured_at = occured_at
+
+    def __init__(self, **kw: Any) -> None:
+        super().__init__()
+        self.repopulate(**kw)
@@ -2,7 +2,13 @@ from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Integer, Numeric, PrimaryKeyConstraint, String
+from sqlalchemy import (
+    ForeignKeyConstraint,
+    Integer,
+    Numeric,
+    PrimaryKeyConstraint,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shop_project.infrastructure.persistence.database.models.base import Base
@@ -15,9 +21,18 @@ class Product(Base):
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     amount: Mapped[int] = mapped_column(Integer(), nullable=False)
     price: Mapped[Decimal] = mapped_column(Numeric(), nullable=False)
+    version: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=1, server_default="1"
+    )
+    # 0 - остаток в столбце amount; иначе остаток - сумма строк
+    # product_stock_shard, а amount не используется (см. stock_shards)
+    stock_shard_count: Mapped[int] = mapped_column(Integer(), nullable=False, default=0)
 
     __table_args__ = (PrimaryKeyConstraint("entity_id"),)
 
+    # Версию увеличивает репозиторий при каждом изменении (см. BaseRepository)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+
     def repopulate(
         self, entity_id: UUID, name: str, amount: int, price: Decimal, **kw: Any
     ) -> None:
@@ -29,3 +44,27 @@ class Product(Base):
     def __init__(self, **kw: Any) -> None:
         super().__init__()
         self.repopulate(**kw)
+
+
+class ProductStockShard(Base):
+    __tablename__ = "product_stock_shard"
+
+    product_id: Mapped[UUID] = mapped_column(nullable=False)
+    shard_index: Mapped[int] = mapped_column(Integer(), nullable=False)
+    amount: Mapped[int] = mapped_column(Integer(), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("product_id", "shard_index"),
+        ForeignKeyConstraint(["product_id"], ["product.entity_id"]),
+    )
+
+    def repopulate(
+        self, product_id: UUID, shard_index: int, amount: int, **kw: Any
+    ) -> None:
+        self.product_id = product_id
+        self.shard_index = shard_index
+        self.amount = amount
+
+    def __init__(self, **kw: Any) -> None:
+        super().__init__()
+        self.repopulate(**kw)
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -51,6 +52,13 @@ class PurchaseActive(Base):
         PrimaryKeyConstraint("entity_id"),
         ForeignKeyConstraint(["escrow_account_id"], ["escrow_account.entity_id"]),
         ForeignKeyConstraint(["customer_id"], ["customer.entity_id"]),
+        Index("ix_purchase_active_customer_id", "customer_id"),
+        Index(
+            "ix_purchase_active_escrow_account_id_reserved_until",
+            "escrow_account_id",
+            "reserved_until",
+        ),
+        Index("ix_purchase_active_reserved_until", "reserved_until"),
     )
 
     def repopulate(
@@ -89,6 +97,7 @@ class PurchaseActiveItem(Base):
         PrimaryKeyConstraint("parent_id", "product_id"),
         ForeignKeyConstraint(["parent_id"], ["purchase_active.entity_id"]),
         ForeignKeyConstraint(["product_id"], ["product.entity_id"]),
+        Index("ix_purchase_active_item_product_id", "product_id"),
     )
 
     def repopulate(
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -23,6 +24,9 @@ class PurchaseDraft(Base):
     entity_id: Mapped[UUID] = mapped_column(nullable=False)
     customer_id: Mapped[UUID] = mapped_column(nullable=False)
     state: Mapped[str] = mapped_column(String(50), nullable=False)
+    version: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=1, server_default="1"
+    )
 
     items: Mapped[list["PurchaseDraftItem"]] = relationship(
         back_populates="parent",
@@ -37,8 +41,13 @@ class PurchaseDraft(Base):
     __table_args__ = (
         PrimaryKeyConstraint("entity_id"),
         ForeignKeyConstraint(["customer_id"], ["customer.entity_id"]),
+        Index("ix_purchase_draft_customer_id", "customer_id"),
     )
 
+    # Версию увеличивает репозиторий при каждом изменении, в том числе при
+    # изменении только позиций черновика
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+
     def repopulate(
         self, entity_id: UUID, customer_id: UUID, state: str, **kw: Any
     ) -> None:
@@ -70,6 +79,7 @@ class PurchaseDraftItem(Base):
             ["purchase_draft.entity_id"],
         ),
         ForeignKeyConstraint(["product_id"], ["product.entity_id"]),
+        Index("ix_purchase_draft_item_product_id", "product_id"),
     )
 
     def repopulate(
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -49,6 +50,8 @@ class PurchaseSummary(Base):
         PrimaryKeyConstraint("entity_id"),
         ForeignKeyConstraint(["escrow_account_id"], ["escrow_account.entity_id"]),
         ForeignKeyConstraint(["customer_id"], ["customer.entity_id"]),
+        Index("ix_purchase_summary_customer_id", "customer_id"),
+        Index("ix_purchase_summary_escrow_account_id", "escrow_account_id"),
     )
 
     def repopulate(
@@ -85,6 +88,7 @@ class PurchaseSummaryItem(Base):
         PrimaryKeyConstraint("parent_id", "product_id"),
         ForeignKeyConstraint(["parent_id"], ["purchase_summary.entity_id"]),
         ForeignKeyConstraint(["product_id"], ["product.entity_id"]),
+        Index("ix_purchase_summary_item_product_id", "product_id"),
     )
 
     def repopulate(
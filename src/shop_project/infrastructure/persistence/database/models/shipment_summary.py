@@ -3,6 +3,7 @@ from uuid import UUID
 
 from sqlalchemy import (
     ForeignKeyConstraint,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -51,6 +52,7 @@ class ShipmentSummaryItem(Base):
         PrimaryKeyConstraint("parent_id", "product_id"),
         ForeignKeyConstraint(["parent_id"], ["shipment_summary.entity_id"]),
         ForeignKeyConstraint(["product_id"], ["product.entity_id"]),
+        Index("ix_shipment_summary_item_product_id", "product_id"),
     )
 
     def repopulate(
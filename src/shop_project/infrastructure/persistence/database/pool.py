@@ -0,0 +1,154 @@
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Self
+
+from sqlalchemy import QueuePool, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shop_project.infrastructure.env_loader import get_env
+
+# Верхние границы корзин гистограммы ожидания соединения, мс
+CHECKOUT_LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+)
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    # -1 - соединения не пересоздаются по возрасту
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+
+    @classmethod
+    def from_env(cls) -> Self:
+        default = cls()
+        return cls(
+            pool_size=int(get_env("DB_POOL_SIZE", str(default.pool_size))),
+            max_overflow=int(
+                get_env("DB_POOL_MAX_OVERFLOW", str(default.max_overflow))
+            ),
+            pool_timeout=float(get_env("DB_POOL_TIMEOUT", str(default.pool_timeout))),
+            pool_recycle=int(get_env("DB_POOL_RECYCLE", str(default.pool_recycle))),
+            pool_pre_ping=get_env("DB_POOL_PRE_PING", "false") == "true",
+        )
+
+    def to_engine_kwargs(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    in_use: int
+    # None, если пул не держит простаивающие соединения (StaticPool, NullPool)
+    idle: int | None
+    checkouts: int
+    overflow_checkouts: int
+    checkout_timeouts: int
+    # Счётчики по CHECKOUT_LATENCY_BUCKETS_MS, последний - выше всех границ
+    checkout_latency_buckets: tuple[int, ...]
+    checkout_latency_max_ms: float
+
+
+class PoolTelemetry:
+    """
+    Наблюдение за пулом соединений движка: занятые/свободные соединения,
+    выдачи сверх pool_size, таймауты и гистограмма времени ожидания
+    соединения.
+
+    Занятые соединения и переполнение считаются по событиям пула. У пула нет
+    события до выдачи соединения, поэтому ожидание и таймауты измеряются
+    обёрткой над _do_get пула - так учитывается любая выдача, в том числе
+    для сессий Database.create_session.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine: AsyncEngine = engine
+        self._in_use: int = 0
+        self._checkouts: int = 0
+        self._overflow_checkouts: int = 0
+        self._checkout_timeouts: int = 0
+        self._latency_buckets: list[int] = [0] * (len(CHECKOUT_LATENCY_BUCKETS_MS) + 1)
+        self._latency_max_ms: float = 0
+        # События пула приходят из потоков драйвера
+        self._lock: threading.Lock = threading.Lock()
+
+        pool = engine.sync_engine.pool
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        pool._do_get = self._wrap_do_get(pool._do_get)  # type: ignore[method-assign]
+
+    def _wrap_do_get(self, do_get: Callable[[], Any]) -> Callable[[], Any]:
+        def timed_do_get() -> Any:
+            start = time.perf_counter()
+            try:
+                connection_record = do_get()
+            except PoolTimeoutError:
+                self.observe_checkout_timeout()
+                raise
+
+            self.observe_checkout_latency((time.perf_counter() - start) * 1000)
+            return connection_record
+
+        return timed_do_get
+
+    def _on_checkout(self, *args: Any) -> None:
+        pool = self.engine.sync_engine.pool
+        # Размер есть только у QueuePool (в т.ч. AsyncAdaptedQueuePool)
+        size = pool.size() if isinstance(pool, QueuePool) else None
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            if size is not None and self._in_use > size:
+                self._overflow_checkouts += 1
+
+    def _on_checkin(self, *args: Any) -> None:
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+
+    def observe_checkout_latency(self, latency_ms: float) -> None:
+        index = bisect.bisect_left(CHECKOUT_LATENCY_BUCKETS_MS, latency_ms)
+        with self._lock:
+            self._latency_buckets[index] += 1
+            self._latency_max_ms = max(self._latency_max_ms, latency_ms)
+
+    def observe_checkout_timeout(self) -> None:
+        with self._lock:
+            self._checkout_timeouts += 1
+
+    def get_stats(self) -> PoolStats:
+        pool = self.engine.sync_engine.pool
+        checkedin = getattr(pool, "checkedin", None)
+
+        with self._lock:
+            return PoolStats(
+                in_use=self._in_use,
+                idle=checkedin() if checkedin is not None else None,
+                checkouts=self._checkouts,
+                overflow_checkouts=self._overflow_checkouts,
+                checkout_timeouts=self._checkout_timeouts,
+                checkout_latency_buckets=tuple(self._latency_buckets),
+                checkout_latency_max_ms=self._latency_max_ms,
+            )
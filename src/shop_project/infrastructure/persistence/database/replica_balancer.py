@@ -0,0 +1,28 @@
+import random
+from itertools import count
+from typing import Protocol, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class PReplicaBalancer(Protocol):
+    def choose(self, replicas: Sequence[AsyncEngine]) -> AsyncEngine: ...
+
+
+class RoundRobinReplicaBalancer(PReplicaBalancer):
+    def __init__(self) -> None:
+        self._counter = count()
+
+    def choose(self, replicas: Sequence[AsyncEngine]) -> AsyncEngine:
+        return replicas[next(self._counter) % len(replicas)]
+
+
+class RandomReplicaBalancer(PReplicaBalancer):
+    def choose(self, replicas: Sequence[AsyncEngine]) -> AsyncEngine:
+        return random.choice(replicas)
+
+
+REPLICA_BALANCERS: dict[str, type[PReplicaBalancer]] = {
+    "round_robin": RoundRobinReplicaBalancer,
+    "random": RandomReplicaBalancer,
+}
@@ -0,0 +1,157 @@
+from datetime import datetime, timezone
+from typing import Any, Mapping
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shop_project.infrastructure.persistence.database.models.inventory_movement import (
+    InventoryMovement,
+)
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+)
+from shop_project.infrastructure.persistence.stock_shards import ProductStockShards
+
+# Ключ в session.info: при чтении товаров учитывать несвёрнутые движения
+INVENTORY_LEDGER_INFO_KEY = "inventory_ledger"
+
+
+class ProductInventoryLedger:
+    """
+    Журнал движений остатка товаров (inventory_movement).
+
+    Пополнения дописываются строками applied = false и строку product не
+    блокируют. Остаток товара - product.amount (или сумма шардов) плюс сумма
+    несвёрнутых движений; свёртка переносит их в остаток под блокировкой
+    строки товара. Списания пишутся в журнал уже учтёнными - для аудита.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def append(
+        self, deltas: Mapping[UUID, int], reason: str, applied: bool
+    ) -> None:
+        occured_at = datetime.now(tz=timezone.utc)
+        rows = [
+            {
+                "product_id": product_id,
+                "delta": delta,
+                "reason": reason,
+                "applied": applied,
+                "occured_at": occured_at,
+            }
+            for product_id, delta in sorted(deltas.items())
+            if delta
+        ]
+        if rows:
+            await self.session.execute(insert(InventoryMovement), rows)
+
+    @staticmethod
+    def get_pending_total_expression() -> ColumnElement[Any]:
+        """
+        Сумма несвёрнутых движений товара - коррелированный подзапрос для
+        SELECT строк product
+        """
+        return (
+            select(func.coalesce(func.sum(InventoryMovement.delta), 0))
+            .where(
+                InventoryMovement.product_id == ProductORM.entity_id,
+                InventoryMovement.applied.is_(False),
+            )
+            .scalar_subquery()
+        )
+
+    async def get_pending_totals(
+        self, product_ids: list[UUID], locking: bool = False
+    ) -> dict[UUID, int]:
+        """
+        locking: читать движения FOR SHARE - вместе с заблокированными строками
+        товаров, а не из более раннего снимка транзакции
+        """
+        if not product_ids:
+            return {}
+
+        statement = (
+            select(InventoryMovement.product_id, func.sum(InventoryMovement.delta))
+            .where(
+                InventoryMovement.product_id.in_(product_ids),
+                InventoryMovement.applied.is_(False),
+            )
+            .group_by(InventoryMovement.product_id)
+        )
+        if locking:
+            statement = statement.with_for_update(read=True)
+
+        result = await self.session.execute(statement)
+        return {product_id: int(total) for product_id, total in result.all() if total}
+
+    async def get_pending_product_ids(
+        self, after_id: UUID | None, limit: int
+    ) -> list[UUID]:
+        statement = (
+            select(InventoryMovement.product_id)
+            .where(InventoryMovement.applied.is_(False))
+            .group_by(InventoryMovement.product_id)
+            .order_by(InventoryMovement.product_id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            statement = statement.where(InventoryMovement.product_id > after_id)
+
+        return list((await self.session.execute(statement)).scalars())
+
+    async def fold(self, product_id: UUID) -> int:
+        """
+        Переносит несвёрнутые движения товара в его остаток, возвращает их
+        число. Строка товара блокируется первой - как и при списании.
+        """
+        product = (
+            await self.session.execute(
+                select(ProductORM.stock_shard_count)
+                .where(ProductORM.entity_id == product_id)
+                .with_for_update()
+            )
+        ).one_or_none()
+
+        movements = (
+            await self.session.execute(
+                select(InventoryMovement.seq, InventoryMovement.delta)
+                .where(
+                    InventoryMovement.product_id == product_id,
+                    InventoryMovement.applied.is_(False),
+                )
+                .with_for_update()
+            )
+        ).all()
+        if not movements:
+            return 0
+
+        total = sum(movement.delta for movement in movements)
+        # Движения удалённого товара просто помечаются учтёнными
+        if product is not None and total:
+            if not product.stock_shard_count:
+                values = {"amount": ProductORM.amount + total}
+            elif total > 0:
+                await ProductStockShards(self.session).increase(
+                    product_id, product.stock_shard_count, total
+                )
+                values = {}
+            else:
+                await ProductStockShards(self.session).decrease(product_id, -total)
+                values = {}
+
+            await self.session.execute(
+                update(ProductORM)
+                .where(ProductORM.entity_id == product_id)
+                .values(**values, version=ProductORM.version + 1)
+            )
+
+        await self.session.execute(
+            update(InventoryMovement)
+            .where(InventoryMovement.seq.in_([movement.seq for movement in movements]))
+            .values(applied=True)
+        )
+
+        return len(movements)
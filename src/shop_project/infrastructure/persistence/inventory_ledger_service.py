@@ -0,0 +1,42 @@
+from uuid import UUID
+
+from shop_project.application.shared.interfaces.interface_inventory_ledger_service import (
+    IInventoryLedgerService,
+)
+from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.inventory_ledger import (
+    ProductInventoryLedger,
+)
+from shop_project.infrastructure.persistence.mysql_concurrency_exception_handler import (
+    translate_mysql_concurrency_errors,
+)
+
+
+class InventoryLedgerService(IInventoryLedgerService):
+    def __init__(self, database: Database, lock_wait_timeout_ms: int = 1500) -> None:
+        self.database: Database = database
+        self.lock_wait_timeout_ms: int = lock_wait_timeout_ms
+
+    async def compact(self, chunk_size: int = 100) -> int:
+        compacted = 0
+        last_id: UUID | None = None
+
+        while True:
+            async with self.database.session(None) as session:
+                product_ids = await ProductInventoryLedger(
+                    session
+                ).get_pending_product_ids(last_id, chunk_size)
+
+            # Строка товара блокируется только на время свёртки его движений
+            for product_id in product_ids:
+                async with self.database.session(self.lock_wait_timeout_ms) as session:
+                    async with translate_mysql_concurrency_errors():
+                        compacted += await ProductInventoryLedger(session).fold(
+                            product_id
+                        )
+                        await session.commit()
+
+            if len(product_ids) < chunk_size:
+                return compacted
+
+            last_id = product_ids[-1]
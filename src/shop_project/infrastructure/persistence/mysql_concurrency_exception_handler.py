@@ -1,8 +1,10 @@
 from contextlib import asynccontextmanager
 
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.exc import StaleDataError
 
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConcurrentModificationException,
     DeadlockDetectedException,
     LockTimeoutException,
     NoWaitException,
@@ -19,6 +21,10 @@ MYSQL_LOCK_ERRORS = {
 async def translate_mysql_concurrency_errors():
     try:
         yield
+    except StaleDataError as e:
+        # UPDATE/DELETE по entity_id и version не нашёл строку: версия
+        # изменилась после оптимистичного чтения
+        raise ConcurrentModificationException() from e
     except OperationalError as e:
         orig = e.orig
 
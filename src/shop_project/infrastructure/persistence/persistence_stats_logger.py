@@ -0,0 +1,29 @@
+import asyncio
+from logging import getLogger
+
+from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.uow_retry import RetryMetrics
+
+_logger = getLogger("shop_project.persistence")
+
+
+class PersistenceStatsLogger:
+    """
+    Периодический вывод статистики пулов соединений и повторов UoW в лог.
+    Включается PERSISTENCE_STATS_LOG_INTERVAL (секунды, 0 - выключено).
+    """
+
+    def __init__(self, database: Database, retry_metrics: RetryMetrics) -> None:
+        self._database: Database = database
+        self._retry_metrics: RetryMetrics = retry_metrics
+
+    def log_stats(self) -> None:
+        for name, stats in self._database.get_pool_stats().items():
+            _logger.info("Connection pool %s: %s", name, stats)
+
+        _logger.info("Unit of work retries: %s", self._retry_metrics.get_stats())
+
+    async def run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.log_stats()
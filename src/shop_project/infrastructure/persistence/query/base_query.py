@@ -10,6 +10,11 @@ class QueryLock(Enum):
     SHARED_NOWAIT = "SHARED_NOWAIT"
     EXCLUSIVE = "EXCLUSIVE"
     EXCLUSIVE_NOWAIT = "EXCLUSIVE_NOWAIT"
+    # Заблокированные другими транзакциями строки пропускаются (очередь задач)
+    EXCLUSIVE_SKIP_LOCKED = "EXCLUSIVE_SKIP_LOCKED"
+    # Чтение без блокировки, конфликт обнаруживается при записи по столбцу
+    # version (только для моделей с version_id_col)
+    OPTIMISTIC = "OPTIMISTIC"
     NO_LOCK = "NO_LOCK"
 
 
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Any, Type
 
 from shop_project.domain.interfaces.persistable_entity import PersistableEntity
 from shop_project.infrastructure.persistence.query.base_query import (
@@ -18,6 +18,8 @@ class ComposedQuery(BaseQuery):
         order_by_desc: bool = False,
         limit: int | None = None,
         offset: int | None = None,
+        after: Any | None = None,
+        before: Any | None = None,
     ) -> None:
         self.model_type: Type[PersistableEntity] = model_type
         self.criteria: QueryCriteria = criteria
@@ -26,6 +28,9 @@ class ComposedQuery(BaseQuery):
         self.order_by_desc: bool = order_by_desc
         self.limit: int | None = limit
         self.offset: int | None = offset
+        # Keyset пагинация: значения order_by, после/до которых берется страница
+        self.after: Any | None = after
+        self.before: Any | None = before
 
         self._result: list[PersistableEntity] = []
         self._is_loaded: bool = False
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+from shop_project.infrastructure.persistence.query.base_query import (
+    BaseQuery,
+    QueryLock,
+)
+from shop_project.infrastructure.persistence.query.composed_query import ComposedQuery
+from shop_project.infrastructure.persistence.query.query_criteria import (
+    QueryCriteriaOperator,
+    QueryCriterionOperator,
+)
+from shop_project.infrastructure.persistence.query.value_extractor import (
+    ValueExtractor,
+)
+
+
+@dataclass(frozen=True)
+class JoinedHop:
+    """
+    Зависимый запрос цепочки: его условие criterion_index (from_previous)
+    заменяется на JOIN с запросом source_index по пути source_path
+    """
+
+    query: ComposedQuery
+    source_index: int
+    source_path: str
+    criterion_index: int
+
+
+@dataclass(frozen=True)
+class JoinedLoad:
+    root: ComposedQuery
+    hops: list[JoinedHop]
+
+
+def get_joined_load(queries: Sequence[BaseQuery]) -> JoinedLoad | None:
+    """
+    Разбор NO_LOCK цепочки from_previous, если её можно загрузить одним
+    SELECT: первый запрос - корень (может быть со страницей), каждый
+    следующий ссылается ровно на один из предыдущих, условия только через
+    AND, без сортировки и страниц, модели не повторяются.
+
+    None - запросы нужно загружать по одному.
+    """
+    if len(queries) < 2:
+        return None
+
+    composed: list[ComposedQuery] = []
+    for query in queries:
+        if not isinstance(query, ComposedQuery) or query.lock != QueryLock.NO_LOCK:
+            return None
+        composed.append(query)
+
+    if len({query.model_type for query in composed}) != len(composed):
+        return None
+
+    root, *dependents = composed
+    if any(
+        isinstance(criterion.value_provider, ValueExtractor)
+        for criterion in root.criteria.criteria
+    ):
+        return None
+
+    hops: list[JoinedHop] = []
+    for index, query in enumerate(dependents, start=1):
+        hop = _get_hop(query, composed[:index])
+        if hop is None:
+            return None
+        hops.append(hop)
+
+    return JoinedLoad(root, hops)
+
+
+def _get_hop(query: ComposedQuery, sources: list[ComposedQuery]) -> JoinedHop | None:
+    if (
+        query.order_by is not None
+        or query.limit is not None
+        or query.offset is not None
+        or query.after is not None
+        or query.before is not None
+    ):
+        return None
+
+    if any(
+        operator != QueryCriteriaOperator.AND for operator in query.criteria.operators
+    ):
+        return None
+
+    extractors = [
+        (criterion_index, criterion)
+        for criterion_index, criterion in enumerate(query.criteria.criteria)
+        if isinstance(criterion.value_provider, ValueExtractor)
+    ]
+    if len(extractors) != 1:
+        return None
+
+    criterion_index, criterion = extractors[0]
+    extractor = criterion.value_provider
+    if (
+        not isinstance(extractor, ValueExtractor)
+        or extractor.source_path is None
+        or criterion.operator != QueryCriterionOperator.IN
+        or "." in criterion.left_project_by
+    ):
+        return None
+
+    for source_index, source in enumerate(sources):
+        if source is extractor.source_query:
+            return JoinedHop(
+                query, source_index, extractor.source_path, criterion_index
+            )
+
+    return None
@@ -31,6 +31,8 @@ class QueryData:
     order_by_desc: bool = False
     limit: int | None = None
     offset: int | None = None
+    after: Any | None = None
+    before: Any | None = None
 
     @property
     def is_not_empty(self) -> bool:
@@ -65,6 +67,8 @@ class QueryBuilder(IQueryBuilder):
             self._current_query_data.order_by_desc,
             self._current_query_data.limit,
             self._current_query_data.offset,
+            self._current_query_data.after,
+            self._current_query_data.before,
         )
 
         self._current_query_data = QueryData(None, QueryCriteria(), None)
@@ -110,6 +114,25 @@ class QueryBuilder(IQueryBuilder):
 
         return self
 
+    # Keyset пагинация по столбцу order_by: after берет страницу, следующую за
+    # cursor в порядке сортировки, before - предшествующую ему.
+    # cursor=None означает первую страницу
+    def after(self, cursor: Any | None) -> Self:
+        if cursor is not None and self._current_query_data.before is not None:
+            raise ValueError("Only one of after/before can be specified")
+
+        self._current_query_data.after = cursor
+
+        return self
+
+    def before(self, cursor: Any | None) -> Self:
+        if cursor is not None and self._current_query_data.after is not None:
+            raise ValueError("Only one of after/before can be specified")
+
+        self._current_query_data.before = cursor
+
+        return self
+
     def greater_than(self, attribute_name: str, value: Any) -> Self:
         provider = ValueContainer([value])
 
@@ -138,9 +161,14 @@ class QueryBuilder(IQueryBuilder):
     def from_id(self, attribute_values: list[UUID]) -> Self:
         return self.from_attribute("entity_id", attribute_values)
 
-    def for_update(self, no_wait: bool = False) -> Self:
+    def for_update(self, no_wait: bool = False, skip_locked: bool = False) -> Self:
+        if no_wait and skip_locked:
+            raise ValueError("no_wait and skip_locked are mutually exclusive")
+
         if no_wait:
             self._current_query_data.lock = QueryLock.EXCLUSIVE_NOWAIT
+        elif skip_locked:
+            self._current_query_data.lock = QueryLock.EXCLUSIVE_SKIP_LOCKED
         else:
             self._current_query_data.lock = QueryLock.EXCLUSIVE
 
@@ -154,6 +182,11 @@ class QueryBuilder(IQueryBuilder):
 
         return self
 
+    def optimistic(self) -> Self:
+        self._current_query_data.lock = QueryLock.OPTIMISTIC
+
+        return self
+
     def no_lock(self) -> Self:
         self._current_query_data.lock = QueryLock.NO_LOCK
 
@@ -171,7 +204,11 @@ class QueryBuilder(IQueryBuilder):
             )
         )
 
-        extractor = ValueExtractor(previous_query, reference_descriptor.strategy)
+        extractor = ValueExtractor(
+            previous_query,
+            reference_descriptor.strategy,
+            reference_descriptor.source_path,
+        )
 
         self._current_query_data.criteria.criterion_in(
             reference_descriptor.attribute_name, extractor
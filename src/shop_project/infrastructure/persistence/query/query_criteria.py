@@ -2,10 +2,10 @@ from enum import Enum
 from typing import Any, Self, Type
 
 from sqlalchemy import (
-    BinaryExpression,
     Column,
     ColumnElement,
     and_,
+    bindparam,
     exists,
     or_,
     select,
@@ -73,12 +73,18 @@ class QueryCriterion:
         *,
         child_tables: dict[str, Any] | None = None,
         parent_refs: dict[str, str] | None = None,
+        bind_name: str | None = None,
     ) -> ColumnElement[bool]:
+        """
+        bind_name: если задан, значение не встраивается в выражение, а
+        подставляется при выполнении через bindparam с этим именем
+        (см. get_bind_value)
+        """
 
         # --- простой атрибут родителя ---
         if "." not in self.left_project_by:
             column: Column[Any] = getattr(model, self.left_project_by)
-            return self._apply_operator(column, self.value_provider.get())
+            return self._apply_operator(column, bind_name)
 
         # --- nested child ---
         if child_tables is None or parent_refs is None:
@@ -109,15 +115,26 @@ class QueryCriterion:
             .select_from(child_alias)
             .where(
                 child_fk_column == parent_pk_column,
-                self._apply_operator(child_column, self.value_provider.get()),
+                self._apply_operator(child_column, bind_name),
             )
         )
 
+    def get_bind_value(self) -> Any:
+        values = self.value_provider.get()
+        if self.operator == QueryCriterionOperator.IN:
+            return values
+
+        return values[0]
+
     def _apply_operator(
         self,
         column: Column[Any],
-        values: list[Any],
-    ) -> BinaryExpression[Any]:
+        bind_name: str | None = None,
+    ) -> ColumnElement[bool]:
+        if bind_name is not None:
+            return self._apply_operator_bound(column, bind_name)
+
+        values = self.value_provider.get()
         if self.operator == QueryCriterionOperator.IN:
             return column.in_(values)
         elif self.operator == QueryCriterionOperator.GREATER_THAN:
@@ -127,6 +144,18 @@ class QueryCriterion:
         else:
             raise QueryPlanException(f"Unknown operator: {self.operator}")
 
+    def _apply_operator_bound(
+        self, column: Column[Any], bind_name: str
+    ) -> ColumnElement[bool]:
+        if self.operator == QueryCriterionOperator.IN:
+            return column.in_(bindparam(bind_name, expanding=True, type_=column.type))
+        elif self.operator == QueryCriterionOperator.GREATER_THAN:
+            return column > bindparam(bind_name, type_=column.type)
+        elif self.operator == QueryCriterionOperator.LESSER_THAN:
+            return column < bindparam(bind_name, type_=column.type)
+        else:
+            raise QueryPlanException(f"Unknown operator: {self.operator}")
+
 
 class QueryCriteria:
     def __init__(self) -> None:
@@ -143,6 +172,17 @@ class QueryCriteria:
 
         return result
 
+    @property
+    def shape(self) -> tuple[Any, ...]:
+        """Структура условий без значений: атрибуты, операторы и связки"""
+        return (
+            tuple(
+                (criterion.left_project_by, criterion.operator)
+                for criterion in self.criteria
+            ),
+            tuple(self.operators),
+        )
+
     @property
     def is_empty(self) -> bool:
         return len(self.criteria) == 0 and len(self.operators) == 0
@@ -192,18 +232,31 @@ class QueryCriteria:
         *,
         child_tables: dict[str, Any] | None = None,
         parent_refs: dict[str, Any] | None = None,
+        bind: bool = False,
     ) -> ColumnElement[bool]:
+        """
+        bind: значения условий выносятся в bindparam (см. get_bind_values),
+        и выражение можно переиспользовать для других значений
+        """
         self.validate()
         if len(self.criteria) == 0:
             return true()
 
         result = self.criteria[0].to_sqlalchemy(
-            model, child_tables=child_tables, parent_refs=parent_refs
+            model,
+            child_tables=child_tables,
+            parent_refs=parent_refs,
+            bind_name=self._get_bind_name(0) if bind else None,
         )
 
-        for operator, criterion in zip(self.operators, self.criteria[1:]):
+        for index, (operator, criterion) in enumerate(
+            zip(self.operators, self.criteria[1:]), start=1
+        ):
             right = criterion.to_sqlalchemy(
-                model, child_tables=child_tables, parent_refs=parent_refs
+                model,
+                child_tables=child_tables,
+                parent_refs=parent_refs,
+                bind_name=self._get_bind_name(index) if bind else None,
             )
             if operator == QueryCriteriaOperator.AND:
                 result = and_(result, right)
@@ -213,3 +266,13 @@ class QueryCriteria:
                 raise QueryPlanException(f"Unknown operator: {operator}")
 
         return result
+
+    def get_bind_values(self) -> dict[str, Any]:
+        return {
+            self._get_bind_name(index): criterion.get_bind_value()
+            for index, criterion in enumerate(self.criteria)
+        }
+
+    @staticmethod
+    def _get_bind_name(index: int) -> str:
+        return f"criterion_{index}"
@@ -12,6 +12,9 @@ from shop_project.infrastructure.persistence.query.composed_query import (
 )
 from shop_project.infrastructure.persistence.query.custom_query import CustomQuery
 from shop_project.infrastructure.persistence.query.query_criteria import QueryCriteria
+from shop_project.infrastructure.persistence.query.value_extractor import (
+    ValueExtractor,
+)
 from shop_project.infrastructure.registries.total_order_registry import (
     TotalOrderRegistry,
 )
@@ -41,6 +44,8 @@ class QueryPlan(ABC, IQueryPlan):
         order_by_desc: bool,
         limit: int | None,
         offset: int | None,
+        after: Any | None = None,
+        before: Any | None = None,
     ) -> None:
 
         model_type = _ensure_not_none(model_type, "model type not specified")
@@ -48,7 +53,15 @@ class QueryPlan(ABC, IQueryPlan):
         lock = _ensure_not_none(lock, "lock not specified")
 
         query = ComposedQuery(
-            model_type, criteria, lock, order_by, order_by_desc, limit, offset
+            model_type,
+            criteria,
+            lock,
+            order_by,
+            order_by_desc,
+            limit,
+            offset,
+            after,
+            before,
         )
 
         self._validate_query(query)
@@ -122,10 +135,17 @@ class LockQueryPlan(QueryPlan):
         self.queries: list[BaseQuery] = []
 
     def _validate_query(self, query: BaseQuery) -> None:
-        if query.lock == QueryLock.NO_LOCK:
-            raise QueryPlanException(
-                "Only locking queries are allowed in locking query plan"
-            )
+        # SKIP LOCKED молча выбрасывает строки, поэтому допустим только для
+        # корневых запросов: зависимый запрос потерял бы часть связанных
+        # сущностей уже захваченных родителей
+        if query.lock == QueryLock.EXCLUSIVE_SKIP_LOCKED and isinstance(
+            query, ComposedQuery
+        ):
+            for criterion in query.criteria.criteria:
+                if isinstance(criterion.value_provider, ValueExtractor):
+                    raise QueryPlanException(
+                        "Skip locked is not allowed for queries depending on previous queries"
+                    )
 
     def _build_map(self) -> dict[Type[Any], BaseQuery]:
         result: dict[Type[Any], BaseQuery] = {}
@@ -149,6 +169,15 @@ class LockQueryPlan(QueryPlan):
                 )
 
     def validate_build(self) -> None:
+        # Запросы без блокировки допустимы только как справочные чтения рядом
+        # с блокирующими или оптимистичными; менять загруженные ими сущности
+        # нельзя (см. validate_changes)
+        if self.queries and all(
+            query.lock == QueryLock.NO_LOCK for query in self.queries
+        ):
+            raise QueryPlanException(
+                "Only locking queries are allowed in locking query plan"
+            )
 
         self._validate_single_query_per_model_type()
 
@@ -193,7 +222,14 @@ class LockQueryPlan(QueryPlan):
                     raise QueryPlanException(
                         f"Model type {model_type} is changed with shared lock"
                     )
+                if query.lock == QueryLock.NO_LOCK:
+                    raise QueryPlanException(
+                        f"Model type {model_type} is changed without lock"
+                    )
             else:
-                if query is not None and query.lock == QueryLock.EXCLUSIVE:
+                if query is not None and query.lock in (
+                    QueryLock.EXCLUSIVE,
+                    QueryLock.EXCLUSIVE_SKIP_LOCKED,
+                ):
                     # TODO: log.warning in test/dev environment
                     pass
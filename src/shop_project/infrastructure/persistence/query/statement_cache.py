@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import Select
+
+
+@dataclass
+class StatementCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class StatementCache:
+    """
+    Кэш собранных Select по структуре запроса (модель, операторы условий,
+    блокировка, наличие сортировки/лимита и т.д.).
+
+    Значения в закэшированные запросы не встроены: они передаются при
+    выполнении через bindparam, поэтому один Select обслуживает все запросы
+    одной формы. Вытеснение - LRU.
+
+    Статистика тоже ограничена (stats_max_size, по умолчанию в 4 раза больше
+    кэша): переживает вытеснение запроса, но не растёт вместе с числом форм.
+    """
+
+    def __init__(self, max_size: int = 512, stats_max_size: int | None = None) -> None:
+        self._max_size: int = max_size
+        self._stats_max_size: int = (
+            stats_max_size if stats_max_size is not None else max_size * 4
+        )
+        self._statements: OrderedDict[Hashable, Select[Any]] = OrderedDict()
+        self._stats: OrderedDict[Hashable, StatementCacheStats] = OrderedDict()
+
+    def get_or_build(
+        self, key: Hashable, build: Callable[[], Select[Any]]
+    ) -> Select[Any]:
+        stats = self._get_stats_entry(key)
+
+        statement = self._statements.get(key)
+        if statement is not None:
+            stats.hits += 1
+            self._statements.move_to_end(key)
+            return statement
+
+        stats.misses += 1
+        statement = build()
+        self._statements[key] = statement
+        if len(self._statements) > self._max_size:
+            self._statements.popitem(last=False)
+
+        return statement
+
+    def _get_stats_entry(self, key: Hashable) -> StatementCacheStats:
+        stats = self._stats.get(key)
+        if stats is not None:
+            self._stats.move_to_end(key)
+            return stats
+
+        stats = self._stats[key] = StatementCacheStats()
+        if len(self._stats) > self._stats_max_size:
+            self._stats.popitem(last=False)
+
+        return stats
+
+    def get_stats(self) -> dict[Hashable, StatementCacheStats]:
+        return dict(self._stats)
+
+    def clear(self) -> None:
+        self._statements.clear()
+        self._stats.clear()
+
+
+statement_cache = StatementCache()
@@ -7,10 +7,27 @@ from shop_project.infrastructure.persistence.query.p_value_provider import (
 
 
 class ValueExtractor(PValueProvider):
-    def __init__(self, query: BaseQuery, strategy: Callable[[Any], list[Any]]) -> None:
-
+    def __init__(
+        self,
+        query: BaseQuery,
+        strategy: Callable[[Any], list[Any]],
+        source_path: str | None = None,
+    ) -> None:
+        """
+        source_path: путь strategy в исходной сущности (см.
+        LoadResolutionDescriptor), без него запрос не сливается с исходным
+        """
         self._query: BaseQuery = query
         self._strategy: Callable[[Any], list[Any]] = strategy
+        self._source_path: str | None = source_path
+
+    @property
+    def source_query(self) -> BaseQuery:
+        return self._query
+
+    @property
+    def source_path(self) -> str | None:
+        return self._source_path
 
     def get(self) -> list[Any]:
         result: list[Any] = []
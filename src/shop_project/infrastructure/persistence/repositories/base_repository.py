@@ -1,16 +1,49 @@
 from abc import ABC
-from typing import Any, Generic, Literal, Mapping, Type, TypeVar
+from enum import Enum
+from functools import cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Generic,
+    Hashable,
+    Literal,
+    Mapping,
+    NoReturn,
+    Sequence,
+    Type,
+    TypeVar,
+)
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import Column, Select, inspect
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    Table,
+    and_,
+    bindparam,
+    insert,
+    inspect,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.orm import joinedload, outerjoin, selectinload
 from sqlalchemy.orm._typing import _IdentityKeyType  # type: ignore
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import select
 
 from shop_project.application.shared.base_dto import BaseDTO, BaseVODTO
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConditionalDecrementException,
+)
 from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.exceptions import (
+    QueryPlanException,
+    UnitOfWorkException,
+)
 from shop_project.infrastructure.persistence.database.models.base import Base as BaseORM
 from shop_project.infrastructure.persistence.query.base_query import (
     BaseQuery,
@@ -18,6 +51,16 @@ from shop_project.infrastructure.persistence.query.base_query import (
 )
 from shop_project.infrastructure.persistence.query.composed_query import ComposedQuery
 from shop_project.infrastructure.persistence.query.custom_query import CustomQuery
+from shop_project.infrastructure.persistence.query.joined_load import (
+    JoinedHop,
+    JoinedLoad,
+)
+from shop_project.infrastructure.persistence.query.statement_cache import (
+    statement_cache,
+)
+from shop_project.infrastructure.persistence.repositories.orm_mapper import (
+    OrmMapperRegistry,
+)
 from shop_project.infrastructure.registries.resources_registry import ResourcesRegistry
 
 BD = TypeVar("BD", bound=BaseDTO[Any])
@@ -25,6 +68,38 @@ BO = TypeVar("BO", bound=BaseORM)
 PE = TypeVar("PE", bound=PersistableEntity)
 
 
+@cache
+def get_version_attribute_name(orm_type: type[BaseORM]) -> str | None:
+    """Атрибут version_id_col модели или None, если модель без версии"""
+    mapper = inspect(orm_type)
+    if mapper.version_id_col is None:
+        return None
+
+    return mapper.get_property_by_column(mapper.version_id_col).key
+
+
+def get_row_columns(orm_type: type[BaseORM]) -> list[tuple[str, ColumnElement[Any]]]:
+    # Колонки таблицы под именами атрибутов ORM, чтобы строки читались
+    # так же, как ORM объекты
+    return [
+        (column_attribute.key, column_attribute.columns[0])
+        for column_attribute in inspect(orm_type).column_attrs
+    ]
+
+
+def get_joined_bind_name(query_index: int, criterion_index: int) -> str:
+    # Условия корня связываются под своими обычными именами
+    return f"q{query_index}_criterion_{criterion_index}"
+
+
+def get_local_table(orm_type: type[BaseORM]) -> Table:
+    table = inspect(orm_type).local_table
+    if not isinstance(table, Table):
+        raise RuntimeError(f"{orm_type.__name__} is not mapped to a table")
+
+    return table
+
+
 class RepositoryRegistry:
     _registry: dict[Type[PersistableEntity], "Type[BaseRepository[Any, Any, Any]]"] = {}
 
@@ -53,6 +128,18 @@ class ChildDescriptor(BaseModel):
     child_dto_other_pk_field_names: list[str]
 
 
+class ChildLoading(Enum):
+    # Один запрос с LEFT OUTER JOIN на каждую дочернюю таблицу.
+    # Строки родителя повторяются для каждого ребенка и схлопываются в Python
+    JOINED = "JOINED"
+    # Запрос родителей + по одному SELECT ... WHERE parent_id IN (...) на
+    # дочернюю таблицу (selectinload). Блокировка ставится только на родителей
+    SELECTIN = "SELECTIN"
+    # То же, что SELECTIN, но дочерние строки выбираются вручную с той же
+    # блокировкой, что и родители, и раскладываются по parent_id
+    RAW = "RAW"
+
+
 class BaseRepository(Generic[BO, BD, PE], ABC):
     orm_type: Type[BO]
     dto_type: Type[BD]
@@ -60,8 +147,30 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
 
     child_descriptors: list[ChildDescriptor]
 
+    # CREATED сущности пишутся одним multi-row INSERT на таблицу, минуя ORM.
+    # Вставки откладываются до execute_bulk_inserts() после flush сессии:
+    # такие строки могут ссылаться на созданные через ORM, но не наоборот
+    bulk_insert: bool = False
+
+    # Способ загрузки дочерних контейнеров, см. ChildLoading
+    child_loading: ChildLoading = ChildLoading.JOINED
+
+    # NO_LOCK запросы в load_domain читают строки через Core select: без
+    # ORM объектов, identity map и strong_set сессии. Такие сущности никогда
+    # не сохраняются, поэтому сессии знать о них не нужно
+    row_loading_for_no_lock: bool = True
+
+    @classmethod
+    def get_orm_type(cls) -> Type[BaseORM]:
+        return cls.orm_type
+
+    @classmethod
+    def get_dto_type(cls) -> Type[BaseDTO[Any]]:
+        return cls.dto_type
+
     def __init__(self, session: AsyncSession) -> None:
         self.session: AsyncSession = session
+        self._pending_bulk_inserts: list[tuple[Table, list[dict[str, Any]]]] = []
 
     def _get_child_pk_tuple(
         self,
@@ -83,6 +192,10 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
         if not items:
             return
 
+        if self.bulk_insert:
+            self._stage_bulk_insert(items)
+            return
+
         for dto in items:
             entity: BO = self.orm_type(**dto.model_dump())
 
@@ -111,7 +224,63 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
                     )
                     self.session.add(child)
 
-    async def update(self, items: list[BD]) -> None:
+    def _stage_bulk_insert(self, items: list[BD]) -> None:
+        parent_rows: list[dict[str, Any]] = []
+        children_rows: list[list[dict[str, Any]]] = [[] for _ in self.child_descriptors]
+
+        for dto in items:
+            entity: BO = self.orm_type(**dto.model_dump())
+
+            entity_id_field = getattr(entity, "entity_id", None)
+            if not entity_id_field:
+                raise RuntimeError(
+                    f"Parent entity {self.orm_type.__name__} has no entity_id field"
+                )
+
+            parent_rows.append(self._get_column_values(entity))
+
+            for child_descriptor, child_rows in zip(
+                self.child_descriptors, children_rows
+            ):
+                for child_dto in getattr(
+                    dto, child_descriptor.parent_dto_child_container_field_name
+                ):
+                    child = child_descriptor.child_orm(
+                        **child_dto.model_dump(),
+                        **{
+                            child_descriptor.child_dto_parent_reference_field_name: entity_id_field
+                        },
+                    )
+                    child_rows.append(self._get_column_values(child))
+
+        self._pending_bulk_inserts.append((get_local_table(self.orm_type), parent_rows))
+        for child_descriptor, child_rows in zip(self.child_descriptors, children_rows):
+            if child_rows:
+                self._pending_bulk_inserts.append(
+                    (get_local_table(child_descriptor.child_orm), child_rows)
+                )
+
+    async def execute_bulk_inserts(self) -> None:
+        if not self._pending_bulk_inserts:
+            return
+
+        # Строки, добавленные через ORM, должны попасть в БД раньше (FK)
+        await self.session.flush()
+
+        for table, rows in self._pending_bulk_inserts:
+            await self.session.execute(insert(table), rows)
+
+        self._pending_bulk_inserts = []
+
+    async def update(
+        self,
+        items: list[BD],
+        changed_fields: dict[UUID, frozenset[str]] | None = None,
+    ) -> None:
+        """
+        changed_fields: измененные поля DTO по entity_id. Если поля известны,
+        переписываются только соответствующие столбцы и дочерние контейнеры.
+        """
         if not items:
             return
 
@@ -130,51 +299,100 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
                 raise RuntimeError(
                     f"Parent entity {self.orm_type.__name__} has no entity_id field"
                 )
-            entity.repopulate(**dto.model_dump())
+            dto_changed_fields: frozenset[str] | None = None
+            if changed_fields is not None:
+                dto_changed_fields = changed_fields.get(dto.entity_id)
+
+            if dto_changed_fields is None:
+                entity.repopulate(**dto.model_dump())
+            else:
+                self._apply_changed_columns(entity, dto, dto_changed_fields)
 
             for child_descriptor in self.child_descriptors:
-                entity_children_container: list[BO] = getattr(
-                    entity, child_descriptor.parent_dto_child_container_field_name
-                )
-                dto_children_container: list[BaseVODTO] = getattr(
-                    dto, child_descriptor.parent_dto_child_container_field_name
+                if (
+                    dto_changed_fields is not None
+                    and child_descriptor.parent_dto_child_container_field_name
+                    not in dto_changed_fields
+                ):
+                    continue
+
+                await self._sync_children(
+                    entity, dto, entity_id_field, child_descriptor
                 )
 
-                current_children: dict[tuple[UUID, ...], BO] = {
-                    self._get_child_pk_tuple(
-                        entity_id_field, child, child_descriptor
-                    ): child
-                    for child in entity_children_container
-                }
+            # UPDATE родителя выполняется и при изменении только дочерних строк:
+            # по нему ORM проверяет прежнюю версию (иначе StaleDataError)
+            version_name = get_version_attribute_name(self.orm_type)
+            if version_name is not None:
+                setattr(entity, version_name, getattr(entity, version_name) + 1)
 
-                for child in current_children.values():
-                    await self.session.delete(child)
+    def _apply_changed_columns(
+        self, entity: BO, dto: BD, dto_changed_fields: frozenset[str]
+    ) -> None:
+        changed_columns = [
+            column_attr.key
+            for column_attr in inspect(self.orm_type).column_attrs
+            if column_attr.key in dto_changed_fields
+        ]
+        if not changed_columns:
+            return
 
-                for child_dto in dto_children_container:
-                    key = self._get_child_pk_tuple(
-                        entity_id_field, child_dto, child_descriptor
-                    )
-                    if key in current_children:
-                        current_children[key].repopulate(
-                            **child_dto.model_dump(),
-                            **{
-                                child_descriptor.child_dto_parent_reference_field_name: entity_id_field
-                            },
-                        )
-                        self.session.add(current_children[key])
-                    else:
-                        child = child_descriptor.child_orm(
-                            **child_dto.model_dump(),
-                            **{
-                                child_descriptor.child_dto_parent_reference_field_name: entity_id_field
-                            },
-                        )
-                        setattr(
-                            child,
-                            child_descriptor.child_dto_parent_reference_field_name,
-                            entity_id_field,
-                        )
-                        self.session.add(child)
+        # Преобразования DTO -> столбцы описаны в repopulate, поэтому значения
+        # берутся из временного (не добавленного в сессию) ORM объекта
+        source: BO = self.orm_type(**dto.model_dump())
+        for column_name in changed_columns:
+            setattr(entity, column_name, getattr(source, column_name))
+
+    async def _sync_children(
+        self,
+        entity: BO,
+        dto: BD,
+        entity_id_field: UUID,
+        child_descriptor: ChildDescriptor,
+    ) -> None:
+        """
+        Приводит дочерние строки к состоянию DTO по первичному ключу ребенка:
+        удаляет исчезнувшие, добавляет новые и переписывает только изменившиеся.
+        Неизмененные строки не порождают SQL.
+        """
+        entity_children_container: list[BaseORM] = getattr(
+            entity, child_descriptor.parent_dto_child_container_field_name
+        )
+        dto_children_container: list[BaseVODTO] = getattr(
+            dto, child_descriptor.parent_dto_child_container_field_name
+        )
+        parent_reference = {
+            child_descriptor.child_dto_parent_reference_field_name: entity_id_field
+        }
+
+        current_children: dict[tuple[UUID, ...], BaseORM] = {
+            self._get_child_pk_tuple(entity_id_field, child, child_descriptor): child
+            for child in entity_children_container
+        }
+        new_children: dict[tuple[UUID, ...], BaseVODTO] = {
+            self._get_child_pk_tuple(
+                entity_id_field, child_dto, child_descriptor
+            ): child_dto
+            for child_dto in dto_children_container
+        }
+
+        for key, child in current_children.items():
+            if key not in new_children:
+                await self.session.delete(child)
+
+        for key, child_dto in new_children.items():
+            child_values = child_dto.model_dump()
+            current_child = current_children.get(key)
+
+            if current_child is None:
+                self.session.add(
+                    child_descriptor.child_orm(**child_values, **parent_reference)
+                )
+            elif any(
+                getattr(current_child, name) != value
+                for name, value in child_values.items()
+            ):
+                current_child.repopulate(**child_values, **parent_reference)
 
     async def delete(self, items: list[BD]) -> None:
         if not items:
@@ -200,114 +418,638 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
             await self.session.delete(entity)
 
     async def load(self, query: BaseQuery) -> list[BD]:
-        if isinstance(query, ComposedQuery):
-            if query.limit is not None:
-                return await self._load_with_limit_subquery(query)
+        return [
+            self.dto_type.model_validate(item) for item in await self._load_orm(query)
+        ]
+
+    async def load_domain(self, query: BaseQuery) -> list[PE]:
+        mapper = OrmMapperRegistry.get(self.dto_type)
+
+        if (
+            self.row_loading_for_no_lock
+            and isinstance(query, ComposedQuery)
+            and query.lock == QueryLock.NO_LOCK
+        ):
+            rows = await self._load_rows(query)
+            children = await self._load_children_rows(rows)
+            return [
+                mapper.to_domain(
+                    row,
+                    {
+                        container_name: children_by_parent.get(row.entity_id, [])
+                        for container_name, children_by_parent in children.items()
+                    },
+                )
+                for row in rows
+            ]
+
+        return [mapper.to_domain(item) for item in await self._load_orm(query)]
+
+    async def load_domain_joined(
+        self,
+        joined_load: JoinedLoad,
+        repositories: "Sequence[BaseRepository[Any, Any, Any]]",
+    ) -> list[list[PersistableEntity]] | None:
+        """
+        Загружает цепочку from_previous одним SELECT: корень (self) и
+        зависимые запросы соединяются LEFT OUTER JOIN по путям ссылок, дочерние
+        таблицы - по parent_id. Строки раскладываются по запросам с
+        устранением повторов.
+
+        repositories: репозитории зависимых запросов в порядке joined_load.hops.
+        None, если таблицы повторяются или запрос не читается строками.
+        """
+        hops = list(zip(joined_load.hops, repositories))
+        if not self._can_load_joined(hops):
+            return None
+
+        root = joined_load.root
+        statement = statement_cache.get_or_build(
+            (
+                type(self),
+                "JOINED_ROWS",
+                self._get_rows_shape(root),
+                tuple(
+                    (
+                        type(repository),
+                        repository._get_rows_shape(hop.query),
+                        hop.source_index,
+                        hop.source_path,
+                        hop.criterion_index,
+                    )
+                    for hop, repository in hops
+                ),
+            ),
+            lambda: self._build_joined_rows_statement(root, hops),
+        )
+
+        params = self._get_bind_values(root)
+        for query_index, (hop, _) in enumerate(hops, start=1):
+            for criterion_index, criterion in enumerate(hop.query.criteria.criteria):
+                if criterion_index != hop.criterion_index:
+                    params[get_joined_bind_name(query_index, criterion_index)] = (
+                        criterion.get_bind_value()
+                    )
+
+        rows = (await self.session.execute(statement, params)).all()
+
+        result: list[list[PersistableEntity]] = []
+        start = 0
+        for repository in [self, *repositories]:
+            entities, start = repository._read_joined_rows(rows, start)
+            result.append(entities)
 
-            if query.order_by is not None:
-                raise ValueError("Order by is not supported without limit")
+        return result
+
+    async def stream_ids(
+        self, query: ComposedQuery, chunk_size: int
+    ) -> AsyncIterator[list[UUID]]:
+        """
+        entity_id подходящих под query строк пачками по chunk_size, в памяти
+        одновременно не больше одной пачки.
+
+        MySQL читает один запрос серверным курсором (stream_results). Где
+        серверных курсоров нет (sqlite в тестах), пачки выбираются keyset
+        запросами по entity_id.
+        """
+        if query.lock != QueryLock.NO_LOCK:
+            raise ValueError("Only NO_LOCK queries can be streamed")
+
+        if (
+            query.order_by is not None
+            or query.limit is not None
+            or query.offset is not None
+        ):
+            raise ValueError("Streamed query must not set order, limit or offset")
+
+        if self.session.bind.dialect.name == "mysql":
+            pk_column = self._get_primary_key_column(self.orm_type)
+            statement = statement_cache.get_or_build(
+                (type(self), "STREAM_IDS", self._get_rows_shape(query)),
+                lambda: select(pk_column)
+                .where(self._build_criteria_clause(query))
+                .order_by(pk_column),
+            )
+
+            # yield_per задаётся при выполнении: кэшированный запрос общий
+            # для любых chunk_size
+            result = await self.session.stream_scalars(
+                statement,
+                self._get_bind_values(query),
+                execution_options={"yield_per": chunk_size},
+            )
+            async for partition in result.partitions(chunk_size):
+                yield list(partition)
+            return
+
+        last_id: UUID | None = None
+        while True:
+            page = ComposedQuery(
+                query.model_type,
+                query.criteria,
+                query.lock,
+                order_by="entity_id",
+                limit=chunk_size,
+                after=last_id,
+            )
+            statement = statement_cache.get_or_build(
+                (type(self), "STREAM_IDS", self._get_rows_shape(page)),
+                lambda: self._build_limited_pk_select(page),
+            )
+
+            entity_ids = list(
+                (
+                    await self.session.execute(statement, self._get_bind_values(page))
+                ).scalars()
+            )
+            if entity_ids:
+                yield entity_ids
+            if len(entity_ids) < chunk_size:
+                return
 
-            if query.offset is not None:
-                raise ValueError("Offset is not supported without limit")
+            last_id = max(entity_ids)
 
-            aliases = {
-                child_descriptor.parent_dto_child_container_field_name: aliased(
+    async def _load_rows(self, query: ComposedQuery) -> Sequence[Row[Any]]:
+        statement = statement_cache.get_or_build(
+            (type(self), "ROWS", self._get_rows_shape(query)),
+            lambda: self._build_rows_statement(query),
+        )
+
+        result = await self.session.execute(statement, self._get_bind_values(query))
+        return result.all()
+
+    async def _load_children_rows(
+        self, rows: Sequence[Row[Any]]
+    ) -> dict[str, dict[UUID, list[Row[Any]]]]:
+        result: dict[str, dict[UUID, list[Row[Any]]]] = {}
+        if not self.child_descriptors:
+            return result
+
+        parent_ids = [row.entity_id for row in rows]
+
+        for child_descriptor in self.child_descriptors:
+            children_by_parent: dict[UUID, list[Row[Any]]] = {}
+            result[child_descriptor.parent_dto_child_container_field_name] = (
+                children_by_parent
+            )
+            if not parent_ids:
+                continue
+
+            statement = statement_cache.get_or_build(
+                (type(self), "CHILD_ROWS", child_descriptor.child_orm),
+                lambda: self._build_children_rows_statement(child_descriptor),
+            )
+            children = await self.session.execute(statement, {"parent_ids": parent_ids})
+
+            parent_reference_name = (
+                child_descriptor.child_dto_parent_reference_field_name
+            )
+            for child in children:
+                children_by_parent.setdefault(
+                    getattr(child, parent_reference_name), []
+                ).append(child)
+
+        return result
+
+    def _build_rows_statement(self, query: ComposedQuery) -> Select[Any]:
+        return select(
+            *[
+                expression.label(name)
+                for name, expression in self._get_parent_row_columns()
+            ]
+        ).where(self._build_rows_clause(query))
+
+    def _build_rows_clause(self, query: ComposedQuery) -> ColumnElement[bool]:
+        if query.limit is None:
+            self._validate_unlimited(query)
+            return self._build_criteria_clause(query)
+
+        pk_column = self._get_primary_key_column(self.orm_type)
+        return pk_column.in_(self._build_limited_pk_select(query))
+
+    def _can_load_joined(
+        self, hops: "list[tuple[JoinedHop, BaseRepository[Any, Any, Any]]]"
+    ) -> bool:
+        repositories = [self, *(repository for _, repository in hops)]
+        if not all(repository.row_loading_for_no_lock for repository in repositories):
+            return False
+
+        # Таблицы в SELECT не переименовываются
+        orm_types = [
+            orm_type
+            for repository in repositories
+            for orm_type in [
+                repository.orm_type,
+                *(descriptor.child_orm for descriptor in repository.child_descriptors),
+            ]
+        ]
+        if len(set(orm_types)) != len(orm_types):
+            return False
+
+        for hop, repository in hops:
+            source_column = repositories[hop.source_index]._get_joined_source_column(
+                hop.source_path
+            )
+            target_name = hop.query.criteria.criteria[
+                hop.criterion_index
+            ].left_project_by
+            if source_column is None or not hasattr(repository.orm_type, target_name):
+                return False
+
+        return True
+
+    def _get_joined_source_column(self, source_path: str) -> ColumnElement[Any] | None:
+        if "." not in source_path:
+            return getattr(self.orm_type, source_path, None)
+
+        container_name, attribute_name = source_path.split(".", 1)
+        for child_descriptor in self.child_descriptors:
+            if child_descriptor.parent_dto_child_container_field_name == container_name:
+                return getattr(child_descriptor.child_orm, attribute_name, None)
+
+        return None
+
+    def _build_joined_rows_statement(
+        self,
+        root: ComposedQuery,
+        hops: "list[tuple[JoinedHop, BaseRepository[Any, Any, Any]]]",
+    ) -> Select[Any]:
+        repositories = [self, *(repository for _, repository in hops)]
+
+        # Порядок колонок: строка запроса, затем его дочерние таблицы - так
+        # же их читает _read_joined_rows
+        from_clause: Any = self.orm_type
+        columns: list[ColumnElement[Any]] = []
+        for query_index, repository in enumerate(repositories):
+            if query_index:
+                hop = hops[query_index - 1][0]
+                from_clause = outerjoin(
+                    from_clause,
+                    repository.orm_type,
+                    repository._build_joined_on_clause(
+                        hop, repositories[hop.source_index], query_index
+                    ),
+                )
+            columns.extend(
+                expression for _, expression in repository._get_parent_row_columns()
+            )
+
+            parent_pk_column = self._get_primary_key_column(repository.orm_type)
+            for child_descriptor in repository.child_descriptors:
+                parent_reference_column = getattr(
                     child_descriptor.child_orm,
-                    name=child_descriptor.child_orm.__tablename__,
+                    child_descriptor.child_dto_parent_reference_field_name,
+                )
+                from_clause = outerjoin(
+                    from_clause,
+                    child_descriptor.child_orm,
+                    parent_reference_column == parent_pk_column,
+                )
+                columns.extend(
+                    column for _, column in get_row_columns(child_descriptor.child_orm)
                 )
-                for child_descriptor in self.child_descriptors
-            }
 
-            child_tables: dict[str, type[BaseORM]] = {
-                child_descriptor.parent_dto_child_container_field_name: child_descriptor.child_orm
-                for child_descriptor in self.child_descriptors
-            }
+        return (
+            select(*columns)
+            .select_from(from_clause)
+            .where(self._build_rows_clause(root))
+        )
 
-            parent_refs: dict[str, str] = {
-                child_descriptor.parent_dto_child_container_field_name: child_descriptor.child_dto_parent_reference_field_name
-                for child_descriptor in self.child_descriptors
-            }
+    def _build_joined_on_clause(
+        self,
+        hop: JoinedHop,
+        source: "BaseRepository[Any, Any, Any]",
+        query_index: int,
+    ) -> ColumnElement[bool]:
+        # Условие from_previous становится условием соединения, остальные
+        # условия запроса - частью ON
+        criteria = hop.query.criteria.criteria
+        child_tables, parent_refs = self._get_child_refs()
+        return and_(
+            getattr(self.orm_type, criteria[hop.criterion_index].left_project_by)
+            == source._get_joined_source_column(hop.source_path),
+            *[
+                criterion.to_sqlalchemy(
+                    self.orm_type,
+                    child_tables=child_tables,
+                    parent_refs=parent_refs,
+                    bind_name=get_joined_bind_name(query_index, criterion_index),
+                )
+                for criterion_index, criterion in enumerate(criteria)
+                if criterion_index != hop.criterion_index
+            ],
+        )
 
-            base_query = select(self.orm_type)
+    def _read_joined_rows(
+        self, rows: Sequence[Row[Any]], start: int
+    ) -> tuple[list[PersistableEntity], int]:
+        """Сущности запроса из его колонок, начиная с start, и конец этих колонок"""
+        parent_names = [name for name, _ in self._get_parent_row_columns()]
+        entity_id_index = start + parent_names.index("entity_id")
+        stop = start + len(parent_names)
+
+        children_layout: list[tuple[ChildDescriptor, list[str], int, int]] = []
+        for child_descriptor in self.child_descriptors:
+            child_names = [
+                name for name, _ in get_row_columns(child_descriptor.child_orm)
+            ]
+            children_layout.append(
+                (child_descriptor, child_names, stop, stop + len(child_names))
+            )
+            stop += len(child_names)
+
+        parents: dict[UUID, dict[str, Any]] = {}
+        # Дочерние строки по контейнеру и родителю, повторы из-за соединений
+        # схлопываются по первичному ключу
+        children: dict[str, dict[UUID, dict[tuple[Any, ...], dict[str, Any]]]] = {
+            child_descriptor.parent_dto_child_container_field_name: {}
+            for child_descriptor in self.child_descriptors
+        }
+        for row in rows:
+            entity_id = row[entity_id_index]
+            if entity_id is None:
+                continue
 
-            for child_descriptor in self.child_descriptors:
-                alias = aliases[child_descriptor.parent_dto_child_container_field_name]
-                children_container_field = getattr(
-                    self.orm_type,
-                    child_descriptor.parent_dto_child_container_field_name,
+            if entity_id not in parents:
+                parents[entity_id] = dict(
+                    zip(parent_names, row[start : start + len(parent_names)])
                 )
-                base_query = base_query.options(joinedload(children_container_field))
 
-            base_query = base_query.where(
-                query.criteria.to_sqlalchemy(
-                    self.orm_type, child_tables=child_tables, parent_refs=parent_refs
+            for (
+                child_descriptor,
+                child_names,
+                child_start,
+                child_stop,
+            ) in children_layout:
+                child = dict(zip(child_names, row[child_start:child_stop]))
+                parent_id = child[
+                    child_descriptor.child_dto_parent_reference_field_name
+                ]
+                if parent_id is None:
+                    continue
+
+                child_key = tuple(
+                    child[name]
+                    for name in child_descriptor.child_dto_other_pk_field_names
                 )
+                children[
+                    child_descriptor.parent_dto_child_container_field_name
+                ].setdefault(parent_id, {}).setdefault(child_key, child)
+
+        mapper = OrmMapperRegistry.get(self.dto_type)
+        entities = [
+            mapper.to_domain(
+                values,
+                {
+                    container_name: list(children_by_parent.get(entity_id, {}).values())
+                    for container_name, children_by_parent in children.items()
+                },
+            )
+            for entity_id, values in parents.items()
+        ]
+        return entities, stop
+
+    def _build_children_rows_statement(
+        self, child_descriptor: ChildDescriptor
+    ) -> Select[Any]:
+        parent_reference_column = getattr(
+            child_descriptor.child_orm,
+            child_descriptor.child_dto_parent_reference_field_name,
+        )
+        return select(
+            *[
+                column.label(name)
+                for name, column in get_row_columns(child_descriptor.child_orm)
+            ]
+        ).where(parent_reference_column.in_(bindparam("parent_ids", expanding=True)))
+
+    def _get_parent_row_columns(self) -> list[tuple[str, ColumnElement[Any]]]:
+        """
+        Выражения строки сущности для загрузки без ORM. Репозиторий может
+        подменить выражение атрибута, который хранится не только в столбце
+        """
+        return get_row_columns(self.orm_type)
+
+    async def _load_orm(self, query: BaseQuery) -> Sequence[BO]:
+        if (
+            query.lock == QueryLock.OPTIMISTIC
+            and get_version_attribute_name(self.orm_type) is None
+        ):
+            raise QueryPlanException(
+                f"Model type {query.model_type} has no version for optimistic query"
+            )
+
+        if isinstance(query, ComposedQuery):
+            # Select собирается один раз на форму запроса, значения условий,
+            # курсора и лимитов передаются при выполнении
+            base_query = statement_cache.get_or_build(
+                self._get_statement_key(query),
+                lambda: self._build_composed_statement(query),
             )
 
-            base_query = self._apply_lock_mysql(base_query, query.lock)
+            return await self._execute_load(
+                base_query, query.lock, self._get_bind_values(query)
+            )
         elif isinstance(query, CustomQuery):
             base_query = query.compile_sqlalchemy()
+
+            result_raw = await self.session.execute(base_query)
+            return result_raw.scalars().unique().all()
         else:
             raise ValueError(f"Unknown query type: {type(query)}")
 
-        result_raw = await self.session.execute(base_query)
-        result_orm = result_raw.scalars().unique().all()
-        result = [self.dto_type.model_validate(item) for item in result_orm]
-
-        return result
+    def _get_statement_key(self, query: ComposedQuery) -> Hashable:
+        return (type(self), self.child_loading, self._get_rows_shape(query))
+
+    def _get_rows_shape(self, query: ComposedQuery) -> Hashable:
+        return (
+            self.orm_type,
+            query.criteria.shape,
+            query.lock,
+            query.order_by,
+            query.order_by_desc,
+            query.limit is not None,
+            query.offset is not None,
+            query.after is not None,
+            query.before is not None,
+        )
 
-    async def _load_with_limit_subquery(self, query: ComposedQuery) -> list[BD]:
-        # --- создаём базовые структуры
-        child_tables = {
-            cd.parent_dto_child_container_field_name: cd.child_orm
-            for cd in self.child_descriptors
+    @staticmethod
+    def _get_bind_values(query: ComposedQuery) -> dict[str, Any]:
+        values = query.criteria.get_bind_values()
+
+        if query.limit is not None:
+            values["page_limit"] = query.limit
+        if query.offset is not None:
+            values["page_offset"] = query.offset
+        if query.after is not None:
+            values["page_cursor"] = query.after
+        if query.before is not None:
+            values["page_cursor"] = query.before
+
+        return values
+
+    def _get_child_refs(self) -> tuple[dict[str, type[BaseORM]], dict[str, str]]:
+        child_tables: dict[str, type[BaseORM]] = {
+            child_descriptor.parent_dto_child_container_field_name: child_descriptor.child_orm
+            for child_descriptor in self.child_descriptors
         }
-        parent_refs = {
-            cd.parent_dto_child_container_field_name: cd.child_dto_parent_reference_field_name
-            for cd in self.child_descriptors
+
+        parent_refs: dict[str, str] = {
+            child_descriptor.parent_dto_child_container_field_name: child_descriptor.child_dto_parent_reference_field_name
+            for child_descriptor in self.child_descriptors
         }
 
+        return child_tables, parent_refs
+
+    def _build_criteria_clause(self, query: ComposedQuery) -> ColumnElement[bool]:
+        child_tables, parent_refs = self._get_child_refs()
+
+        return query.criteria.to_sqlalchemy(
+            self.orm_type,
+            child_tables=child_tables,
+            parent_refs=parent_refs,
+            bind=True,
+        )
+
+    def _build_composed_statement(self, query: ComposedQuery) -> Select[Any]:
+        base_query = self._apply_child_loading(select(self.orm_type))
+
+        if query.limit is None:
+            self._validate_unlimited(query)
+            base_query = base_query.where(self._build_criteria_clause(query))
+        else:
+            pk_column = self._get_primary_key_column(self.orm_type)
+            base_query = base_query.where(
+                pk_column.in_(self._build_limited_pk_select(query))
+            )
+
+        return self._apply_lock_mysql(base_query, query.lock)
+
+    @staticmethod
+    def _validate_unlimited(query: ComposedQuery) -> None:
+        if query.order_by is not None:
+            raise ValueError("Order by is not supported without limit")
+
+        if query.offset is not None:
+            raise ValueError("Offset is not supported without limit")
+
+        if query.after is not None or query.before is not None:
+            raise ValueError("Cursor is not supported without limit")
+
+    def _build_limited_pk_select(self, query: ComposedQuery) -> Select[Any]:
         pk_column = self._get_primary_key_column(self.orm_type)
 
         # Подзапрос для родителей с лимитом
-        parent_subq = select(pk_column).where(
-            query.criteria.to_sqlalchemy(
-                self.orm_type, child_tables=child_tables, parent_refs=parent_refs
-            )
-        )
+        parent_subq = select(pk_column).where(self._build_criteria_clause(query))
 
+        order_by_col: Column[Any] | None = None
         if query.order_by is not None:
             order_by_col = getattr(self.orm_type, query.order_by, None)
             if order_by_col is None:
                 raise ValueError(f"Unknown order by field: {query.order_by}")
-            if getattr(query, "order_by_desc", False):
+        elif query.after is not None or query.before is not None:
+            raise ValueError("Cursor is not supported without order by")
+
+        if order_by_col is not None:
+            # before выбирает ближайшие к курсору строки, поэтому сортирует
+            # в обратном порядке
+            subquery_desc = query.order_by_desc != (query.before is not None)
+
+            if query.after is not None or query.before is not None:
+                cursor = bindparam("page_cursor", type_=order_by_col.type)
+                parent_subq = parent_subq.where(
+                    order_by_col < cursor if subquery_desc else order_by_col > cursor
+                )
+
+            if subquery_desc:
                 parent_subq = parent_subq.order_by(order_by_col.desc())
             else:
                 parent_subq = parent_subq.order_by(order_by_col)
 
-        if getattr(query, "offset", None) is not None:
-            parent_subq = parent_subq.offset(query.offset)
+        if query.offset is not None:
+            parent_subq = parent_subq.offset(bindparam("page_offset", type_=Integer))
+
+        # MySQL не поддерживает LIMIT прямо в IN (...), поэтому через derived table
+        limited = parent_subq.limit(bindparam("page_limit", type_=Integer)).subquery()
+
+        return select(limited.c[pk_column.key])
 
-        parent_subq = parent_subq.limit(query.limit).subquery()
+    def _apply_child_loading(self, base_query: Select[Any]) -> Select[Any]:
+        if self.child_loading == ChildLoading.RAW:
+            return base_query
 
-        base_query = select(self.orm_type)
-        for cd in self.child_descriptors:
+        loader = (
+            joinedload if self.child_loading == ChildLoading.JOINED else selectinload
+        )
+        for child_descriptor in self.child_descriptors:
             children_container_field = getattr(
                 self.orm_type,
-                cd.parent_dto_child_container_field_name,
+                child_descriptor.parent_dto_child_container_field_name,
             )
-            base_query = base_query.options(joinedload(children_container_field))
+            base_query = base_query.options(loader(children_container_field))
 
-        base_query = base_query.where(
-            pk_column.in_(select(parent_subq.c[pk_column.key]))
-        )
-        base_query = self._apply_lock_mysql(base_query, query.lock)
+        return base_query
 
-        result_raw = await self.session.execute(base_query)
-        result_orm = result_raw.scalars().unique().all()
-        result = [self.dto_type.model_validate(item) for item in result_orm]
+    async def _execute_load(
+        self,
+        base_query: Select[Any],
+        lock: QueryLock,
+        params: Mapping[str, Any] | None = None,
+    ) -> Sequence[BO]:
+        result_raw = await self.session.execute(base_query, params)
+        if self.child_loading == ChildLoading.JOINED and self.child_descriptors:
+            result_orm = result_raw.scalars().unique().all()
+        else:
+            result_orm = result_raw.scalars().all()
 
-        return result
+        if self.child_loading == ChildLoading.RAW:
+            await self._load_children_raw(result_orm, lock)
+
+        return result_orm
+
+    async def _load_children_raw(self, parents: Sequence[BO], lock: QueryLock) -> None:
+        if not parents or not self.child_descriptors:
+            return
+
+        parent_ids = [getattr(parent, "entity_id") for parent in parents]
+
+        for child_descriptor in self.child_descriptors:
+            parent_reference_column = getattr(
+                child_descriptor.child_orm,
+                child_descriptor.child_dto_parent_reference_field_name,
+            )
+            child_query = select(child_descriptor.child_orm).where(
+                parent_reference_column.in_(parent_ids)
+            )
+            # Родители уже захвачены, пропуск заблокированных дочерних строк
+            # дал бы неполный агрегат
+            child_query = self._apply_lock_mysql(
+                child_query,
+                (
+                    QueryLock.EXCLUSIVE
+                    if lock == QueryLock.EXCLUSIVE_SKIP_LOCKED
+                    else lock
+                ),
+            )
+
+            children_by_parent: dict[UUID, list[BaseORM]] = {
+                parent_id: [] for parent_id in parent_ids
+            }
+            for child in (await self.session.execute(child_query)).scalars():
+                children_by_parent[
+                    getattr(
+                        child, child_descriptor.child_dto_parent_reference_field_name
+                    )
+                ].append(child)
+
+            # Заполняем связь как загруженную, не помечая объект измененным
+            for parent in parents:
+                set_committed_value(
+                    parent,
+                    child_descriptor.parent_dto_child_container_field_name,
+                    children_by_parent[getattr(parent, "entity_id")],
+                )
 
     async def load_scalars(self, query: CustomQuery) -> Any:
         result = await self.session.execute(query.compile_sqlalchemy())
@@ -318,19 +1060,73 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
         difference_snapshot: dict[
             Literal["CREATED", "UPDATED", "DELETED"], list[BaseDTO[Any]]
         ],
+        changed_fields: dict[UUID, frozenset[str]] | None = None,
     ) -> None:
         await self.create(difference_snapshot["CREATED"])  # type: ignore
 
-        await self.update(difference_snapshot["UPDATED"])  # type: ignore
+        await self.update(difference_snapshot["UPDATED"], changed_fields)  # type: ignore
 
         await self.delete(difference_snapshot["DELETED"])  # type: ignore
 
+    async def conditional_decrement(
+        self,
+        attribute_name: str,
+        amounts: Mapping[UUID, int],
+        reason: str | None = None,
+    ) -> None:
+        """
+        UPDATE ... SET attribute = attribute - n WHERE entity_id = id AND
+        attribute >= n на каждую сущность. Проверка и изменение атомарны,
+        блокировка строки берётся только этим запросом.
+        reason: записать списание в журнал движений (если он есть у модели)
+        """
+        if reason is not None:
+            self._raise_no_movement_ledger(attribute_name)
+
+        column = getattr(self.orm_type, attribute_name)
+        entity_id_column = getattr(self.orm_type, "entity_id")
+
+        values: dict[str, Any] = {}
+        version_name = get_version_attribute_name(self.orm_type)
+        if version_name is not None:
+            # Оптимистичные читатели должны увидеть списание как изменение
+            version_column = getattr(self.orm_type, version_name)
+            values[version_name] = version_column + 1
+
+        # Строки обходятся в одном порядке во всех транзакциях - без дедлоков
+        for entity_id in sorted(amounts):
+            amount = amounts[entity_id]
+            if amount == 0:
+                continue
+
+            result = await self.session.execute(
+                update(self.orm_type)
+                .where(entity_id_column == entity_id, column >= amount)
+                .values({attribute_name: column - amount, **values})
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                raise ConditionalDecrementException([entity_id])
+
+    async def append_movements(
+        self, attribute_name: str, deltas: Mapping[UUID, int], reason: str
+    ) -> None:
+        """Дописывает изменения attribute_name в журнал движений модели"""
+        self._raise_no_movement_ledger(attribute_name)
+
+    def _raise_no_movement_ledger(self, attribute_name: str) -> NoReturn:
+        raise UnitOfWorkException(
+            f"{self.orm_type.__name__}.{attribute_name} has no movement ledger"
+        )
+
     @staticmethod
-    def _apply_lock_mysql(query: Select[Any], lock: QueryLock):
+    def _apply_lock_mysql(query: Select[Any], lock: QueryLock) -> Select[Any]:
         if lock == QueryLock.EXCLUSIVE:
             return query.with_for_update()
         elif lock == QueryLock.EXCLUSIVE_NOWAIT:
             return query.with_for_update(nowait=True)
+        elif lock == QueryLock.EXCLUSIVE_SKIP_LOCKED:
+            return query.with_for_update(skip_locked=True)
         elif lock == QueryLock.SHARED:
             return query.with_for_update(read=True)
         elif lock == QueryLock.SHARED_NOWAIT:
@@ -345,6 +1141,26 @@ class BaseRepository(Generic[BO, BD, PE], ABC):
 
         return mapper.identity_key_from_primary_key(pk_values)
 
+    @staticmethod
+    def _get_column_values(orm_object: BaseORM) -> dict[str, Any]:
+        mapper = inspect(type(orm_object))
+        table = mapper.local_table
+
+        values: dict[str, Any] = {}
+        for column_attr in mapper.column_attrs:
+            column = column_attr.columns[0]
+            value = getattr(orm_object, column_attr.key)
+            # значение автоинкрементного ключа генерирует БД, для столбцов с
+            # default (version) его подставит insert
+            if value is None and (
+                column is getattr(table, "autoincrement_column")
+                or column.default is not None
+            ):
+                continue
+            values[column.key] = value
+
+        return values
+
     def _get_primary_key_column(self, model_type: type[BaseORM]) -> Column[Any]:
         """
         Возвращает столбец первичного ключа для модели.
@@ -11,4 +11,4 @@ from shop_project.infrastructure.persistence.repositories.base_repository import
 class OperationLogRepository(
     BaseRepository[OperationLogORM, OperationLogDTO, OperationLog]
 ):
-    pass
+    bulk_insert = True
@@ -1,12 +1,218 @@
+from typing import Any, Hashable, Mapping, Sequence
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Integer, case, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
 from shop_project.application.shared.dto.product_dto import ProductDTO
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConditionalDecrementException,
+)
 from shop_project.domain.entities.product import Product
 from shop_project.infrastructure.persistence.database.models.product import (
     Product as ProductORM,
 )
+from shop_project.infrastructure.persistence.inventory_ledger import (
+    INVENTORY_LEDGER_INFO_KEY,
+    ProductInventoryLedger,
+)
+from shop_project.infrastructure.persistence.query.base_query import (
+    BaseQuery,
+    QueryLock,
+)
+from shop_project.infrastructure.persistence.query.composed_query import ComposedQuery
 from shop_project.infrastructure.persistence.repositories.base_repository import (
     BaseRepository,
 )
+from shop_project.infrastructure.persistence.stock_shards import ProductStockShards
 
 
 class ProductRepository(BaseRepository[ProductORM, ProductDTO, Product]):
-    pass
+    """
+    amount читается как остаток строки product (у шардированных товаров,
+    stock_shard_count > 0, - сумма шардов) плюс, если журнал включён для
+    сессии, несвёрнутые движения журнала. При загрузке строк (NO_LOCK) сумма
+    считается в том же SELECT. Изменения amount шардированных товаров пишутся
+    в шарды, столбец product.amount у них не меняется.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+        self._stock_shards: ProductStockShards = ProductStockShards(session)
+        self._ledger: ProductInventoryLedger = ProductInventoryLedger(session)
+        self._shard_counts: dict[UUID, int] = {}
+        # Для товаров, чей amount не совпадает со столбцом: прочитанный amount
+        # и его часть, хранящаяся в строке product (или в шардах)
+        self._loaded_totals: dict[UUID, int] = {}
+        self._loaded_stored: dict[UUID, int] = {}
+
+    async def _load_amount_totals(
+        self, products: Sequence[Any], locking: bool
+    ) -> Mapping[UUID, int]:
+        shard_counts = {
+            product.entity_id: product.stock_shard_count
+            for product in products
+            if product.stock_shard_count
+        }
+        self._shard_counts.update(shard_counts)
+
+        stored = {product.entity_id: product.amount for product in products}
+        if shard_counts:
+            shard_totals = await self._stock_shards.get_totals(list(shard_counts))
+            for product_id in shard_counts:
+                stored[product_id] = shard_totals.get(product_id, 0)
+
+        pending: Mapping[UUID, int] = {}
+        if self.session.info.get(INVENTORY_LEDGER_INFO_KEY):
+            pending = await self._ledger.get_pending_totals(list(stored), locking)
+
+        totals: dict[UUID, int] = {}
+        for product_id, stored_amount in stored.items():
+            if product_id in shard_counts or product_id in pending:
+                totals[product_id] = stored_amount + pending.get(product_id, 0)
+                self._loaded_stored[product_id] = stored_amount
+
+        self._loaded_totals.update(totals)
+        return totals
+
+    async def _load_orm(self, query: BaseQuery) -> Sequence[ProductORM]:
+        products = await super()._load_orm(query)
+
+        totals = await self._load_amount_totals(
+            products, query.lock not in (QueryLock.NO_LOCK, QueryLock.OPTIMISTIC)
+        )
+        for product in products:
+            total = totals.get(product.entity_id)
+            if total is not None:
+                # Как загруженное значение: не считается изменением
+                set_committed_value(product, "amount", total)
+
+        return products
+
+    @property
+    def _reads_ledger(self) -> bool:
+        return bool(self.session.info.get(INVENTORY_LEDGER_INFO_KEY))
+
+    def _get_parent_row_columns(self) -> list[tuple[str, ColumnElement[Any]]]:
+        amount: ColumnElement[Any] = case(
+            (
+                ProductORM.stock_shard_count > 0,
+                ProductStockShards.get_total_expression(),
+            ),
+            else_=ProductORM.amount,
+        )
+        if self._reads_ledger:
+            amount = amount + ProductInventoryLedger.get_pending_total_expression()
+
+        # SUM в MySQL возвращает DECIMAL
+        return [
+            (name, cast(amount, Integer) if name == "amount" else column)
+            for name, column in super()._get_parent_row_columns()
+        ]
+
+    def _get_rows_shape(self, query: ComposedQuery) -> Hashable:
+        # Выражение amount в SELECT строк зависит от журнала
+        return (super()._get_rows_shape(query), self._reads_ledger)
+
+    async def update(
+        self,
+        items: list[ProductDTO],
+        changed_fields: dict[UUID, frozenset[str]] | None = None,
+    ) -> None:
+        row_items: list[ProductDTO] = []
+        row_changed_fields = dict(changed_fields) if changed_fields else {}
+        for dto in items:
+            loaded_total = self._loaded_totals.get(dto.entity_id)
+            if loaded_total is None:
+                row_items.append(dto)
+                continue
+
+            delta = dto.amount - loaded_total
+            row_amount = loaded_total
+            if dto.entity_id in self._shard_counts:
+                if delta > 0:
+                    await self._stock_shards.increase(
+                        dto.entity_id, self._shard_counts[dto.entity_id], delta
+                    )
+                elif delta < 0:
+                    await self._stock_shards.decrease(dto.entity_id, -delta)
+
+                # Столбец amount шардированного товара не используется и
+                # остаётся как есть
+                dto_changed_fields = row_changed_fields.get(dto.entity_id)
+                if dto_changed_fields is None:
+                    dto_changed_fields = frozenset(ProductDTO.model_fields)
+                row_changed_fields[dto.entity_id] = dto_changed_fields - {"amount"}
+            elif delta:
+                # Несвёрнутые движения остаются в журнале, в строку - только delta
+                row_amount = self._loaded_stored[dto.entity_id] + delta
+
+            self._loaded_totals[dto.entity_id] = dto.amount
+            self._loaded_stored[dto.entity_id] += delta
+            row_items.append(dto.model_copy(update={"amount": row_amount}))
+
+        await super().update(row_items, row_changed_fields or changed_fields)
+
+    async def delete(self, items: list[ProductDTO]) -> None:
+        sharded_ids = [
+            dto.entity_id for dto in items if dto.entity_id in self._shard_counts
+        ]
+        if sharded_ids:
+            await self._stock_shards.delete_shards(sharded_ids)
+
+        await super().delete(items)
+
+    async def conditional_decrement(
+        self,
+        attribute_name: str,
+        amounts: Mapping[UUID, int],
+        reason: str | None = None,
+    ) -> None:
+        if attribute_name != "amount":
+            await super().conditional_decrement(attribute_name, amounts, reason)
+            return
+
+        unknown_ids = [
+            product_id for product_id in amounts if product_id not in self._shard_counts
+        ]
+        self._shard_counts.update(
+            await self._stock_shards.get_shard_counts(unknown_ids)
+        )
+
+        for product_id in sorted(amounts):
+            amount = amounts[product_id]
+            if not amount:
+                continue
+
+            try:
+                await self._decrement_amount(product_id, amount)
+            except ConditionalDecrementException:
+                # Остатка может хватать вместе с несвёрнутыми пополнениями
+                if not await self._ledger.fold(product_id):
+                    raise
+                await self._decrement_amount(product_id, amount)
+
+        if reason is not None:
+            await self._ledger.append(
+                {product_id: -amount for product_id, amount in amounts.items()},
+                reason,
+                applied=True,
+            )
+
+    async def _decrement_amount(self, product_id: UUID, amount: int) -> None:
+        if product_id in self._shard_counts:
+            # Строка product не трогается: конкурентные списания горячего
+            # товара расходятся по шардам
+            await self._stock_shards.decrease(product_id, amount)
+        else:
+            await super().conditional_decrement("amount", {product_id: amount})
+
+    async def append_movements(
+        self, attribute_name: str, deltas: Mapping[UUID, int], reason: str
+    ) -> None:
+        if attribute_name != "amount":
+            await super().append_movements(attribute_name, deltas, reason)
+            return
+
+        await self._ledger.append(deltas, reason, applied=False)
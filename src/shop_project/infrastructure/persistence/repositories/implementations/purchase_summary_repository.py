@@ -7,12 +7,17 @@ from shop_project.infrastructure.persistence.database.models.purchase_summary im
 from shop_project.infrastructure.persistence.repositories.base_repository import (
     BaseRepository,
     ChildDescriptor,
+    ChildLoading,
 )
 
 
 class PurchaseSummaryRepository(
     BaseRepository[PurchaseSummaryORM, PurchaseSummaryDTO, PurchaseSummary]
 ):
+    bulk_insert = True
+
+    child_loading = ChildLoading.SELECTIN
+
     child_descriptors = [
         ChildDescriptor(
             child_orm=PurchaseSummaryItemORM,
@@ -7,10 +7,13 @@ from shop_project.infrastructure.persistence.database.models.shipment import (
 from shop_project.infrastructure.persistence.repositories.base_repository import (
     BaseRepository,
     ChildDescriptor,
+    ChildLoading,
 )
 
 
 class ShipmentRepository(BaseRepository[ShipmentORM, ShipmentDTO, Shipment]):
+    child_loading = ChildLoading.SELECTIN
+
     child_descriptors = [
         ChildDescriptor(
             child_orm=ShipmentItemORM,
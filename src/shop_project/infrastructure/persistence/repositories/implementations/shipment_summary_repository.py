@@ -7,12 +7,15 @@ from shop_project.infrastructure.persistence.database.models.shipment_summary im
 from shop_project.infrastructure.persistence.repositories.base_repository import (
     BaseRepository,
     ChildDescriptor,
+    ChildLoading,
 )
 
 
 class ShipmentSummaryRepository(
     BaseRepository[ShipmentSummaryORM, ShipmentSummaryDTO, ShipmentSummary]
 ):
+    child_loading = ChildLoading.SELECTIN
+
     child_descriptors = [
         ChildDescriptor(
             child_orm=ShipmentSummaryItemORM,
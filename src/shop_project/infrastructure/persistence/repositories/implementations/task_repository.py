@@ -7,4 +7,4 @@ from shop_project.infrastructure.persistence.repositories.base_repository import
 
 
 class TaskRepository(BaseRepository[TaskORM, TaskDTO, Task]):
-    pass
+    bulk_insert = True
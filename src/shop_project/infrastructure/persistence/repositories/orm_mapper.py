@@ -0,0 +1,114 @@
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Mapping,
+    Type,
+    TypeVar,
+    cast,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+from shop_project.application.shared.base_dto import BaseDTO, BaseVODTO
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+
+PE = TypeVar("PE", bound=PersistableEntity)
+
+
+def _get_vo_list_type(annotation: Any) -> Type[BaseVODTO] | None:
+    if get_origin(annotation) is not list:
+        return None
+
+    (item_type,) = get_args(annotation)
+    if isinstance(item_type, type) and issubclass(item_type, BaseVODTO):
+        return item_type
+
+    return None
+
+
+class _FieldReader:
+    """
+    Читает значения полей DTO из ORM объекта (или Row, или словаря значений
+    по именам атрибутов ORM). Списки VO читаются списками словарей
+    """
+
+    def __init__(self, model_type: Type[BaseModel]) -> None:
+        self._plain_names: list[str] = []
+        self._vo_lists: list[tuple[str, _FieldReader]] = []
+
+        for name, field in model_type.model_fields.items():
+            vo_type = _get_vo_list_type(field.annotation)
+            if vo_type is not None:
+                self._vo_lists.append((name, _FieldReader(vo_type)))
+            else:
+                self._plain_names.append(name)
+
+    def read(
+        self, orm_object: Any, children: Mapping[str, list[Any]] | None = None
+    ) -> dict[str, Any]:
+        get_value: Callable[[str], Any] = (
+            cast(dict[str, Any], orm_object).__getitem__
+            if isinstance(orm_object, dict)
+            else partial(getattr, orm_object)
+        )
+
+        values = {name: get_value(name) for name in self._plain_names}
+        for name, reader in self._vo_lists:
+            items = (
+                children[name]
+                if children is not None and name in children
+                else get_value(name)
+            )
+            values[name] = [reader.read(item) for item in items]
+
+        return values
+
+
+class OrmMapper(Generic[PE]):
+    """
+    Строит доменную сущность из ORM объекта или строки Core запроса через
+    DTO (model_validate) и его to_domain.
+
+    ORM объект и Row DTO читает сам (from_attributes). Если дочерние строки
+    переданы отдельно или значения пришли словарём, поля сначала собираются
+    в словарь по описанию DTO (те же имена, что и у ORM).
+    """
+
+    def __init__(self, dto_type: Type[BaseDTO[PE]]) -> None:
+        self.dto_type: Type[BaseDTO[PE]] = dto_type
+        self._field_reader: _FieldReader = _FieldReader(dto_type)
+
+    def to_domain(
+        self, orm_object: Any, children: Mapping[str, list[Any]] | None = None
+    ) -> PE:
+        """
+        orm_object: ORM объект, Row или словарь значений под именами
+        атрибутов ORM
+        children: дочерние строки по именам контейнеров, если их нет у orm_object
+        """
+        if not children and not isinstance(orm_object, dict):
+            return self.dto_type.model_validate(orm_object).to_domain()
+
+        values = self._field_reader.read(orm_object, children)
+        return self.dto_type.model_validate(values).to_domain()
+
+
+class OrmMapperRegistry:
+    _mappers: dict[Type[BaseDTO[Any]], OrmMapper[Any]] = {}
+
+    @classmethod
+    def init(cls, dto_types: list[Type[BaseDTO[Any]]]) -> None:
+        for dto_type in dto_types:
+            cls.get(dto_type)
+
+    @classmethod
+    def get(cls, dto_type: Type[BaseDTO[PE]]) -> OrmMapper[PE]:
+        mapper = cls._mappers.get(dto_type)
+        if mapper is None:
+            mapper = cls._mappers[dto_type] = OrmMapper(dto_type)
+
+        return mapper
@@ -1,4 +1,4 @@
-from typing import Any, Literal, Mapping, Type
+from typing import Any, Literal, Mapping, Sequence, Type
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,6 +8,7 @@ from shop_project.domain.interfaces.persistable_entity import PersistableEntity
 from shop_project.infrastructure.persistence.database.models.base import Base as BaseORM
 from shop_project.infrastructure.persistence.query.base_query import BaseQuery
 from shop_project.infrastructure.persistence.query.custom_query import CustomQuery
+from shop_project.infrastructure.persistence.query.joined_load import get_joined_load
 from shop_project.infrastructure.persistence.repositories.base_repository import (
     BaseRepository,
 )
@@ -32,15 +33,65 @@ class RepositoryContainer:
     async def load(self, query: BaseQuery) -> list[BaseDTO[Any]]:
         return await self.repositories[query.model_type].load(query)
 
+    async def load_domain(self, query: BaseQuery) -> list[PersistableEntity]:
+        return await self.repositories[query.model_type].load_domain(query)
+
+    async def load_domain_joined(
+        self, queries: Sequence[BaseQuery]
+    ) -> list[list[PersistableEntity]] | None:
+        """
+        Сущности каждого запроса NO_LOCK цепочки from_previous, загруженные
+        одним SELECT, или None, если цепочку так загрузить нельзя
+        """
+        joined_load = get_joined_load(queries)
+        if joined_load is None:
+            return None
+
+        return await self.repositories[joined_load.root.model_type].load_domain_joined(
+            joined_load,
+            [self.repositories[hop.query.model_type] for hop in joined_load.hops],
+        )
+
     async def save(
         self,
         resource_changes_snapshot: dict[
             Type[PersistableEntity],
             dict[Literal["CREATED", "UPDATED", "DELETED"], list[BaseDTO[Any]]],
         ],
+        changed_fields: (
+            Mapping[Type[PersistableEntity], dict[UUID, frozenset[str]]] | None
+        ) = None,
     ) -> None:
         for entity_type, difference in resource_changes_snapshot.items():
-            await self.repositories[entity_type].save(difference)
+            await self.repositories[entity_type].save(
+                difference,
+                changed_fields.get(entity_type) if changed_fields is not None else None,
+            )
+
+        for entity_type in resource_changes_snapshot:
+            await self.repositories[entity_type].execute_bulk_inserts()
+
+    async def conditional_decrement(
+        self,
+        model_type: Type[PersistableEntity],
+        attribute_name: str,
+        amounts: Mapping[UUID, int],
+        reason: str | None = None,
+    ) -> None:
+        await self.repositories[model_type].conditional_decrement(
+            attribute_name, amounts, reason
+        )
+
+    async def append_movements(
+        self,
+        model_type: Type[PersistableEntity],
+        attribute_name: str,
+        deltas: Mapping[UUID, int],
+        reason: str,
+    ) -> None:
+        await self.repositories[model_type].append_movements(
+            attribute_name, deltas, reason
+        )
 
     def get_unique_id(self, model_type: type[PersistableEntity]) -> UUID:
         raise NotImplementedError
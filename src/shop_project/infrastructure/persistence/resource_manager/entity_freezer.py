@@ -0,0 +1,188 @@
+from enum import Enum
+from typing import Any, Iterable, NoReturn, SupportsIndex, TypeVar, cast
+
+from shop_project.infrastructure.exceptions import UnitOfWorkException
+from shop_project.shared.identity_mixin import IdentityMixin
+
+T = TypeVar("T", bound=IdentityMixin)
+
+
+def _raise_read_only(obj: object) -> NoReturn:
+    raise UnitOfWorkException(
+        f"{obj.__class__.__name__} is loaded in read-only mode and cannot be modified"
+    )
+
+
+class ReadOnlyList(list[Any]):
+    """Копия списка объекта, изменение которой бросает UnitOfWorkException"""
+
+    def append(self, object: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def extend(self, iterable: Iterable[Any], /) -> NoReturn:
+        _raise_read_only(self)
+
+    def insert(self, index: SupportsIndex, object: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def remove(self, value: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def pop(self, index: SupportsIndex = -1, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def clear(self) -> NoReturn:
+        _raise_read_only(self)
+
+    def sort(self, *, key: Any = None, reverse: bool = False) -> NoReturn:
+        _raise_read_only(self)
+
+    def reverse(self) -> NoReturn:
+        _raise_read_only(self)
+
+    def __setitem__(self, key: Any, value: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def __delitem__(self, key: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def __iadd__(self, value: Iterable[Any], /) -> NoReturn:
+        _raise_read_only(self)
+
+    def __imul__(self, value: SupportsIndex, /) -> NoReturn:
+        _raise_read_only(self)
+
+
+class ReadOnlyDict(dict[Any, Any]):
+    """Копия словаря объекта, изменение которой бросает UnitOfWorkException"""
+
+    def pop(self, key: Any, default: Any = None, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def popitem(self) -> NoReturn:
+        _raise_read_only(self)
+
+    def clear(self) -> NoReturn:
+        _raise_read_only(self)
+
+    def update(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _raise_read_only(self)
+
+    def setdefault(self, key: Any, default: Any = None, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def __setitem__(self, key: Any, value: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def __delitem__(self, key: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+    def __ior__(self, value: Any, /) -> NoReturn:
+        _raise_read_only(self)
+
+
+class ReadOnlyProxy:
+    """
+    Основа обёрток только для чтения над объектами проекта.
+
+    Для каждого класса объекта создаётся подкласс (ReadOnlyProxy, класс
+    объекта): isinstance и методы класса работают как обычно, но атрибуты
+    экземпляра читаются из исходного объекта, а вложенные объекты проекта,
+    списки и словари возвращаются тоже только для чтения. Присваивание
+    атрибутов, в том числе внутри методов сущности, бросает
+    UnitOfWorkException. Исходный объект не меняется.
+    """
+
+    def __init__(self, target: object) -> None:
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_values", {})
+
+    def __getattribute__(self, name: str) -> Any:
+        if name in ("_target", "_values"):
+            return object.__getattribute__(self, name)
+
+        target = object.__getattribute__(self, "_target")
+        if name not in vars(target):
+            return object.__getattribute__(self, name)
+
+        values: dict[str, Any] = object.__getattribute__(self, "_values")
+        if name not in values:
+            values[name] = _read_only_value(getattr(target, name))
+
+        return values[name]
+
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        _raise_read_only(self)
+
+    def __delattr__(self, name: str) -> NoReturn:
+        _raise_read_only(self)
+
+    def __eq__(self, value: object, /) -> bool:
+        return object.__getattribute__(self, "_target") == _unwrap(value)
+
+    def __hash__(self) -> int:
+        return hash(object.__getattribute__(self, "_target"))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({object.__getattribute__(self, '_target')!r})"
+
+
+_proxy_types: dict[type, type[ReadOnlyProxy]] = {}
+
+
+def _get_proxy_type(target_type: type) -> type[ReadOnlyProxy]:
+    proxy_type = _proxy_types.get(target_type)
+
+    if proxy_type is None:
+        proxy_type = _proxy_types[target_type] = type(
+            f"ReadOnly{target_type.__name__}",
+            (ReadOnlyProxy, target_type),
+            {"__module__": __name__},
+        )
+
+    return proxy_type
+
+
+def _create_proxy(target: object) -> ReadOnlyProxy:
+    # __init__ класса сущности не вызывается: состояние берётся из target
+    proxy = object.__new__(_get_proxy_type(type(target)))
+    ReadOnlyProxy.__init__(proxy, target)
+    return proxy
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, ReadOnlyProxy):
+        return object.__getattribute__(value, "_target")
+
+    return value
+
+
+def _is_domain_object(value: Any) -> bool:
+    # Сущности, объекты-значения и машины состояний проекта; сторонние типы
+    # (UUID, Decimal, datetime) и так неизменяемы
+    return (
+        hasattr(value, "__dict__")
+        and not isinstance(value, (type, Enum, ReadOnlyProxy))
+        and type(value).__module__.startswith("shop_project.")
+    )
+
+
+def _read_only_value(value: Any) -> Any:
+    if _is_domain_object(value):
+        return _create_proxy(value)
+    elif isinstance(value, list):
+        return ReadOnlyList(_read_only_value(item) for item in value)
+    elif isinstance(value, dict):
+        return ReadOnlyDict(
+            {key: _read_only_value(item) for key, item in value.items()}
+        )
+
+    return value
+
+
+def read_only_entity(entity: T) -> T:
+    """
+    Сущность только для чтения: присваивание атрибутов и изменение
+    списков/словарей бросают UnitOfWorkException.
+    """
+    return cast(T, _create_proxy(entity))
@@ -12,22 +12,30 @@ from shop_project.infrastructure.exceptions import ResourcesException
 from shop_project.infrastructure.persistence.resource_manager.resource_snapshot import (
     EntitySnapshot,
     EntitySnapshotSet,
+    EntitySnapshotSetDiff,
     ResourceSnapshot,
 )
+from shop_project.infrastructure.registries.reference_attributes_registry import (
+    ReferenceAttributesRegistry,
+)
 
 T = TypeVar("T", bound=PersistableEntity)
 
 
 class ResourceSnapshotSentinelMixin(ABC):
-    resources: dict[Type[PersistableEntity], list[PersistableEntity]]
+    resources: dict[Type[PersistableEntity], dict[UUID, PersistableEntity]]
     _resource_snapshot_previous: ResourceSnapshot | None
     _resource_snapshot_current: ResourceSnapshot | None
+    _resource_snapshot_diff: dict[Type[PersistableEntity], EntitySnapshotSetDiff] | None
 
     def _get_resource_snapshot(self) -> ResourceSnapshot:
         snapshot_set_vector: dict[Type[PersistableEntity], EntitySnapshotSet] = {}
         for resource_type in self.resources:
             snapshot_set_vector[resource_type] = EntitySnapshotSet(
-                [EntitySnapshot(to_dto(item)) for item in self.resources[resource_type]]
+                [
+                    EntitySnapshot(to_dto(item))
+                    for item in self.resources[resource_type].values()
+                ]
             )
 
         return ResourceSnapshot(snapshot_set_vector)
@@ -39,38 +47,37 @@ class ResourceSnapshotSentinelMixin(ABC):
         self._resource_snapshot_previous = self._resource_snapshot_current
         self._resource_snapshot_current = self._get_resource_snapshot()
 
-    def get_resource_changes(
+    def _get_snapshot_diff(
         self,
-    ) -> dict[
-        Type[PersistableEntity],
-        dict[Literal["CREATED", "UPDATED", "DELETED"], list[BaseDTO[Any]]],
-    ]:
+    ) -> dict[Type[PersistableEntity], EntitySnapshotSetDiff]:
         if (
             self._resource_snapshot_current is None
             or self._resource_snapshot_previous is None
         ):
             raise RuntimeError("Snapshots are not taken yet")
 
-        deleted_snapshot: ResourceSnapshot = (
-            self._resource_snapshot_previous.difference_identity(
-                self._resource_snapshot_current
-            )
-        )
-        created_snapshot: ResourceSnapshot = (
-            self._resource_snapshot_current.difference_identity(
-                self._resource_snapshot_previous
-            )
-        )
-        current_snapshot_side_intersection: ResourceSnapshot = (
-            self._resource_snapshot_current.intersect_identity(
+        if self._resource_snapshot_diff is None:
+            self._resource_snapshot_diff = self._resource_snapshot_current.diff(
                 self._resource_snapshot_previous
             )
-        )
-        updated_snapshot: ResourceSnapshot = (
-            current_snapshot_side_intersection.difference_content(
-                self._resource_snapshot_previous
-            )
-        )
+
+        return self._resource_snapshot_diff
+
+    def get_resource_changed_fields(
+        self,
+    ) -> dict[Type[PersistableEntity], dict[UUID, frozenset[str]]]:
+        return {
+            item_type: set_diff.changed_fields
+            for item_type, set_diff in self._get_snapshot_diff().items()
+        }
+
+    def get_resource_changes(
+        self,
+    ) -> dict[
+        Type[PersistableEntity],
+        dict[Literal["CREATED", "UPDATED", "DELETED"], list[BaseDTO[Any]]],
+    ]:
+        snapshot_diff = self._get_snapshot_diff()
 
         result: dict[
             Type[PersistableEntity],
@@ -83,29 +90,40 @@ class ResourceSnapshotSentinelMixin(ABC):
                 "DELETED": [],
             }
 
-        for item_type, items in deleted_snapshot.to_dict().items():
-            result[item_type]["DELETED"].extend(items)
-
-        for item_type, items in updated_snapshot.to_dict().items():
-            result[item_type]["UPDATED"].extend(items)
-
-        for item_type, items in created_snapshot.to_dict().items():
-            result[item_type]["CREATED"].extend(items)
+        for item_type, set_diff in snapshot_diff.items():
+            result[item_type]["DELETED"].extend(
+                snapshot.snapshot for snapshot in set_diff.deleted
+            )
+            result[item_type]["UPDATED"].extend(
+                snapshot.snapshot for snapshot in set_diff.updated
+            )
+            result[item_type]["CREATED"].extend(
+                snapshot.snapshot for snapshot in set_diff.created
+            )
 
         return result
 
 
 class ResourceContainer(ResourceSnapshotSentinelMixin, IResourceContainer):
     def __init__(self, resources_registry: list[Type[PersistableEntity]]):
-        self.resources: dict[Type[PersistableEntity], list[PersistableEntity]] = {
-            resource: [] for resource in resources_registry
+        self.resources: dict[Type[PersistableEntity], dict[UUID, PersistableEntity]] = {
+            resource: {} for resource in resources_registry
         }
+        # Индексы по неизменяемым ссылкам (ReferenceAttributesRegistry):
+        # тип -> атрибут -> значение -> entity_id. Строятся при первом поиске
+        # по атрибуту и дальше поддерживаются в put/delete
+        self._indexes: dict[
+            Type[PersistableEntity], dict[str, dict[Any, dict[UUID, None]]]
+        ] = {}
         self._resource_snapshot_previous: ResourceSnapshot | None = None
         self._resource_snapshot_current: ResourceSnapshot | None = None
+        self._resource_snapshot_diff: (
+            dict[Type[PersistableEntity], EntitySnapshotSetDiff] | None
+        ) = None
 
-    def _get_resource_by_type(self, resource_type: Type[T]) -> list[T]:
+    def _get_resource_by_type(self, resource_type: Type[T]) -> dict[UUID, T]:
         if resource_type in self.resources:
-            return cast(list[T], self.resources[resource_type])
+            return cast(dict[UUID, T], self.resources[resource_type])
         raise NotImplementedError(f"No resource for {resource_type}")
 
     def get_by_attribute(
@@ -114,11 +132,53 @@ class ResourceContainer(ResourceSnapshotSentinelMixin, IResourceContainer):
 
         resource = self._get_resource_by_type(model_type)
 
-        result: list[T] = []
-        for item in resource:
-            if getattr(item, attribute_name) in values:
-                result.append(item)
-        return result
+        if attribute_name == "entity_id":
+            return [
+                resource[value] for value in dict.fromkeys(values) if value in resource
+            ]
+
+        if attribute_name in ReferenceAttributesRegistry.get_attribute_names(
+            model_type
+        ):
+            index = self._get_index(model_type, attribute_name)
+            return [
+                resource[entity_id]
+                for value in dict.fromkeys(values)
+                for entity_id in index.get(value, {})
+            ]
+
+        value_set = set(values)
+        return [
+            item
+            for item in resource.values()
+            if getattr(item, attribute_name) in value_set
+        ]
+
+    def _get_index(
+        self, model_type: Type[PersistableEntity], attribute_name: str
+    ) -> dict[Any, dict[UUID, None]]:
+        type_indexes = self._indexes.setdefault(model_type, {})
+        index = type_indexes.get(attribute_name)
+        if index is None:
+            index = type_indexes[attribute_name] = {}
+            for entity_id, item in self.resources[model_type].items():
+                index.setdefault(getattr(item, attribute_name), {})[entity_id] = None
+
+        return index
+
+    def _add_to_indexes(
+        self, model_type: Type[PersistableEntity], item: PersistableEntity
+    ) -> None:
+        for attribute_name, index in self._indexes.get(model_type, {}).items():
+            index.setdefault(getattr(item, attribute_name), {})[item.entity_id] = None
+
+    def _remove_from_indexes(
+        self, model_type: Type[PersistableEntity], item: PersistableEntity
+    ) -> None:
+        for attribute_name, index in self._indexes.get(model_type, {}).items():
+            entity_ids = index.get(getattr(item, attribute_name))
+            if entity_ids is not None:
+                entity_ids.pop(item.entity_id, None)
 
     def get_one_or_none_by_attribute(
         self, model_type: Type[T], attribute_name: str, value: Any
@@ -173,7 +233,7 @@ class ResourceContainer(ResourceSnapshotSentinelMixin, IResourceContainer):
         return result
 
     def get_all(self, model_type: Type[T]) -> Sequence[T]:
-        return self._get_resource_by_type(model_type).copy()
+        return list(self._get_resource_by_type(model_type).values())
 
     def put(self, model_type: Type[PersistableEntity], item: PersistableEntity) -> None:
         if not isinstance(item, model_type):
@@ -181,7 +241,13 @@ class ResourceContainer(ResourceSnapshotSentinelMixin, IResourceContainer):
                 f"Cannot put {type(item)} into container for {model_type}"
             )
 
-        self._get_resource_by_type(model_type).append(item)
+        resource = self._get_resource_by_type(model_type)
+        previous = resource.get(item.entity_id)
+        if previous is not None:
+            self._remove_from_indexes(model_type, previous)
+
+        resource[item.entity_id] = item
+        self._add_to_indexes(model_type, item)
 
     def put_many(
         self, model_type: Type[PersistableEntity], items: list[PersistableEntity]
@@ -192,7 +258,13 @@ class ResourceContainer(ResourceSnapshotSentinelMixin, IResourceContainer):
     def delete(
         self, model_type: Type[PersistableEntity], item: PersistableEntity
     ) -> None:
-        self._get_resource_by_type(model_type).remove(item)
+        resource = self._get_resource_by_type(model_type)
+        if item.entity_id not in resource:
+            raise ResourcesException(
+                f"Could not find {model_type} with id {item.entity_id} to delete"
+            )
+
+        self._remove_from_indexes(model_type, resource.pop(item.entity_id))
 
     def delete_many(
         self, model_type: Type[PersistableEntity], items: Sequence[PersistableEntity]
@@ -1,8 +1,6 @@
-from typing import Any, Type
+from typing import Any, Mapping, Type
 from uuid import UUID
 
-from shop_project.application.shared.base_dto import BaseDTO
-from shop_project.application.shared.dto.mapper import to_domain
 from shop_project.domain.interfaces.persistable_entity import PersistableEntity
 from shop_project.infrastructure.exceptions import UnitOfWorkException
 from shop_project.infrastructure.persistence.query.base_query import BaseQuery
@@ -38,6 +36,12 @@ class ResourceManager:
         self.resource_container: ResourceContainer = ResourceContainer(
             resources_registry
         )
+        self._conditional_decrements: list[
+            tuple[Type[PersistableEntity], str, dict[UUID, int], str | None]
+        ] = []
+        self._movements: list[
+            tuple[Type[PersistableEntity], str, dict[UUID, int], str]
+        ] = []
         if read_only:
             self.query_plan: QueryPlan = NoLockQueryPlan()
         else:
@@ -47,16 +51,24 @@ class ResourceManager:
         if isinstance(query, CustomQuery) and query.return_type == "SCALARS":
             loaded: Any = await self.repository_container.load_scalars(query)
         else:
-            loaded_dto: list[BaseDTO[Any]] = await self.repository_container.load(query)
-            loaded: list[PersistableEntity] = [to_domain(dto) for dto in loaded_dto]
+            loaded: list[PersistableEntity] = (
+                await self.repository_container.load_domain(query)
+            )
 
             self.resource_container.put_many(query.model_type, loaded)
 
         query.load(loaded)
 
     async def load(self, query_plan: QueryPlan) -> ResourceContainer:
-        for query in query_plan.queries:
-            await self._load_single(query)
+        # Цепочка NO_LOCK запросов from_previous читается за один запрос к БД
+        joined = await self.repository_container.load_domain_joined(query_plan.queries)
+        if joined is None:
+            for query in query_plan.queries:
+                await self._load_single(query)
+        else:
+            for query, loaded in zip(query_plan.queries, joined):
+                self.resource_container.put_many(query.model_type, loaded)
+                query.load(loaded)
 
         if self.read_only != query_plan.read_only:
             raise UnitOfWorkException("Invalid query plan read only state")
@@ -65,10 +77,49 @@ class ResourceManager:
 
         return self.resource_container
 
+    def add_conditional_decrement(
+        self,
+        model_type: Type[PersistableEntity],
+        attribute_name: str,
+        amounts: Mapping[UUID, int],
+        reason: str | None = None,
+    ) -> None:
+        if self.read_only:
+            raise UnitOfWorkException("Cannot change data in non-mutating mode")
+
+        self._conditional_decrements.append(
+            (model_type, attribute_name, dict(amounts), reason)
+        )
+
+    def add_movements(
+        self,
+        model_type: Type[PersistableEntity],
+        attribute_name: str,
+        deltas: Mapping[UUID, int],
+        reason: str,
+    ) -> None:
+        if self.read_only:
+            raise UnitOfWorkException("Cannot change data in non-mutating mode")
+
+        self._movements.append((model_type, attribute_name, dict(deltas), reason))
+
     async def save(self) -> None:
+        # Атомарные списания идут первыми: при нехватке остальные изменения
+        # не выполняются, а блокировки строк держатся только до коммита
+        for model_type, attribute_name, amounts, reason in self._conditional_decrements:
+            await self.repository_container.conditional_decrement(
+                model_type, attribute_name, amounts, reason
+            )
+
+        for model_type, attribute_name, deltas, reason in self._movements:
+            await self.repository_container.append_movements(
+                model_type, attribute_name, deltas, reason
+            )
+
         self.resource_container.take_snapshot()
 
         difference = self.resource_container.get_resource_changes()
+        changed_fields = self.resource_container.get_resource_changed_fields()
 
         self.query_plan.validate_changes(difference)
 
@@ -77,7 +128,7 @@ class ResourceManager:
             model: difference[model] for model in ordered_types if model in difference
         }
 
-        await self.repository_container.save(sorted_diff)
+        await self.repository_container.save(sorted_diff, changed_fields)
 
     def get_unique_id(self, model_type: type[PersistableEntity]) -> UUID:
         return self.repository_container.get_unique_id(model_type)
@@ -1,3 +1,4 @@
+from dataclasses import dataclass, field
 from typing import Any, Self, Type
 from uuid import UUID
 
@@ -19,62 +20,103 @@ class EntitySnapshot:
     def compare_content(self, other: Self) -> bool:
         return self.snapshot == other.snapshot
 
+    def get_changed_fields(self, other: Self) -> frozenset[str]:
+        return frozenset(
+            field_name
+            for field_name in type(self.snapshot).model_fields
+            if getattr(self.snapshot, field_name) != getattr(other.snapshot, field_name)
+        )
+
+
+@dataclass
+class EntitySnapshotSetDiff:
+    created: list[EntitySnapshot] = field(default_factory=list)
+    updated: list[EntitySnapshot] = field(default_factory=list)
+    deleted: list[EntitySnapshot] = field(default_factory=list)
+    changed_fields: dict[UUID, frozenset[str]] = field(default_factory=dict)
+
 
 class EntitySnapshotSet:
+    """
+    Набор снапшотов одного типа сущностей.
+
+    Все операции над наборами используют индекс по entity_id и работают за O(n).
+    Порядок (и повторы) элементов левого операнда сохраняются.
+    """
+
     def __init__(self, snapshots: list[EntitySnapshot]) -> None:
         self.snapshots: list[EntitySnapshot] = snapshots
+        self._index: dict[UUID, list[EntitySnapshot]] | None = None
 
-    def in_by_identity(self, other_snapshot: EntitySnapshot) -> bool:
-        for snapshot in self.snapshots:
-            if snapshot.compare_identity(other_snapshot):
-                return True
+    def _get_index(self) -> dict[UUID, list[EntitySnapshot]]:
+        if self._index is None:
+            index: dict[UUID, list[EntitySnapshot]] = {}
+            for snapshot in self.snapshots:
+                index.setdefault(snapshot.entity_id, []).append(snapshot)
+            self._index = index
 
-        return False
+        return self._index
+
+    def in_by_identity(self, other_snapshot: EntitySnapshot) -> bool:
+        return other_snapshot.entity_id in self._get_index()
 
     def in_by_content(self, other_snapshot: EntitySnapshot) -> bool:
-        for snapshot in self.snapshots:
+        # Равное содержимое подразумевает равный entity_id,
+        # поэтому достаточно сравнить только снапшоты с тем же ключом
+        for snapshot in self._get_index().get(other_snapshot.entity_id, ()):
             if snapshot.compare_content(other_snapshot):
                 return True
 
         return False
 
     def intersection_identity(self, other: Self) -> Self:
-        result: list[EntitySnapshot] = []
-
-        for snapshot in self.snapshots:
-            for other_snapshot in other.snapshots:
-                if snapshot.compare_identity(other_snapshot):
-                    result.append(snapshot)
-
-        return self.__class__(result)
+        return self.__class__(
+            [snapshot for snapshot in self.snapshots if other.in_by_identity(snapshot)]
+        )
 
     def intersection_content(self, other: Self) -> Self:
-        result: list[EntitySnapshot] = []
-
-        for snapshot in self.snapshots:
-            for other_snapshot in other.snapshots:
-                if snapshot.compare_content(other_snapshot):
-                    result.append(snapshot)
-
-        return self.__class__(result)
+        return self.__class__(
+            [snapshot for snapshot in self.snapshots if other.in_by_content(snapshot)]
+        )
 
     def difference_identity(self, other: Self) -> Self:
-        result: list[EntitySnapshot] = []
+        return self.__class__(
+            [
+                snapshot
+                for snapshot in self.snapshots
+                if not other.in_by_identity(snapshot)
+            ]
+        )
 
-        for snapshot in self.snapshots:
-            if not other.in_by_identity(snapshot):
-                result.append(snapshot)
+    def difference_content(self, other: Self) -> Self:
+        return self.__class__(
+            [
+                snapshot
+                for snapshot in self.snapshots
+                if not other.in_by_content(snapshot)
+            ]
+        )
 
-        return self.__class__(result)
+    def diff(self, previous: Self) -> EntitySnapshotSetDiff:
+        """Сравнивает текущий набор (self) с предыдущим за один проход по каждому."""
+        result = EntitySnapshotSetDiff()
 
-    def difference_content(self, other: Self) -> Self:
-        result: list[EntitySnapshot] = []
+        for snapshot in previous.snapshots:
+            if not self.in_by_identity(snapshot):
+                result.deleted.append(snapshot)
 
+        previous_index = previous._get_index()
         for snapshot in self.snapshots:
-            if not other.in_by_content(snapshot):
-                result.append(snapshot)
+            previous_snapshots = previous_index.get(snapshot.entity_id)
+            if previous_snapshots is None:
+                result.created.append(snapshot)
+            elif not previous.in_by_content(snapshot):
+                result.updated.append(snapshot)
+                result.changed_fields[snapshot.entity_id] = snapshot.get_changed_fields(
+                    previous_snapshots[0]
+                )
 
-        return self.__class__(result)
+        return result
 
 
 class ResourceSnapshot:
@@ -125,6 +167,18 @@ class ResourceSnapshot:
 
         return self.__class__(result)
 
+    def diff(
+        self, previous: Self
+    ) -> dict[Type[PersistableEntity], EntitySnapshotSetDiff]:
+        result: dict[Type[PersistableEntity], EntitySnapshotSetDiff] = {}
+
+        for resource_type in self.snapshot_set_vector:
+            result[resource_type] = self.snapshot_set_vector[resource_type].diff(
+                previous.snapshot_set_vector[resource_type]
+            )
+
+        return result
+
     def to_dict(self) -> dict[Type[PersistableEntity], list[BaseDTO[Any]]]:
         result: dict[Type[PersistableEntity], list[BaseDTO[Any]]] = {}
 
@@ -0,0 +1,62 @@
+from uuid import UUID
+
+from sqlalchemy import select
+
+from shop_project.application.shared.interfaces.interface_stock_shard_service import (
+    IStockShardService,
+)
+from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+)
+from shop_project.infrastructure.persistence.mysql_concurrency_exception_handler import (
+    translate_mysql_concurrency_errors,
+)
+from shop_project.infrastructure.persistence.stock_shards import ProductStockShards
+
+
+class StockShardService(IStockShardService):
+    def __init__(self, database: Database, lock_wait_timeout_ms: int = 1500) -> None:
+        self.database: Database = database
+        self.lock_wait_timeout_ms: int = lock_wait_timeout_ms
+
+    async def set_shard_count(self, product_id: UUID, shard_count: int) -> None:
+        if shard_count < 0:
+            raise ValueError("Shard count must not be negative")
+
+        async with self.database.session(self.lock_wait_timeout_ms) as session:
+            async with translate_mysql_concurrency_errors():
+                await ProductStockShards(session).set_shard_count(
+                    product_id, shard_count
+                )
+                await session.commit()
+
+    async def rebalance(self, chunk_size: int = 100) -> int:
+        rebalanced = 0
+        last_id: UUID | None = None
+
+        while True:
+            async with self.database.session(None) as session:
+                statement = (
+                    select(ProductORM.entity_id)
+                    .where(ProductORM.stock_shard_count > 0)
+                    .order_by(ProductORM.entity_id)
+                    .limit(chunk_size)
+                )
+                if last_id is not None:
+                    statement = statement.where(ProductORM.entity_id > last_id)
+                product_ids = list((await session.execute(statement)).scalars())
+
+            # Каждый товар - отдельная короткая транзакция: шарды блокируются
+            # ненадолго и не все сразу
+            for product_id in product_ids:
+                async with self.database.session(self.lock_wait_timeout_ms) as session:
+                    async with translate_mysql_concurrency_errors():
+                        if await ProductStockShards(session).rebalance(product_id):
+                            rebalanced += 1
+                        await session.commit()
+
+            if len(product_ids) < chunk_size:
+                return rebalanced
+
+            last_id = product_ids[-1]
@@ -0,0 +1,210 @@
+import random
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConditionalDecrementException,
+)
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+    ProductStockShard,
+)
+
+
+def split_amount(total: int, shard_count: int) -> list[int]:
+    """Равные доли total, остаток от деления - первым шардам"""
+    return [
+        total // shard_count + (1 if shard_index < total % shard_count else 0)
+        for shard_index in range(shard_count)
+    ]
+
+
+class ProductStockShards:
+    """
+    Остаток товара, разбитый на stock_shard_count строк product_stock_shard.
+
+    Списания и пополнения горячего товара расходятся по разным строкам и не
+    ждут друг друга на одной строке product. Остаток товара - сумма шардов,
+    столбец product.amount у шардированного товара не используется.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def get_shard_counts(self, product_ids: list[UUID]) -> dict[UUID, int]:
+        if not product_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(ProductORM.entity_id, ProductORM.stock_shard_count).where(
+                ProductORM.entity_id.in_(product_ids),
+                ProductORM.stock_shard_count > 0,
+            )
+        )
+        return {product_id: shard_count for product_id, shard_count in result.all()}
+
+    @staticmethod
+    def get_total_expression() -> ColumnElement[Any]:
+        """Сумма шардов товара - коррелированный подзапрос для SELECT строк product"""
+        return (
+            select(func.coalesce(func.sum(ProductStockShard.amount), 0))
+            .where(ProductStockShard.product_id == ProductORM.entity_id)
+            .scalar_subquery()
+        )
+
+    async def get_totals(self, product_ids: list[UUID]) -> dict[UUID, int]:
+        if not product_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(ProductStockShard.product_id, func.sum(ProductStockShard.amount))
+            .where(ProductStockShard.product_id.in_(product_ids))
+            .group_by(ProductStockShard.product_id)
+        )
+        return {product_id: int(total) for product_id, total in result.all()}
+
+    async def increase(self, product_id: UUID, shard_count: int, amount: int) -> None:
+        await self.session.execute(
+            update(ProductStockShard)
+            .where(
+                ProductStockShard.product_id == product_id,
+                ProductStockShard.shard_index == random.randrange(shard_count),
+            )
+            .values(amount=ProductStockShard.amount + amount)
+        )
+
+    async def decrease(self, product_id: UUID, amount: int) -> None:
+        # Случайный из шардов, где хватает остатка; если его успело опустошить
+        # другое списание, условие amount >= n не даст уйти в минус
+        candidates = list(
+            (
+                await self.session.execute(
+                    select(ProductStockShard.shard_index).where(
+                        ProductStockShard.product_id == product_id,
+                        ProductStockShard.amount >= amount,
+                    )
+                )
+            ).scalars()
+        )
+        random.shuffle(candidates)
+
+        for shard_index in candidates:
+            result = await self.session.execute(
+                update(ProductStockShard)
+                .where(
+                    ProductStockShard.product_id == product_id,
+                    ProductStockShard.shard_index == shard_index,
+                    ProductStockShard.amount >= amount,
+                )
+                .values(amount=ProductStockShard.amount - amount)
+            )
+            if result.rowcount == 1:
+                return
+
+        await self._decrease_across_shards(product_id, amount)
+
+    async def _decrease_across_shards(self, product_id: UUID, amount: int) -> None:
+        # Ни в одном шарде не хватает: шарды блокируются по порядку shard_index
+        # и списание собирается из нескольких
+        shard_amounts = await self._lock_shards(product_id)
+        if sum(shard_amounts) < amount:
+            raise ConditionalDecrementException([product_id])
+
+        remaining = amount
+        for shard_index, shard_amount in enumerate(shard_amounts):
+            taken = min(shard_amount, remaining)
+            if taken:
+                await self._set_shard_amount(
+                    product_id, shard_index, shard_amount - taken
+                )
+                remaining -= taken
+            if not remaining:
+                break
+
+    async def rebalance(self, product_id: UUID) -> bool:
+        shard_amounts = await self._lock_shards(product_id)
+        target = split_amount(sum(shard_amounts), len(shard_amounts))
+
+        for shard_index, (shard_amount, target_amount) in enumerate(
+            zip(shard_amounts, target)
+        ):
+            if shard_amount != target_amount:
+                await self._set_shard_amount(product_id, shard_index, target_amount)
+
+        return shard_amounts != target
+
+    async def set_shard_count(self, product_id: UUID, shard_count: int) -> None:
+        product = (
+            await self.session.execute(
+                select(ProductORM.amount, ProductORM.stock_shard_count)
+                .where(ProductORM.entity_id == product_id)
+                .with_for_update()
+            )
+        ).one_or_none()
+        if product is None or product.stock_shard_count == shard_count:
+            return
+
+        total = product.amount
+        if product.stock_shard_count:
+            total = sum(await self._lock_shards(product_id))
+            await self.session.execute(
+                delete(ProductStockShard).where(
+                    ProductStockShard.product_id == product_id
+                )
+            )
+
+        if shard_count:
+            await self.session.execute(
+                insert(ProductStockShard),
+                [
+                    {
+                        "product_id": product_id,
+                        "shard_index": shard_index,
+                        "amount": shard_amount,
+                    }
+                    for shard_index, shard_amount in enumerate(
+                        split_amount(total, shard_count)
+                    )
+                ],
+            )
+
+        await self.session.execute(
+            update(ProductORM)
+            .where(ProductORM.entity_id == product_id)
+            .values(
+                amount=0 if shard_count else total,
+                stock_shard_count=shard_count,
+                version=ProductORM.version + 1,
+            )
+        )
+
+    async def delete_shards(self, product_ids: list[UUID]) -> None:
+        await self.session.execute(
+            delete(ProductStockShard).where(
+                ProductStockShard.product_id.in_(product_ids)
+            )
+        )
+
+    async def _lock_shards(self, product_id: UUID) -> list[int]:
+        result = await self.session.execute(
+            select(ProductStockShard.amount)
+            .where(ProductStockShard.product_id == product_id)
+            .order_by(ProductStockShard.shard_index)
+            .with_for_update()
+        )
+        return list(result.scalars())
+
+    async def _set_shard_amount(
+        self, product_id: UUID, shard_index: int, amount: int
+    ) -> None:
+        await self.session.execute(
+            update(ProductStockShard)
+            .where(
+                ProductStockShard.product_id == product_id,
+                ProductStockShard.shard_index == shard_index,
+            )
+            .values(amount=amount)
+        )
@@ -1,5 +1,7 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Type
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Type, TypeVar
 from uuid import UUID
 
 from shop_project.application.shared.interfaces.interface_query_plan import IQueryPlan
@@ -7,13 +9,18 @@ from shop_project.application.shared.interfaces.interface_unit_of_work import (
     IUnitOfWork,
     IUnitOfWorkFactory,
     NoWaitException,
+    RetryPolicy,
 )
 from shop_project.domain.interfaces.persistable_entity import PersistableEntity
 from shop_project.infrastructure.exceptions import UnitOfWorkException
 from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.inventory_ledger import (
+    INVENTORY_LEDGER_INFO_KEY,
+)
 from shop_project.infrastructure.persistence.mysql_concurrency_exception_handler import (
     translate_mysql_concurrency_errors,
 )
+from shop_project.infrastructure.persistence.query.composed_query import ComposedQuery
 from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
 from shop_project.infrastructure.persistence.query.query_plan import QueryPlan
 from shop_project.infrastructure.persistence.repositories.base_repository import (
@@ -22,17 +29,26 @@ from shop_project.infrastructure.persistence.repositories.base_repository import
 from shop_project.infrastructure.persistence.repositories.repository_container import (
     repository_container_factory,
 )
+from shop_project.infrastructure.persistence.resource_manager.entity_freezer import (
+    read_only_entity,
+)
 from shop_project.infrastructure.persistence.resource_manager.resource_container import (
     ResourceContainer,
 )
 from shop_project.infrastructure.persistence.resource_manager.resource_manager import (
     ResourceManager,
 )
+from shop_project.infrastructure.persistence.uow_retry import (
+    RetryMetrics,
+    get_backoff_delay_ms,
+)
 from shop_project.infrastructure.registries.resources_registry import ResourcesRegistry
 from shop_project.infrastructure.registries.total_order_registry import (
     TotalOrderRegistry,
 )
 
+T = TypeVar("T")
+
 
 class UnitOfWork(IUnitOfWork):
     def __init__(self, resource_manager: ResourceManager) -> None:
@@ -48,14 +64,82 @@ class UnitOfWork(IUnitOfWork):
     def mark_commit(self) -> None:
         self._commit_requested = True
 
+    def conditional_decrement(
+        self,
+        model_type: type[PersistableEntity],
+        attribute_name: str,
+        amounts: Mapping[UUID, int],
+        reason: str | None = None,
+    ) -> None:
+        self.resource_manager.add_conditional_decrement(
+            model_type, attribute_name, amounts, reason
+        )
+
+    def append_movements(
+        self,
+        model_type: type[PersistableEntity],
+        attribute_name: str,
+        deltas: Mapping[UUID, int],
+        reason: str,
+    ) -> None:
+        self.resource_manager.add_movements(model_type, attribute_name, deltas, reason)
+
     @property
     def commit_requested(self) -> bool:
         return self._commit_requested
 
 
 class UnitOfWorkFactory(IUnitOfWorkFactory):
-    def __init__(self, database: Database) -> None:
+    def __init__(
+        self,
+        database: Database,
+        freeze_read_only: bool = False,
+        read_inventory_ledger: bool = False,
+        retry_metrics: RetryMetrics | None = None,
+    ) -> None:
         self.database: Database = database
+        # Сущности read-only плана запрещено менять: ошибка сразу при изменении,
+        # а не молчаливая потеря изменений
+        self.freeze_read_only: bool = freeze_read_only
+        # Остаток товаров читается с несвёрнутыми движениями журнала - лишний
+        # запрос на каждую загрузку товаров, поэтому только при включённом журнале
+        self.read_inventory_ledger: bool = read_inventory_ledger
+        # Фабрика живёт один запрос, метрики повторов - всё приложение
+        self.retry_metrics: RetryMetrics = retry_metrics or RetryMetrics()
+
+    async def stream_ids(
+        self,
+        query_plan: IQueryPlan,
+        chunk_size: int = 100,
+        read_your_writes: bool = False,
+    ) -> AsyncIterator[list[UUID]]:
+        """
+        entity_id сущностей единственного запроса read-only плана пачками по
+        chunk_size. Курсор читается в отдельной сессии, каждую пачку вызывающий
+        обрабатывает в своём create(), т.е. в своей короткой транзакции.
+        Между пачками данные могут измениться, поэтому условия отбора нужно
+        повторить в плане обработки пачки.
+        Курсор читается с реплики, если read_your_writes не задан.
+        """
+        if not isinstance(query_plan, QueryPlan) or not query_plan.read_only:
+            raise ValueError("Only read-only query plans can be streamed")
+
+        if len(query_plan.queries) != 1 or not isinstance(
+            query_plan.queries[0], ComposedQuery
+        ):
+            raise ValueError("Streaming requires exactly one composed query")
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+
+        # Запрос без блокировок таймаут ожидания не использует
+        query = query_plan.queries[0]
+        async with self.database.session(
+            None, use_replica=not read_your_writes
+        ) as session:
+            repository = RepositoryRegistry.get_map()[query.model_type](session)
+            async for entity_ids in repository.stream_ids(query, chunk_size):
+                yield entity_ids
 
     @asynccontextmanager
     async def create(
@@ -63,17 +147,34 @@ class UnitOfWorkFactory(IUnitOfWorkFactory):
         query_plan: IQueryPlan | None = None,
         exception_on_nowait: Type[Exception] | None = None,
         wait_timeout_ms: int | None = None,
+        read_your_writes: bool = False,
     ) -> AsyncIterator[UnitOfWork]:
+        """
+        read_your_writes: read-only план читается с основной БД, а не с
+        реплики - нужно, если только что закоммиченные изменения должны быть
+        видны сразу
+        """
         if query_plan is None:
             query_plan = QueryBuilder(mutating=False).build()
 
         if not isinstance(query_plan, QueryPlan):
             raise ValueError("Invalid query plan")
 
-        if wait_timeout_ms is None:
+        if query_plan.read_only:
+            # Планы без блокировок таймаут ожидания не используют
+            wait_timeout_ms = None
+        elif wait_timeout_ms is None:
             wait_timeout_ms = 1500
 
-        async with self.database.session(wait_timeout_ms) as session:
+        # Блокирующие планы всегда идут в основную БД
+        use_replica = query_plan.read_only and not read_your_writes
+
+        async with self.database.session(
+            wait_timeout_ms, use_replica=use_replica
+        ) as session:
+            if self.read_inventory_ledger:
+                session.info[INVENTORY_LEDGER_INFO_KEY] = True
+
             try:
                 repository_container = repository_container_factory(
                     session=session, repositories=RepositoryRegistry.get_map()
@@ -95,7 +196,15 @@ class UnitOfWorkFactory(IUnitOfWorkFactory):
                     else:
                         raise
 
-                resource_manager.resource_container.take_snapshot()
+                # Read-only план закоммитить нельзя, поэтому снимок для поиска
+                # изменений ему не нужен
+                if not query_plan.read_only:
+                    resource_manager.resource_container.take_snapshot()
+                elif self.freeze_read_only:
+                    resource_container = resource_manager.resource_container
+                    for resource in resource_container.resources.values():
+                        for entity_id, entity in resource.items():
+                            resource[entity_id] = read_only_entity(entity)
 
                 unit_of_work = UnitOfWork(resource_manager=resource_manager)
 
@@ -103,10 +212,63 @@ class UnitOfWorkFactory(IUnitOfWorkFactory):
 
                 if unit_of_work.commit_requested:
                     if not query_plan.read_only:
-                        await resource_manager.save()
-                        await session.commit()
+                        async with translate_mysql_concurrency_errors():
+                            await resource_manager.save()
+                            await session.commit()
                     else:
                         raise UnitOfWorkException("Cannot commit in non-mutating mode")
             except Exception:
                 await session.rollback()
                 raise
+
+    async def run(
+        self,
+        build_query_plan: Callable[[], IQueryPlan],
+        fn: Callable[[IUnitOfWork], Awaitable[T]],
+        retry: RetryPolicy | None = None,
+        exception_on_nowait: Type[Exception] | None = None,
+        wait_timeout_ms: int | None = None,
+    ) -> T:
+        """
+        Выполняет fn в единице работы по плану из build_query_plan. При
+        исключениях из retry.retry_on единица работы откатывается и
+        выполняется заново целиком. План строится на каждую попытку: запросы
+        плана хранят результаты загрузки и повторно не загружаются.
+
+        План детерминирован и берёт блокировки в порядке TotalOrderRegistry,
+        поэтому повтор безопасен; fn не должна иметь внешних побочных
+        эффектов (запросов к платёжному шлюзу и т.п.).
+        """
+        if retry is None:
+            retry = RetryPolicy()
+
+        self.retry_metrics.observe_run()
+        start = time.perf_counter()
+        attempt = 1
+
+        while True:
+            try:
+                async with self.create(
+                    build_query_plan(), exception_on_nowait, wait_timeout_ms
+                ) as uow:
+                    result = await fn(uow)
+            except retry.retry_on as e:
+                delay_ms = get_backoff_delay_ms(retry, attempt)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                if (
+                    attempt >= retry.max_attempts
+                    or elapsed_ms + delay_ms > retry.budget_ms
+                ):
+                    self.retry_metrics.observe_exhausted(e)
+                    raise
+
+                self.retry_metrics.observe_retry(e)
+                await asyncio.sleep(delay_ms / 1000)
+                attempt += 1
+                continue
+
+            if attempt > 1:
+                self.retry_metrics.observe_recovered()
+
+            return result
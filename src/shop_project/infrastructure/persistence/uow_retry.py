@@ -0,0 +1,51 @@
+import random
+from collections import Counter
+from dataclasses import dataclass
+
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    RetryPolicy,
+)
+
+
+def get_backoff_delay_ms(policy: RetryPolicy, attempt: int) -> float:
+    """Задержка перед повтором после attempt-й неудачной попытки (с 1)"""
+    ceiling = min(policy.max_delay_ms, policy.base_delay_ms * 2 ** (attempt - 1))
+    # Полный разброс: конкурирующие транзакции не повторяют попытки синхронно
+    return random.uniform(0, ceiling)
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    runs: int
+    # Повторы и исчерпанные попытки по имени исключения
+    retries: dict[str, int]
+    exhausted: dict[str, int]
+    recovered: int
+
+
+class RetryMetrics:
+    def __init__(self) -> None:
+        self._runs: int = 0
+        self._retries: Counter[str] = Counter()
+        self._exhausted: Counter[str] = Counter()
+        self._recovered: int = 0
+
+    def observe_run(self) -> None:
+        self._runs += 1
+
+    def observe_retry(self, exception: Exception) -> None:
+        self._retries[type(exception).__name__] += 1
+
+    def observe_exhausted(self, exception: Exception) -> None:
+        self._exhausted[type(exception).__name__] += 1
+
+    def observe_recovered(self) -> None:
+        self._recovered += 1
+
+    def get_stats(self) -> RetryStats:
+        return RetryStats(
+            runs=self._runs,
+            retries=dict(self._retries),
+            exhausted=dict(self._exhausted),
+            recovered=self._recovered,
+        )
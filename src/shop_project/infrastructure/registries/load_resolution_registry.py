@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Callable, Generic, Type, TypeVar
+from typing import Any, Generic, Mapping, Type, TypeVar
 
 from shop_project.application.entities.account import Account
 from shop_project.application.entities.auth_session import AuthSession
@@ -22,132 +22,140 @@ TargetType = TypeVar("TargetType")
 @dataclass(frozen=True)
 class LoadResolutionDescriptor(Generic[SourceType]):
     attribute_name: str
-    strategy: Callable[[SourceType], list[Any]]
+    # Откуда берутся значения в исходной сущности: "атрибут" или
+    # "контейнер.атрибут" (по всем элементам контейнера). Имена совпадают с
+    # ORM, поэтому тот же путь переводится в условие JOIN
+    source_path: str
+
+    def strategy(self, source: SourceType) -> list[Any]:
+        if "." not in self.source_path:
+            return [getattr(source, self.source_path)]
+
+        container_name, attribute_name = self.source_path.split(".", 1)
+        return [
+            getattr(item, attribute_name) for item in getattr(source, container_name)
+        ]
 
 
 _REGISTRY: dict[Type[Any], dict[Type[Any], LoadResolutionDescriptor[Any]]] = {
     ClaimToken: {
         Customer: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda claim_token: [claim_token.entity_id],
+            source_path="entity_id",
         ),
     },
     Account: {
         Customer: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda account: [account.entity_id],
+            source_path="entity_id",
         ),
         Employee: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda account: [account.entity_id],
+            source_path="entity_id",
         ),
         Manager: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda account: [account.entity_id],
+            source_path="entity_id",
         ),
         AuthSession: LoadResolutionDescriptor(
             attribute_name="account_id",
-            strategy=lambda account: [account.entity_id],
+            source_path="entity_id",
         ),
     },
     AuthSession: {
         Customer: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda auth_session: [auth_session.account_id],
+            source_path="account_id",
         ),
         Employee: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda auth_session: [auth_session.account_id],
+            source_path="account_id",
         ),
         Manager: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda auth_session: [auth_session.account_id],
+            source_path="account_id",
         ),
         Account: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda auth_session: [auth_session.account_id],
+            source_path="account_id",
         ),
     },
     Customer: {
         PurchaseActive: LoadResolutionDescriptor(
             attribute_name="customer_id",
-            strategy=lambda customer: [customer.entity_id],
+            source_path="entity_id",
         ),
         PurchaseDraft: LoadResolutionDescriptor(
             attribute_name="customer_id",
-            strategy=lambda customer: [customer.entity_id],
+            source_path="entity_id",
         ),
         PurchaseSummary: LoadResolutionDescriptor(
             attribute_name="customer_id",
-            strategy=lambda customer: [customer.entity_id],
+            source_path="entity_id",
         ),
         EscrowAccount: LoadResolutionDescriptor(
             attribute_name="customer_id",
-            strategy=lambda customer: [customer.entity_id],
+            source_path="entity_id",
         ),
     },
     PurchaseDraft: {
         Product: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda purchase_draft: [
-                item.product_id for item in purchase_draft.items
-            ],
+            source_path="items.product_id",
         ),
         Customer: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda purchase_draft: [purchase_draft.customer_id],
+            source_path="customer_id",
         ),
     },
     PurchaseActive: {
         Product: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda purchase_active: [
-                item.product_id for item in purchase_active.items
-            ],
+            source_path="items.product_id",
         ),
         Customer: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda purchase_active: [purchase_active.customer_id],
+            source_path="customer_id",
         ),
         EscrowAccount: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda purchase_active: [purchase_active.escrow_account_id],
+            source_path="escrow_account_id",
         ),
     },
     PurchaseSummary: {
         Product: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda order: [item.product_id for item in order.items],
+            source_path="items.product_id",
         ),
         Customer: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda order: [order.customer_id],
+            source_path="customer_id",
         ),
         EscrowAccount: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda order: [order.escrow_account_id],
+            source_path="escrow_account_id",
         ),
     },
     EscrowAccount: {
         PurchaseActive: LoadResolutionDescriptor(
             attribute_name="escrow_account_id",
-            strategy=lambda escrow_account: [escrow_account.entity_id],
+            source_path="entity_id",
         ),
         PurchaseSummary: LoadResolutionDescriptor(
             attribute_name="escrow_account_id",
-            strategy=lambda escrow_account: [escrow_account.entity_id],
+            source_path="entity_id",
         ),
     },
     Shipment: {
         Product: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda order: [item.product_id for item in order.items],
+            source_path="items.product_id",
         ),
     },
     ShipmentSummary: {
         Product: LoadResolutionDescriptor(
             attribute_name="entity_id",
-            strategy=lambda order: [item.product_id for item in order.items],
+            source_path="items.product_id",
         ),
     },
     Product: {},
@@ -169,6 +177,12 @@ class DomainReferenceRegistry:
 
         return cls._get_map()[source_type][target_type]
 
+    @classmethod
+    def get_map(
+        cls,
+    ) -> Mapping[Type[Any], Mapping[Type[Any], LoadResolutionDescriptor[Any]]]:
+        return cls._get_map()
+
     @classmethod
     def _get_map(
         cls,
@@ -0,0 +1,24 @@
+from typing import Any, Type
+
+from shop_project.application.entities.auth_session import AuthSession
+from shop_project.domain.entities.escrow_account import EscrowAccount
+from shop_project.domain.entities.purchase_active import PurchaseActive
+from shop_project.domain.entities.purchase_draft import PurchaseDraft
+from shop_project.domain.entities.purchase_summary import PurchaseSummary
+
+# Ссылки на другие сущности, которые задаются при создании и больше не
+# меняются. Только по ним ResourceContainer держит индексы
+_REGISTRY: dict[Type[Any], frozenset[str]] = {
+    AuthSession: frozenset({"account_id"}),
+    EscrowAccount: frozenset({"customer_id"}),
+    PurchaseDraft: frozenset({"customer_id"}),
+    PurchaseActive: frozenset({"customer_id", "escrow_account_id"}),
+    PurchaseSummary: frozenset({"customer_id", "escrow_account_id"}),
+}
+
+
+class ReferenceAttributesRegistry:
+
+    @classmethod
+    def get_attribute_names(cls, model_type: Type[Any]) -> frozenset[str]:
+        return _REGISTRY.get(model_type, frozenset())
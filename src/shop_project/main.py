@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from dishka.async_container import AsyncContainer
@@ -16,14 +17,24 @@ from shop_project.infrastructure.dependency_injection.factories import (
     container_fastapi_factory,
 )
 from shop_project.infrastructure.env_loader import get_env
+from shop_project.infrastructure.persistence.persistence_stats_logger import (
+    PersistenceStatsLogger,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    pass
+    stats_log_task: asyncio.Task[None] | None = None
+    stats_log_interval = float(get_env("PERSISTENCE_STATS_LOG_INTERVAL", "0"))
+    if stats_log_interval > 0:
+        stats_logger = await app.state.container.get(PersistenceStatsLogger)
+        stats_log_task = asyncio.create_task(stats_logger.run(stats_log_interval))
 
     yield
 
+    if stats_log_task is not None:
+        stats_log_task.cancel()
+
     if app.state.container is not None:
         await app.state.container.close()
 
@@ -1,10 +1,11 @@
 import sqlite3
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from typing import Any, AsyncGenerator, Callable
+from typing import Any, AsyncGenerator, Callable, Generator
 
 import pytest
 import pytest_asyncio
 from dishka import AsyncContainer
+from sqlalchemy import event
 
 from shop_project.infrastructure.persistence.database.core import Database
 from shop_project.infrastructure.persistence.database.models.base import Base
@@ -17,6 +18,29 @@ async def test_db(
     yield await async_container.get(Database)
 
 
+@pytest.fixture
+def captured_statements(test_db: Database) -> Generator[list[tuple[str, bool]], None]:
+    """Собирает (sql, executemany) всех запросов, отправленных в БД во время теста"""
+    statements: list[tuple[str, bool]] = []
+
+    def before_cursor_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append((statement, executemany))
+
+    sync_engine = test_db.get_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture
 def test_db_factory(
     request: pytest.FixtureRequest,
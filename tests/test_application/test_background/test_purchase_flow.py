@@ -6,12 +6,13 @@ from typing import (
     Sequence,
     Type,
 )
+from uuid import UUID
 
 import pytest
 from dishka.async_container import AsyncContainer
 from freezegun import freeze_time
 
-from shop_project.application.background.base_task_handler import NullTaskParams
+from shop_project.application.background.base_task_handler import BatchTaskParams
 from shop_project.application.background.implementations.purchase_flow_handler import (
     BatchFinalizeNotPaidTasksHandler,
     BatchPaidReservationTimeOutTaskHandler,
@@ -32,6 +33,7 @@ from shop_project.application.entities.operation_log.operation_log import Operat
 from shop_project.application.entities.task import Task, create_task
 from shop_project.application.shared.access_token_payload import AccessTokenPayload
 from shop_project.application.shared.interfaces.interface_task_sender import ITaskSender
+from shop_project.application.shared.scenarios.batch import is_in_partition
 from shop_project.domain.entities.customer import Customer
 from shop_project.domain.entities.escrow_account import (
     EscrowAccount,
@@ -114,7 +116,7 @@ async def test_purchase_flow_cancel_payment(
     payment_gateway.cancel_pending()
 
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
 
     escrow_account: EscrowAccount = await uow_get_one_single_model(
@@ -163,11 +165,11 @@ async def test_purchase_flow_finalize_cancelled(
     purchase_schema: PurchaseActiveSchema = purchase_activation.purchase_active
     payment_gateway.cancel_pending()
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
 
     await inmem_save_and_send_task(
-        create_task(BatchFinalizeNotPaidTasksHandler, NullTaskParams())
+        create_task(BatchFinalizeNotPaidTasksHandler, BatchTaskParams())
     )
 
     assert not await uow_get_all_single_model(PurchaseActive)
@@ -215,7 +217,7 @@ async def test_purchase_flow_confirm_payment(
 
     payment_gateway.pay_pending()
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
 
     escrow_account: EscrowAccount = await uow_get_one_single_model(
@@ -268,7 +270,7 @@ async def test_purchase_flow_manual_unclaim(
     purchase_schema: PurchaseActiveSchema = purchase_activation.purchase_active
     payment_gateway.pay_pending()
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
 
     await purchase_service.unclaim(access_token, purchase_schema.entity_id)
@@ -321,12 +323,12 @@ async def test_purchase_flow_auto_unclaim(
     purchase_schema: PurchaseActiveSchema = purchase_activation.purchase_active
     payment_gateway.pay_pending()
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
 
     with freeze_time(datetime.now(tz=timezone.utc) + timedelta(weeks=10)):
         await inmem_save_and_send_task(
-            create_task(BatchPaidReservationTimeOutTaskHandler, NullTaskParams())
+            create_task(BatchPaidReservationTimeOutTaskHandler, BatchTaskParams())
         )
 
     assert not await uow_get_all_single_model(PurchaseActive)
@@ -380,14 +382,14 @@ async def test_purchase_flow_confirm_refund(
     purchase_schema: PurchaseActiveSchema = purchase_activation.purchase_active
     payment_gateway.pay_pending()
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
     await purchase_service.unclaim(access_token, purchase_schema.entity_id)
     payment_gateway.start_refund_paid()  # begin refund manually as we don't have immediate refund policy
     payment_gateway.complete_refunding()
 
     await inmem_save_and_send_task(
-        create_task(BatchWaitRefundTaskHandler, NullTaskParams())
+        create_task(BatchWaitRefundTaskHandler, BatchTaskParams())
     )
 
     assert not await uow_get_all_single_model(PurchaseActive)
@@ -406,3 +408,54 @@ async def test_purchase_flow_confirm_refund(
     assert OperationCodeEnum.PAY_PURCHASE.value in codes
     assert OperationCodeEnum.MANUAL_UNCLAIM_PURCHASE.value in codes
     assert OperationCodeEnum.REFUND_PURCHASE.value in codes
+
+
+@pytest.mark.asyncio
+@pytest.mark.inmemory
+async def test_purchase_flow_partitioned_chunks(
+    async_container: AsyncContainer,
+    purchase_activation: Callable[
+        [AggregateContainer], Awaitable[PurchaseActivationSchema]
+    ],
+    uow_get_all_single_model: Callable[
+        [Type[PersistableEntity]], Awaitable[Sequence[PersistableEntity]]
+    ],
+    inmem_save_and_send_task: Callable[[Task], Awaitable[None]],
+    customer_container_factory: Callable[[], AggregateContainer],
+) -> None:
+    payment_gateway = await async_container.get(InMemoryPaymentGateway)
+    for _ in range(4):
+        await purchase_activation(customer_container_factory())
+
+    payment_gateway.cancel_pending()
+
+    async def get_cancelled_ids() -> set[UUID]:
+        escrow_accounts: Sequence[EscrowAccount] = await uow_get_all_single_model(
+            EscrowAccount
+        )  # pyright: ignore[reportAssignmentType]
+        return {
+            escrow_account.entity_id
+            for escrow_account in escrow_accounts
+            if escrow_account.state == EscrowAccountState.PAYMENT_CANCELLED
+        }
+
+    all_ids = {
+        escrow_account.entity_id
+        for escrow_account in await uow_get_all_single_model(EscrowAccount)
+    }
+    processed_ids: set[UUID] = set()
+
+    for partition_index in range(2):
+        params = BatchTaskParams(
+            chunk_size=1, partition_count=2, partition_index=partition_index
+        )
+        await inmem_save_and_send_task(create_task(BatchWaitPaymentTaskHandler, params))
+
+        # Задача партиции трогает только свои счета
+        processed_ids |= {
+            entity_id for entity_id in all_ids if is_in_partition(entity_id, params)
+        }
+        assert await get_cancelled_ids() == processed_ids
+
+    assert processed_ids == all_ids
+    assert not await uow_get_all_single_model(Task)
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import (
     Callable,
     Coroutine,
@@ -36,3 +37,36 @@ async def test_catalogue_customer_service(
 
     assert len(product_schemas) == 1
     assert product_schemas[0].entity_id == product.entity_id
+
+
+@pytest.mark.asyncio
+async def test_catalogue_customer_service_keyset_pages(
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+    async_container: AsyncContainer,
+) -> None:
+    catalogue_service = await async_container.get(CatalogueCustomerReadService)
+    products = [
+        product_factory(name="product", amount=1, price=Decimal(1)) for _ in range(5)
+    ]
+    for product in products:
+        await save_entity(product)
+    ids_desc = sorted((product.entity_id for product in products), reverse=True)
+
+    first_page = await catalogue_service.get_products(offset=0, limit=2)
+    assert {schema.entity_id for schema in first_page} == set(ids_desc[:2])
+
+    second_page = await catalogue_service.get_products(
+        offset=0, limit=2, after=ids_desc[1]
+    )
+    assert {schema.entity_id for schema in second_page} == set(ids_desc[2:4])
+
+    last_page = await catalogue_service.get_products(
+        offset=0, limit=2, after=ids_desc[3]
+    )
+    assert {schema.entity_id for schema in last_page} == {ids_desc[4]}
+
+    previous_page = await catalogue_service.get_products(
+        offset=0, limit=2, before=ids_desc[2]
+    )
+    assert {schema.entity_id for schema in previous_page} == set(ids_desc[:2])
@@ -2,9 +2,11 @@ from typing import (
     Any,
     Awaitable,
     Callable,
+    Coroutine,
     Sequence,
     Type,
 )
+from uuid import uuid4
 
 import pytest
 from dishka.async_container import AsyncContainer
@@ -13,6 +15,7 @@ from shop_project.application.customer.commands.purchase_active_customer_service
     PurchaseActiveCustomerService,
 )
 from shop_project.application.customer.schemas.purchase_active_schema import (
+    ActivatePurchaseDraftsSchema,
     PurchaseActivationSchema,
     PurchaseActiveSchema,
 )
@@ -29,11 +32,14 @@ from shop_project.domain.entities.escrow_account import (
     EscrowAccount,
     EscrowAccountState,
 )
+from shop_project.domain.entities.product import Product
 from shop_project.domain.entities.purchase_active import PurchaseActive
+from shop_project.domain.entities.purchase_draft import PurchaseDraft
 from shop_project.domain.entities.purchase_summary import (
     PurchaseSummary,
     PurchaseSummaryReason,
 )
+from shop_project.domain.exceptions import DomainConflictError
 from shop_project.domain.interfaces.persistable_entity import PersistableEntity
 from shop_project.domain.interfaces.subject import Subject
 from tests.helpers import AggregateContainer
@@ -315,3 +321,72 @@ async def test_purchase_active_customer_service_confirm_refund(
     assert OperationCodeEnum.PAY_PURCHASE.value in codes
     assert OperationCodeEnum.MANUAL_UNCLAIM_PURCHASE.value in codes
     assert OperationCodeEnum.REFUND_PURCHASE.value in codes
+
+
+@pytest.mark.asyncio
+async def test_purchase_active_customer_service_activate_drafts(
+    async_container: AsyncContainer,
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+    potatoes_product_10: Callable[[], Product],
+    customer_container_factory: Callable[[], AggregateContainer],
+    get_subject_access_token_payload: Callable[
+        [Subject], Awaitable[AccessTokenPayload]
+    ],
+    uow_get_one_single_model: Callable[
+        [Type[PersistableEntity], str, Any], Awaitable[PersistableEntity]
+    ],
+    ensure_operation_log_amount: Callable[[int], Awaitable[Sequence[OperationLog]]],
+) -> None:
+    customer_container: AggregateContainer = customer_container_factory()
+    customer: Customer = (
+        customer_container.aggregate
+    )  # pyright: ignore[reportAssignmentType]
+
+    potatoes = potatoes_product_10()
+    purchase_drafts = [
+        PurchaseDraft(uuid4(), customer.entity_id),
+        PurchaseDraft(uuid4(), customer.entity_id),
+        PurchaseDraft(uuid4(), customer.entity_id),
+    ]
+    purchase_drafts[0].add_item(potatoes.entity_id, 6)
+    purchase_drafts[1].add_item(potatoes.entity_id, 4)
+    purchase_drafts[2].add_item(potatoes.entity_id, 1)
+    customer_container.dependencies.dependencies[Product] = [potatoes]
+    customer_container.dependencies.dependencies[PurchaseDraft] = purchase_drafts
+    await save_container(customer_container)
+
+    service = await async_container.get(PurchaseActiveCustomerService)
+    access_payload = await get_subject_access_token_payload(customer)
+
+    # Остаток проверяется по всем черновикам вместе: 6 + 4 + 1 > 10
+    with pytest.raises(DomainConflictError):
+        await service.activate_drafts(
+            access_payload,
+            ActivatePurchaseDraftsSchema(
+                purchase_draft_ids=[draft.entity_id for draft in purchase_drafts]
+            ),
+        )
+
+    activations = await service.activate_drafts(
+        access_payload,
+        ActivatePurchaseDraftsSchema(
+            purchase_draft_ids=[draft.entity_id for draft in purchase_drafts[:2]]
+        ),
+    )
+
+    assert [
+        activation.purchase_active.items[0].amount for activation in activations
+    ] == [6, 4]
+    for activation in activations:
+        assert activation.payment_url.endswith(
+            str(activation.purchase_active.entity_id)
+        )
+
+    product: Product = await uow_get_one_single_model(
+        Product, "entity_id", potatoes.entity_id
+    )  # pyright: ignore[reportAssignmentType]
+    assert product.amount == 0
+
+    logs = await ensure_operation_log_amount(2)
+    codes = [log.operation_code for log in logs]
+    assert codes.count(OperationCodeEnum.ACTIVATE_PURCHASE.value) == 2
@@ -9,7 +9,7 @@ from typing import (
 import pytest
 from dishka.async_container import AsyncContainer
 
-from shop_project.application.background.base_task_handler import NullTaskParams
+from shop_project.application.background.base_task_handler import BatchTaskParams
 from shop_project.application.background.implementations.purchase_flow_handler import (
     BatchWaitPaymentTaskHandler,
 )
@@ -96,7 +96,7 @@ async def test_purchase_flow_claim(
     purchase_schema: PurchaseActiveSchema = purchase_activation.purchase_active
     payment_gateway.pay_pending()
     await inmem_save_and_send_task(
-        create_task(BatchWaitPaymentTaskHandler, NullTaskParams())
+        create_task(BatchWaitPaymentTaskHandler, BatchTaskParams())
     )
 
     claim_token = await purchase_service.get_claim_token(customer_access_token)
@@ -22,6 +22,7 @@ from shop_project.application.shared.access_token_payload import AccessTokenPayl
 from shop_project.application.shared.schemas.product_schema import (
     ChangeProductSchema,
     CreateProductSchema,
+    SetProductStockShardsSchema,
 )
 from shop_project.domain.entities.manager import Manager
 from shop_project.domain.entities.product import Product
@@ -165,3 +166,51 @@ async def test_product_manager_change(
     codes = [log.operation_code for log in logs]
     assert OperationCodeEnum.UPDATE_PRODUCT.value in codes
     assert OperationCodeEnum.CREATE_PRODUCT.value in codes
+
+
+@pytest.mark.asyncio
+@pytest.mark.inmemory
+async def test_product_manager_set_stock_shards(
+    uow_get_one_single_model: Callable[
+        [Type[PersistableEntity], str, Any], Awaitable[PersistableEntity]
+    ],
+    uow_get_all_single_model: Callable[
+        [Type[PersistableEntity]], Awaitable[Sequence[PersistableEntity]]
+    ],
+    async_container: AsyncContainer,
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+    manager_container_factory: Callable[[], AggregateContainer],
+    get_subject_access_token_payload: Callable[
+        [Subject], Awaitable[AccessTokenPayload]
+    ],
+    ensure_operation_log_amount: Callable[[int], Awaitable[Sequence[OperationLog]]],
+) -> None:
+    product_service = await async_container.get(ProductManagerService)
+    manager_container = manager_container_factory()
+    await save_container(manager_container)
+    manager: Manager = (
+        manager_container.aggregate
+    )  # pyright: ignore[reportAssignmentType]
+    access_payload = await get_subject_access_token_payload(manager)
+    product_schema = await product_service.create_product(
+        access_payload,
+        CreateProductSchema(name="potatoes", amount=10, price=Decimal(10)),
+    )
+
+    await product_service.set_stock_shards(
+        access_payload,
+        SetProductStockShardsSchema(entity_id=product_schema.entity_id, shard_count=4),
+    )
+
+    product: Product = await uow_get_one_single_model(
+        Product, "entity_id", product_schema.entity_id
+    )  # pyright: ignore[reportAssignmentType]
+    assert product.amount == 10
+
+    # Вместе с товаром удаляются и его шарды
+    await product_service.delete_products(access_payload, [product_schema.entity_id])
+    assert not await uow_get_all_single_model(Product)
+
+    logs = await ensure_operation_log_amount(3)
+    codes = [log.operation_code for log in logs]
+    assert OperationCodeEnum.SET_PRODUCT_STOCK_SHARDS.value in codes
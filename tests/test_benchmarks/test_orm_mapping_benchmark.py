@@ -0,0 +1,105 @@
+import gc
+import time
+from decimal import Decimal
+from typing import Any, Callable, Type
+from uuid import uuid4
+
+import pytest
+
+from shop_project.application.shared.base_dto import BaseDTO
+from shop_project.application.shared.dto.product_dto import ProductDTO
+from shop_project.application.shared.dto.purchase_draft_dto import PurchaseDraftDTO
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+)
+from shop_project.infrastructure.persistence.database.models.purchase_draft import (
+    PurchaseDraft as PurchaseDraftORM,
+    PurchaseDraftItem as PurchaseDraftItemORM,
+)
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    get_row_columns,
+)
+from shop_project.infrastructure.persistence.repositories.orm_mapper import (
+    OrmMapperRegistry,
+)
+
+
+def _make_products(count: int) -> list[ProductORM]:
+    return [
+        ProductORM(entity_id=uuid4(), name="product", amount=100, price=Decimal(1))
+        for _ in range(count)
+    ]
+
+
+def _make_drafts(count: int) -> list[PurchaseDraftORM]:
+    drafts: list[PurchaseDraftORM] = []
+    for _ in range(count):
+        entity_id = uuid4()
+        drafts.append(
+            PurchaseDraftORM(
+                entity_id=entity_id,
+                customer_id=uuid4(),
+                state="ACTIVE",
+                items=[
+                    PurchaseDraftItemORM(
+                        parent_id=entity_id, product_id=uuid4(), amount=1
+                    )
+                    for _ in range(5)
+                ],
+            )
+        )
+    return drafts
+
+
+def _to_row_values(
+    orm_object: Any,
+) -> tuple[dict[str, Any], dict[str, list[dict[str, Any]]]]:
+    values = {
+        name: getattr(orm_object, name) for name, _ in get_row_columns(type(orm_object))
+    }
+    children = {
+        "items": [
+            {name: getattr(item, name) for name, _ in get_row_columns(type(item))}
+            for item in getattr(orm_object, "items", [])
+        ]
+    }
+    return values, children
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ("dto_type", "make_rows"),
+    [(ProductDTO, _make_products), (PurchaseDraftDTO, _make_drafts)],
+)
+@pytest.mark.parametrize("rows_count", [1_000, 20_000])
+def test_orm_mapping_benchmark(
+    dto_type: Type[BaseDTO[Any]],
+    make_rows: Callable[[int], list[Any]],
+    rows_count: int,
+) -> None:
+    rows = make_rows(rows_count)
+    # Те же данные в виде, в котором их отдаёт загрузка строк (NO_LOCK):
+    # значения родителя и дочерние строки отдельно
+    row_values = [_to_row_values(row) for row in rows]
+    mapper = OrmMapperRegistry.get(dto_type)
+    # Прогрев, чтобы не мерить первичную инициализацию
+    dto_type.model_validate(rows[0]).to_domain()
+    mapper.to_domain(*row_values[0])
+
+    gc.collect()
+    dto_start = time.perf_counter()
+    via_dto = [dto_type.model_validate(row).to_domain() for row in rows]
+    dto_elapsed = time.perf_counter() - dto_start
+
+    gc.collect()
+    direct_start = time.perf_counter()
+    direct = [mapper.to_domain(values, children) for values, children in row_values]
+    direct_elapsed = time.perf_counter() - direct_start
+
+    print(
+        f"\n[orm mapping] {dto_type.__name__} rows={rows_count}"
+        f" orm_objects={dto_elapsed * 1000:.2f}ms"
+        f" row_values={direct_elapsed * 1000:.2f}ms"
+    )
+
+    assert len(direct) == len(via_dto)
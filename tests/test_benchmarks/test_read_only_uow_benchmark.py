@@ -0,0 +1,59 @@
+import time
+from decimal import Decimal
+from typing import Callable, Coroutine
+from uuid import uuid4
+
+import pytest
+
+from shop_project.domain.entities.product import Product
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+
+REQUESTS_COUNT = 20
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+@pytest.mark.parametrize("entities_count", [10, 1_000])
+async def test_read_only_uow_benchmark(
+    entities_count: int,
+    uow_factory: UnitOfWorkFactory,
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    product_ids = []
+    for _ in range(entities_count):
+        product = Product(uuid4(), name="product", amount=100, price=Decimal(1))
+        await save_entity(product)
+        product_ids.append(product.entity_id)
+
+    # Заморозка read-only сущностей - проверка для dev/test, в поставке выключена
+    frozen_uow_factory = UnitOfWorkFactory(uow_factory.database, freeze_read_only=True)
+
+    async def measure(snapshot: bool, factory: UnitOfWorkFactory) -> float:
+        start = time.perf_counter()
+        for _ in range(REQUESTS_COUNT):
+            async with factory.create(
+                QueryBuilder(mutating=False)
+                .load(Product)
+                .from_id(product_ids)
+                .no_lock()
+                .build()
+            ) as uow:
+                resources = uow.get_resources()
+                # Тот же read-only план; снимок - то, что делает мутирующий
+                if snapshot:
+                    resources.take_snapshot()
+                assert len(resources.get_all(Product)) == entities_count
+        return (time.perf_counter() - start) / REQUESTS_COUNT
+
+    with_snapshot = await measure(snapshot=True, factory=uow_factory)
+    without_snapshot = await measure(snapshot=False, factory=uow_factory)
+    frozen = await measure(snapshot=False, factory=frozen_uow_factory)
+
+    print(
+        f"\n[read-only uow] entities={entities_count}"
+        f" with_snapshot={with_snapshot * 1000:.2f}ms"
+        f" read_only={without_snapshot * 1000:.2f}ms"
+        f" read_only_frozen={frozen * 1000:.2f}ms"
+    )
@@ -0,0 +1,51 @@
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from shop_project.domain.entities.product import Product
+from shop_project.infrastructure.persistence.resource_manager.resource_container import (
+    ResourceContainer,
+)
+from shop_project.infrastructure.registries.resources_registry import ResourcesRegistry
+
+
+def _make_products(count: int) -> list[Product]:
+    return [
+        Product(uuid4(), name="product", amount=100, price=Decimal(1))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("entities_count", [10, 1_000, 50_000])
+def test_resource_changes_benchmark(entities_count: int) -> None:
+    container = ResourceContainer(resources_registry=ResourcesRegistry.get_map())
+    products = _make_products(entities_count)
+    container.put_many(Product, list(products))
+    container.take_snapshot()
+
+    changed_count = max(1, entities_count // 10)
+    for product in products[:changed_count]:
+        product.reserve(1)
+    container.delete_many(Product, products[-changed_count:])
+    container.put_many(Product, list(_make_products(changed_count)))
+
+    snapshot_start = time.perf_counter()
+    container.take_snapshot()
+    snapshot_elapsed = time.perf_counter() - snapshot_start
+
+    diff_start = time.perf_counter()
+    changes = container.get_resource_changes()[Product]
+    diff_elapsed = time.perf_counter() - diff_start
+
+    print(
+        f"\n[resource changes] entities={entities_count}"
+        f" snapshot={snapshot_elapsed * 1000:.2f}ms"
+        f" diff={diff_elapsed * 1000:.2f}ms"
+    )
+
+    assert len(changes["UPDATED"]) == changed_count
+    assert len(changes["DELETED"]) == changed_count
+    assert len(changes["CREATED"]) == changed_count
@@ -0,0 +1,75 @@
+import gc
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+import pytest
+
+from shop_project.domain.entities.product import Product
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.repositories.implementations.product_repository import (
+    ProductRepository,
+)
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+
+MEASURE_REPEATS = 3
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+@pytest.mark.parametrize("entities_count", [1_000, 10_000])
+async def test_row_loading_benchmark(
+    monkeypatch: pytest.MonkeyPatch,
+    entities_count: int,
+    uow_factory: UnitOfWorkFactory,
+    fill_database: Callable[
+        [dict[type[PersistableEntity], list[PersistableEntity]]], Awaitable[None]
+    ],
+) -> None:
+    await fill_database(
+        {
+            Product: [
+                Product(uuid4(), name="product", amount=100, price=Decimal(1))
+                for _ in range(entities_count)
+            ]
+        }
+    )
+
+    async def load() -> None:
+        async with uow_factory.create(
+            QueryBuilder(mutating=False).load(Product).no_lock().build()
+        ) as uow:
+            assert len(uow.get_resources().get_all(Product)) == entities_count
+
+    async def measure(row_loading: bool) -> tuple[float, int]:
+        monkeypatch.setattr(ProductRepository, "row_loading_for_no_lock", row_loading)
+        # Прогрев: кэш запросов и первичная инициализация
+        await load()
+
+        # Время и память меряются раздельно: tracemalloc замедляет аллокации
+        gc.collect()
+        elapsed = float("inf")
+        for _ in range(MEASURE_REPEATS):
+            start = time.perf_counter()
+            await load()
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        await load()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return elapsed, peak
+
+    orm_elapsed, orm_peak = await measure(row_loading=False)
+    rows_elapsed, rows_peak = await measure(row_loading=True)
+
+    print(
+        f"\n[row loading] entities={entities_count}"
+        f" orm={orm_elapsed * 1000:.2f}ms/{orm_peak / 2**20:.2f}MiB"
+        f" rows={rows_elapsed * 1000:.2f}ms/{rows_peak / 2**20:.2f}MiB"
+    )
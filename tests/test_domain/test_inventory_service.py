@@ -5,7 +5,10 @@ import pytest
 
 from shop_project.domain.entities.product import Product
 from shop_project.domain.exceptions import DomainException
-from shop_project.domain.helpers.product_inventory import ProductInventory
+from shop_project.domain.helpers.product_inventory import (
+    DeferredProductInventory,
+    ProductInventory,
+)
 from shop_project.domain.interfaces.stock_item import StockItem
 
 
@@ -101,3 +104,45 @@ def test_restock_invalid_stock(
         product_inventory.restock([AbstractStockItem(sausages.entity_id, 2)])
 
     assert sausages.amount == 10
+
+
+def test_deferred_reserve_keeps_products(
+    potatoes_product_10: Callable[[], Product],
+    sausages_product_10: Callable[[], Product],
+) -> None:
+    potatoes: Product = potatoes_product_10()
+    sausages: Product = sausages_product_10()
+    product_inventory = DeferredProductInventory(stock=[potatoes, sausages])
+
+    product_inventory.reserve_stock([AbstractStockItem(potatoes.entity_id, 6)])
+    product_inventory.reserve_stock([AbstractStockItem(potatoes.entity_id, 4)])
+
+    assert potatoes.amount == 10
+    assert product_inventory.reservations == {potatoes.entity_id: 10}
+
+    with pytest.raises(DomainException):
+        product_inventory.reserve_stock([AbstractStockItem(potatoes.entity_id, 1)])
+
+
+def test_deferred_restock_keeps_products(
+    potatoes_product_10: Callable[[], Product],
+    sausages_product_10: Callable[[], Product],
+) -> None:
+    potatoes: Product = potatoes_product_10()
+    sausages: Product = sausages_product_10()
+    product_inventory = DeferredProductInventory(stock=[potatoes, sausages])
+
+    product_inventory.restock([AbstractStockItem(potatoes.entity_id, 2)])
+    product_inventory.restock(
+        [
+            AbstractStockItem(potatoes.entity_id, 3),
+            AbstractStockItem(sausages.entity_id, 1),
+        ]
+    )
+
+    assert potatoes.amount == 10
+    assert sausages.amount == 10
+    assert product_inventory.restocks == {
+        potatoes.entity_id: 5,
+        sausages.entity_id: 1,
+    }
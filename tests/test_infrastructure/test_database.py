@@ -1,10 +1,29 @@
+import logging
 import sqlite3
+from decimal import Decimal
+from pathlib import Path
 from sqlite3.dbapi2 import IntegrityError
+from typing import Any
+from uuid import uuid4
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
 
+from shop_project.domain.entities.product import Product
 from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.database.models.base import Base
+from shop_project.infrastructure.persistence.database.pool import PoolSettings
+from shop_project.infrastructure.persistence.database.replica_balancer import (
+    RoundRobinReplicaBalancer,
+)
+from shop_project.infrastructure.persistence.persistence_stats_logger import (
+    PersistenceStatsLogger,
+)
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+from shop_project.infrastructure.persistence.uow_retry import RetryMetrics
 
 
 @pytest.mark.asyncio
@@ -79,3 +98,144 @@ async def test_clone_isolation(base_db_in_memory: sqlite3.Connection):
 
     clone_conn_1.close()
     clone_conn_2.close()
+
+
+@pytest.mark.asyncio
+async def test_read_only_plans_routed_to_replica(tmp_path: Path) -> None:
+    # Два файла SQLite вместо основной БД и реплики (без репликации)
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+        for name in ("primary.db", "replica.db")
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    db = Database.from_engine(engines[0], replica_engines=[engines[1]])
+    uow_factory = UnitOfWorkFactory(db)
+    product = Product(uuid4(), name="product", amount=1, price=Decimal(1))
+
+    async with uow_factory.create(QueryBuilder(mutating=True).build()) as uow:
+        uow.get_resources().put(Product, product)
+        uow.mark_commit()
+
+    async def load_products(read_your_writes: bool) -> list[Product]:
+        async with uow_factory.create(
+            QueryBuilder(mutating=False)
+            .load(Product)
+            .from_id([product.entity_id])
+            .no_lock()
+            .build(),
+            read_your_writes=read_your_writes,
+        ) as uow:
+            return uow.get_resources().get_all(Product)
+
+    try:
+        assert await load_products(read_your_writes=False) == []
+        assert await load_products(read_your_writes=True) == [product]
+
+        # Блокирующий план всегда читает основную БД
+        async with uow_factory.create(
+            QueryBuilder(mutating=True)
+            .load(Product)
+            .from_id([product.entity_id])
+            .for_update()
+            .build()
+        ) as uow:
+            assert uow.get_resources().get_all(Product) == [product]
+    finally:
+        await db.close()
+
+
+def test_round_robin_replica_balancer() -> None:
+    replicas = [create_async_engine("sqlite+aiosqlite://") for _ in range(2)]
+    balancer = RoundRobinReplicaBalancer()
+
+    assert [balancer.choose(replicas) for _ in range(4)] == replicas * 2
+
+
+@pytest.mark.asyncio
+async def test_pool_telemetry(tmp_path: Path) -> None:
+    db = Database(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_settings=PoolSettings(pool_size=1, max_overflow=1, pool_timeout=0.1),
+    )
+
+    try:
+        async with db.session(1500), db.session(1500):
+            stats = db.get_pool_stats()["primary"]
+            assert (stats.in_use, stats.checkouts, stats.overflow_checkouts) == (
+                2,
+                2,
+                1,
+            )
+
+            with pytest.raises(PoolTimeoutError):
+                async with db.session(1500):
+                    pass
+
+        stats = db.get_pool_stats()["primary"]
+        assert stats.in_use == 0
+        assert stats.idle == 1
+        assert stats.checkout_timeouts == 1
+        assert sum(stats.checkout_latency_buckets) == 2
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_telemetry_counts_create_session(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    db = Database(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+
+    try:
+        session = db.create_session()
+        await session.execute(select(1))
+        await session.close()
+
+        stats = db.get_pool_stats()["primary"]
+        assert stats.checkouts == 1
+        assert sum(stats.checkout_latency_buckets) == 1
+
+        retry_metrics = RetryMetrics()
+        retry_metrics.observe_retry(PoolTimeoutError())
+
+        with caplog.at_level(logging.INFO, logger="shop_project.persistence"):
+            PersistenceStatsLogger(db, retry_metrics).log_stats()
+        assert "Connection pool primary" in caplog.text
+        assert "retries={'TimeoutError': 1}" in caplog.text
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_lock_timeout_applied_once_per_connection(tmp_path: Path) -> None:
+    db = Database(
+        f"sqlite+aiosqlite:///{tmp_path / 'timeout.db'}",
+        pool_settings=PoolSettings(pool_size=1, max_overflow=0),
+    )
+    pragmas: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any):
+        if statement.startswith("PRAGMA busy_timeout"):
+            pragmas.append(statement)
+
+    event.listen(
+        db.get_engine().sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+    try:
+        for timeout_ms in (1500, 1500, None, 2000, 2000):
+            async with db.session(timeout_ms) as session:
+                await session.execute(select(1))
+
+        assert pragmas == ["PRAGMA busy_timeout = 1500", "PRAGMA busy_timeout = 2000"]
+
+        # Новое соединение к БД снова получает таймаут
+        await db.get_engine().dispose()
+        async with db.session(2000):
+            pass
+        assert len(pragmas) == 3
+    finally:
+        await db.close()
@@ -0,0 +1,66 @@
+import re
+from pathlib import Path
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table
+
+from shop_project.infrastructure.persistence.database.index_advisor import (
+    collect_reference_queries,
+    collect_service_queries,
+    find_missing_indexes,
+    is_indexed,
+)
+from shop_project.infrastructure.persistence.database.models.base import Base
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    RepositoryRegistry,
+)
+from shop_project.infrastructure.persistence.repositories.init_repositories import (
+    init_repositories,
+)
+
+ALEMBIC_VERSIONS_PATH = Path(__file__).parents[2] / "alembic" / "versions"
+
+
+def test_all_filtered_columns_indexed() -> None:
+    init_repositories()
+
+    queries = collect_reference_queries() + collect_service_queries(
+        RepositoryRegistry.get_map().keys()
+    )
+
+    assert queries
+    assert find_missing_indexes(queries) == []
+
+
+def test_is_indexed() -> None:
+    table = Table(
+        "sample",
+        MetaData(),
+        Column("entity_id", Integer, primary_key=True),
+        Column("kind", String(50)),
+        Column("code", String(50)),
+        Column("note", String(50)),
+        Index("ix_sample_code_kind", "code", "kind"),
+    )
+
+    assert is_indexed(table, "entity_id")
+    assert is_indexed(table, "code")
+    assert not is_indexed(table, "note")
+    # Составной индекс работает только вместе со своей первой колонкой
+    assert not is_indexed(table, "kind")
+    assert is_indexed(table, "kind", ["code", "kind"])
+
+
+def test_migrations_create_model_indexes() -> None:
+    init_repositories()
+
+    migrated = set()
+    for path in ALEMBIC_VERSIONS_PATH.glob("*.py"):
+        migrated.update(
+            re.findall(r'op\.create_index\(\s*op\.f\("(\w+)"\)', path.read_text())
+        )
+
+    declared = {
+        index.name for table in Base.metadata.tables.values() for index in table.indexes
+    }
+
+    assert declared == migrated
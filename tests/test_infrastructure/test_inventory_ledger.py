@@ -0,0 +1,137 @@
+from decimal import Decimal
+from typing import Callable, Coroutine, Type
+
+import pytest
+from sqlalchemy import select
+
+from shop_project.domain.entities.customer import Customer
+from shop_project.domain.entities.product import Product
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.database.models.inventory_movement import (
+    InventoryMovement,
+)
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+)
+from shop_project.infrastructure.persistence.inventory_ledger_service import (
+    InventoryLedgerService,
+)
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.query.query_plan import QueryPlan
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+from tests.helpers import AggregateContainer
+
+
+@pytest.mark.asyncio
+async def test_inventory_ledger(
+    uow_factory: UnitOfWorkFactory,
+    prepare_container: Callable[
+        [Type[PersistableEntity]], Coroutine[None, None, AggregateContainer]
+    ],
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    customer_container = await prepare_container(Customer)
+    product = product_factory(name="product", amount=10, price=Decimal(1))
+    await save_entity(product)
+    product_id = product.entity_id
+    ledger_uow_factory = UnitOfWorkFactory(
+        uow_factory.database, read_inventory_ledger=True
+    )
+
+    async def get_stored_amount() -> int:
+        async with uow_factory.database.session(None) as session:
+            stored = await session.scalar(
+                select(ProductORM.amount).where(ProductORM.entity_id == product_id)
+            )
+        assert stored is not None
+        return stored
+
+    async def get_amounts() -> tuple[int, int]:
+        # Остаток через чтение строк (NO_LOCK) и через ORM (блокирующий план)
+        async with ledger_uow_factory.create(
+            QueryBuilder(mutating=False)
+            .load(Product)
+            .from_id([product_id])
+            .no_lock()
+            .build()
+        ) as uow:
+            row_amount = uow.get_resources().get_by_id(Product, product_id).amount
+        async with ledger_uow_factory.create(build_plan()) as uow:
+            orm_amount = uow.get_resources().get_by_id(Product, product_id).amount
+        return row_amount, orm_amount
+
+    def build_plan(lock: bool = True) -> QueryPlan:
+        if lock:
+            return (
+                QueryBuilder(mutating=True)
+                .load(Product)
+                .from_id([product_id])
+                .for_update()
+                .build()
+            )
+
+        # Как в сценариях с журналом: товар читается без блокировки рядом с
+        # заблокированной сущностью
+        return (
+            QueryBuilder(mutating=True)
+            .load(Customer)
+            .from_id([customer_container.aggregate.entity_id])
+            .for_update()
+            .load(Product)
+            .from_id([product_id])
+            .no_lock()
+            .build()
+        )
+
+    # Пополнение - строка журнала, строка product не меняется
+    async with ledger_uow_factory.create(build_plan(lock=False)) as uow:
+        uow.append_movements(Product, "amount", {product_id: 5}, "RECEIVE_SHIPMENT")
+        uow.mark_commit()
+    assert await get_stored_amount() == 10
+    assert await get_amounts() == (15, 15)
+
+    # Без журнала остаток читается только из строки
+    async with uow_factory.create(build_plan()) as uow:
+        assert uow.get_resources().get_by_id(Product, product_id).amount == 10
+
+    # Строки не хватает: списание сворачивает движения товара и повторяется
+    async with ledger_uow_factory.create(build_plan(lock=False)) as uow:
+        uow.conditional_decrement(
+            Product, "amount", {product_id: 12}, reason="ACTIVATE_PURCHASE"
+        )
+        uow.mark_commit()
+    assert await get_stored_amount() == 3
+    assert await get_amounts() == (3, 3)
+
+    # Изменение через сущность пишет в строку только свою разницу
+    async with ledger_uow_factory.create(build_plan(lock=False)) as uow:
+        uow.append_movements(Product, "amount", {product_id: 4}, "RECEIVE_SHIPMENT")
+        uow.mark_commit()
+    async with ledger_uow_factory.create(build_plan()) as uow:
+        uow.get_resources().get_by_id(Product, product_id).restock(1)
+        uow.mark_commit()
+    assert await get_stored_amount() == 4
+    assert await get_amounts() == (8, 8)
+
+    ledger_service = InventoryLedgerService(uow_factory.database)
+    assert await ledger_service.compact() == 1
+    assert await ledger_service.compact() == 0
+    assert await get_stored_amount() == 8
+    assert await get_amounts() == (8, 8)
+
+    async with uow_factory.database.session(None) as session:
+        movements = (
+            await session.execute(
+                select(
+                    InventoryMovement.delta,
+                    InventoryMovement.reason,
+                    InventoryMovement.applied,
+                ).order_by(InventoryMovement.seq)
+            )
+        ).all()
+    assert [tuple(movement) for movement in movements] == [
+        (5, "RECEIVE_SHIPMENT", True),
+        (-12, "ACTIVATE_PURCHASE", True),
+        (4, "RECEIVE_SHIPMENT", True),
+    ]
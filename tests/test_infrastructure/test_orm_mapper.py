@@ -0,0 +1,61 @@
+from typing import Callable, Coroutine, Type
+
+import pytest
+
+from shop_project.application.entities.account import Account
+from shop_project.application.entities.external_id_totp import ExternalIdTotp
+from shop_project.application.entities.operation_log.operation_log import OperationLog
+from shop_project.application.shared.dto.mapper import to_domain, to_dto
+from shop_project.domain.entities.product import Product
+from shop_project.domain.entities.purchase_active import PurchaseActive
+from shop_project.domain.entities.purchase_draft import PurchaseDraft
+from shop_project.domain.entities.purchase_summary import PurchaseSummary
+from shop_project.domain.entities.shipment import Shipment
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    RepositoryRegistry,
+)
+from tests.helpers import AggregateContainer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "model_type",
+    [
+        Account,
+        ExternalIdTotp,
+        OperationLog,
+        Product,
+        PurchaseDraft,
+        PurchaseActive,
+        PurchaseSummary,
+        Shipment,
+    ],
+)
+async def test_direct_mapping_matches_dto(
+    model_type: Type[PersistableEntity],
+    test_db: Database,
+    prepare_container: Callable[
+        [Type[PersistableEntity]], Coroutine[None, None, AggregateContainer]
+    ],
+) -> None:
+    domain_container = await prepare_container(model_type)
+    query = (
+        QueryBuilder(mutating=False)
+        .load(model_type)
+        .from_id([domain_container.aggregate.entity_id])
+        .no_lock()
+        .build()
+        .queries[0]
+    )
+
+    async with test_db.session(1500) as session:
+        repository = RepositoryRegistry.get_map()[model_type](session)
+        via_dto = [to_domain(dto) for dto in await repository.load(query)]
+        direct = await repository.load_domain(query)
+
+    assert len(direct) == 1
+    assert type(direct[0]) is model_type
+    assert to_dto(direct[0]) == to_dto(via_dto[0])
@@ -2,6 +2,8 @@ from typing import Callable
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
 
 from shop_project.domain.entities.customer import Customer
 from shop_project.domain.entities.product import Product
@@ -10,6 +12,9 @@ from shop_project.infrastructure.exceptions import QueryPlanException
 from shop_project.infrastructure.persistence.custom_queries import (
     CountProductsQuery,
 )
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+)
 from shop_project.infrastructure.persistence.query.composed_query import (
     ComposedQuery,
     QueryLock,
@@ -19,6 +24,9 @@ from shop_project.infrastructure.persistence.query.query_criteria import QueryCr
 from shop_project.infrastructure.persistence.query.query_plan import QueryPlan
 from shop_project.infrastructure.persistence.query.value_container import ValueContainer
 from shop_project.infrastructure.persistence.query.value_extractor import ValueExtractor
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    BaseRepository,
+)
 
 
 def test_empty_source():
@@ -120,6 +128,61 @@ def test_lock_violation():
         ).for_update().build()
 
 
+def test_skip_locked():
+    plan: QueryPlan = (
+        QueryBuilder(mutating=True)
+        .load(PurchaseDraft)
+        .from_id([uuid4()])
+        .for_update(skip_locked=True)
+        .build()
+    )
+    assert plan.queries[0].lock == QueryLock.EXCLUSIVE_SKIP_LOCKED
+
+    statement = BaseRepository._apply_lock_mysql(
+        select(ProductORM), QueryLock.EXCLUSIVE_SKIP_LOCKED
+    )
+    assert "FOR UPDATE SKIP LOCKED" in str(statement.compile(dialect=mysql.dialect()))
+
+    with pytest.raises(ValueError):
+        QueryBuilder(mutating=True).load(PurchaseDraft).for_update(
+            no_wait=True, skip_locked=True
+        )
+
+    # Зависимый запрос не может пропускать строки захваченных родителей
+    with pytest.raises(QueryPlanException):
+        (
+            QueryBuilder(mutating=True)
+            .load(PurchaseDraft)
+            .from_id([uuid4()])
+            .for_update()
+            .load(Product)
+            .from_previous()
+            .for_update(skip_locked=True)
+            .build()
+        )
+
+
+def test_optimistic():
+    plan: QueryPlan = (
+        QueryBuilder(mutating=True)
+        .load(PurchaseDraft)
+        .from_id([uuid4()])
+        .optimistic()
+        .build()
+    )
+    assert plan.queries[0].lock == QueryLock.OPTIMISTIC
+
+    statement = BaseRepository._apply_lock_mysql(
+        select(ProductORM), QueryLock.OPTIMISTIC
+    )
+    assert "FOR UPDATE" not in str(statement.compile(dialect=mysql.dialect()))
+
+    with pytest.raises(QueryPlanException):
+        QueryBuilder(mutating=False).load(PurchaseDraft).from_id(
+            [uuid4()]
+        ).optimistic().build()
+
+
 def test_correct_locking_load_order():
     plan: QueryPlan = (
         QueryBuilder(mutating=True)
@@ -0,0 +1,341 @@
+from decimal import Decimal
+from typing import Awaitable, Callable, Coroutine, Sequence, Type
+
+import pytest
+
+from shop_project.application.entities.operation_log.operation_log import OperationLog
+from shop_project.domain.entities.customer import Customer
+from shop_project.domain.entities.product import Product
+from shop_project.domain.entities.purchase_draft import PurchaseDraft
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.database.core import Database
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.repositories.base_repository import (
+    ChildLoading,
+)
+from shop_project.infrastructure.persistence.repositories.implementations.purchase_draft_repository import (
+    PurchaseDraftRepository,
+)
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+from tests.helpers import AggregateContainer
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_single_statement(
+    uow_factory: UnitOfWorkFactory,
+    captured_statements: list[tuple[str, bool]],
+    operation_log_container_factory: Callable[..., AggregateContainer],
+    uow_get_all_single_model: Callable[
+        [Type[PersistableEntity]], Awaitable[Sequence[PersistableEntity]]
+    ],
+) -> None:
+    operation_logs = [operation_log_container_factory().aggregate for _ in range(5)]
+
+    async with uow_factory.create(QueryBuilder(mutating=True).build()) as uow:
+        uow.get_resources().put_many(OperationLog, operation_logs)
+        uow.mark_commit()
+
+    inserts = [
+        (statement, executemany)
+        for statement, executemany in captured_statements
+        if statement.startswith("INSERT INTO operation_log")
+    ]
+    assert len(inserts) == 1
+    assert inserts[0][1]
+
+    loaded = await uow_get_all_single_model(OperationLog)
+    assert {log.entity_id for log in loaded} == {
+        log.entity_id for log in operation_logs
+    }
+
+
+@pytest.mark.asyncio
+async def test_update_writes_only_changed_children(
+    uow_factory: UnitOfWorkFactory,
+    captured_statements: list[tuple[str, bool]],
+    purchase_draft_container_factory: Callable[[], AggregateContainer],
+    product_factory: Callable[..., Product],
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+) -> None:
+    domain_container = purchase_draft_container_factory()
+    purchase_draft: PurchaseDraft = domain_container.aggregate  # type: ignore
+    products = [
+        product_factory(name="product", amount=10, price=Decimal(1)) for _ in range(10)
+    ]
+    for product in products:
+        purchase_draft.add_item(product.entity_id, 1)
+    domain_container.dependencies.dependencies[Product] = products
+    await save_container(domain_container)
+
+    captured_statements.clear()
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=True)
+        .load(PurchaseDraft)
+        .from_id([purchase_draft.entity_id])
+        .for_update()
+        .build()
+    ) as uow:
+        resources = uow.get_resources()
+        draft = resources.get_by_id(PurchaseDraft, purchase_draft.entity_id)
+        draft.add_item(products[0].entity_id, 1)
+        uow.mark_commit()
+
+    item_statements = [
+        statement
+        for statement, _ in captured_statements
+        if "purchase_draft_item" in statement and not statement.startswith("SELECT")
+    ]
+    assert len(item_statements) == 1
+    assert item_statements[0].startswith("UPDATE purchase_draft_item")
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(PurchaseDraft)
+        .from_id([purchase_draft.entity_id])
+        .no_lock()
+        .build()
+    ) as uow:
+        draft = uow.get_resources().get_by_id(PurchaseDraft, purchase_draft.entity_id)
+        assert draft.get_item(products[0].entity_id).amount == 2
+        assert len(draft.items) == 10
+
+
+@pytest.mark.asyncio
+async def test_update_writes_only_changed_columns(
+    uow_factory: UnitOfWorkFactory,
+    captured_statements: list[tuple[str, bool]],
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    product = product_factory(name="product", amount=10, price=Decimal(1))
+    await save_entity(product)
+
+    captured_statements.clear()
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=True)
+        .load(Product)
+        .from_id([product.entity_id])
+        .for_update()
+        .build()
+    ) as uow:
+        uow.get_resources().get_by_id(Product, product.entity_id).reserve(3)
+        uow.mark_commit()
+
+    updates = [
+        statement
+        for statement, _ in captured_statements
+        if statement.startswith("UPDATE product")
+    ]
+    assert len(updates) == 1
+    set_clause = updates[0].split("WHERE")[0]
+    assert "amount" in set_clause
+    assert "name" not in set_clause
+    assert "price" not in set_clause
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("child_loading", "expected_selects"),
+    [
+        (ChildLoading.JOINED, 1),
+        (ChildLoading.SELECTIN, 2),
+        (ChildLoading.RAW, 2),
+    ],
+)
+async def test_child_loading_strategies(
+    monkeypatch: pytest.MonkeyPatch,
+    child_loading: ChildLoading,
+    expected_selects: int,
+    uow_factory: UnitOfWorkFactory,
+    captured_statements: list[tuple[str, bool]],
+    purchase_draft_container_factory: Callable[[], AggregateContainer],
+    product_factory: Callable[..., Product],
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+) -> None:
+    monkeypatch.setattr(PurchaseDraftRepository, "child_loading", child_loading)
+
+    domain_container = purchase_draft_container_factory()
+    purchase_draft: PurchaseDraft = domain_container.aggregate  # type: ignore
+    products = [
+        product_factory(name="product", amount=10, price=Decimal(1)) for _ in range(10)
+    ]
+    for product in products:
+        purchase_draft.add_item(product.entity_id, 1)
+    domain_container.dependencies.dependencies[Product] = products
+    await save_container(domain_container)
+
+    captured_statements.clear()
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=True)
+        .load(PurchaseDraft)
+        .from_id([purchase_draft.entity_id])
+        .for_update()
+        .build()
+    ) as uow:
+        draft = uow.get_resources().get_by_id(PurchaseDraft, purchase_draft.entity_id)
+        assert {item.product_id for item in draft.items} == {
+            product.entity_id for product in products
+        }
+        draft.add_item(products[0].entity_id, 1)
+        uow.mark_commit()
+
+    selects = [
+        statement
+        for statement, _ in captured_statements
+        if statement.startswith("SELECT")
+    ]
+    assert len(selects) == expected_selects
+    assert all("JOIN" not in statement for statement in selects) == (
+        child_loading != ChildLoading.JOINED
+    )
+
+    updates = [
+        statement
+        for statement, _ in captured_statements
+        if statement.startswith("UPDATE purchase_draft_item")
+    ]
+    assert len(updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_keyset_page_filters_by_cursor(
+    uow_factory: UnitOfWorkFactory,
+    captured_statements: list[tuple[str, bool]],
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    products = [
+        product_factory(name="product", amount=1, price=Decimal(1)) for _ in range(3)
+    ]
+    for product in products:
+        await save_entity(product)
+    ids_desc = sorted((product.entity_id for product in products), reverse=True)
+
+    captured_statements.clear()
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(Product)
+        .order_by("entity_id", desc=True)
+        .after(ids_desc[0])
+        .limit(10)
+        .no_lock()
+        .build()
+    ) as uow:
+        loaded = uow.get_resources().get_all(Product)
+
+    assert {product.entity_id for product in loaded} == set(ids_desc[1:])
+
+    selects = [
+        statement
+        for statement, _ in captured_statements
+        if statement.startswith("SELECT")
+    ]
+    assert len(selects) == 1
+    assert "product.entity_id <" in selects[0]
+    assert "ORDER BY product.entity_id DESC" in selects[0]
+
+
+@pytest.mark.asyncio
+async def test_no_lock_load_skips_orm_instances(
+    test_db: Database,
+    purchase_draft_container_factory: Callable[[], AggregateContainer],
+    product_factory: Callable[..., Product],
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+) -> None:
+    domain_container = purchase_draft_container_factory()
+    purchase_draft: PurchaseDraft = domain_container.aggregate  # type: ignore
+    products = [
+        product_factory(name="product", amount=10, price=Decimal(1)) for _ in range(3)
+    ]
+    for product in products:
+        purchase_draft.add_item(product.entity_id, 1)
+    domain_container.dependencies.dependencies[Product] = products
+    await save_container(domain_container)
+
+    query = (
+        QueryBuilder(mutating=False)
+        .load(PurchaseDraft)
+        .from_id([purchase_draft.entity_id])
+        .no_lock()
+        .build()
+        .queries[0]
+    )
+
+    async with test_db.session(1500) as session:
+        loaded = await PurchaseDraftRepository(session).load_domain(query)
+
+        assert len(session.identity_map) == 0
+        assert not session.info.get("strong_set")
+
+    assert len(loaded) == 1
+    assert {item.product_id for item in loaded[0].items} == {
+        product.entity_id for product in products
+    }
+
+
+@pytest.mark.asyncio
+async def test_no_lock_from_previous_chain_single_select(
+    uow_factory: UnitOfWorkFactory,
+    captured_statements: list[tuple[str, bool]],
+    purchase_draft_container_factory: Callable[[], AggregateContainer],
+    product_factory: Callable[..., Product],
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+) -> None:
+    domain_container = purchase_draft_container_factory()
+    purchase_draft: PurchaseDraft = domain_container.aggregate  # type: ignore
+    products = [
+        product_factory(name=f"product {index}", amount=10 + index, price=Decimal(1))
+        for index in range(3)
+    ]
+    for index, product in enumerate(products, start=1):
+        purchase_draft.add_item(product.entity_id, index)
+    domain_container.dependencies.dependencies[Product] = products
+    await save_container(domain_container)
+
+    empty_container = purchase_draft_container_factory()
+    empty_draft: PurchaseDraft = empty_container.aggregate  # type: ignore
+    await save_container(empty_container)
+
+    captured_statements.clear()
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(PurchaseDraft)
+        .from_id([purchase_draft.entity_id, empty_draft.entity_id])
+        .no_lock()
+        .load(Product)
+        .from_previous()
+        .no_lock()
+        .load(Customer)
+        .from_previous(0)
+        .no_lock()
+        .build()
+    ) as uow:
+        resources = uow.get_resources()
+        draft = resources.get_by_id(PurchaseDraft, purchase_draft.entity_id)
+        loaded_empty_draft = resources.get_by_id(PurchaseDraft, empty_draft.entity_id)
+        loaded_products = resources.get_all(Product)
+        loaded_customers = resources.get_all(Customer)
+
+    selects = [
+        statement
+        for statement, _ in captured_statements
+        if statement.startswith("SELECT")
+    ]
+    assert len(selects) == 1
+
+    # Повторы строк из-за соединений схлопнуты
+    assert len(resources.get_all(PurchaseDraft)) == 2
+    assert sorted(item.amount for item in draft.items) == [1, 2, 3]
+    assert loaded_empty_draft.items == []
+    assert {
+        (product.entity_id, product.name, product.amount) for product in loaded_products
+    } == {(product.entity_id, product.name, product.amount) for product in products}
+    assert {customer.entity_id for customer in loaded_customers} == {
+        purchase_draft.customer_id,
+        empty_draft.customer_id,
+    }
@@ -1,9 +1,11 @@
+from decimal import Decimal
 from typing import Callable
 from uuid import uuid4
 
 import pytest
 
 from shop_project.application.shared.dto.mapper import to_dto
+from shop_project.domain.entities.product import Product
 from shop_project.domain.entities.purchase_draft import PurchaseDraft
 from shop_project.infrastructure.exceptions import ResourcesException
 from shop_project.infrastructure.persistence.resource_manager.resource_manager import (
@@ -41,6 +43,82 @@ def test_get_by_attribute(purchase_draft_factory: Callable[[], PurchaseDraft]) -
     ) == [purchase_draft_1]
 
 
+def test_get_by_attribute_follows_put_and_delete(
+    purchase_draft_factory: Callable[[], PurchaseDraft],
+) -> None:
+    container = ResourceContainer(resources_registry=ResourcesRegistry.get_map())
+    purchase_draft_1 = purchase_draft_factory()
+    purchase_draft_2 = purchase_draft_factory()
+
+    container.put(PurchaseDraft, purchase_draft_1)
+    assert (
+        container.get_one_by_attribute(
+            PurchaseDraft, "customer_id", purchase_draft_1.customer_id
+        )
+        == purchase_draft_1
+    )
+
+    container.put(PurchaseDraft, purchase_draft_2)
+    container.delete(PurchaseDraft, purchase_draft_1)
+
+    assert (
+        container.get_one_or_none_by_attribute(
+            PurchaseDraft, "customer_id", purchase_draft_1.customer_id
+        )
+        is None
+    )
+    assert (
+        container.get_one_by_attribute(
+            PurchaseDraft, "customer_id", purchase_draft_2.customer_id
+        )
+        == purchase_draft_2
+    )
+    assert container.get_all(PurchaseDraft) == [purchase_draft_2]
+
+    with pytest.raises(ResourcesException):
+        container.delete(PurchaseDraft, purchase_draft_1)
+
+
+def test_get_by_reference_attribute_after_replace(
+    purchase_draft_factory: Callable[[], PurchaseDraft],
+) -> None:
+    container = ResourceContainer(resources_registry=ResourcesRegistry.get_map())
+    purchase_draft = purchase_draft_factory()
+    container.put(PurchaseDraft, purchase_draft)
+    assert container.get_by_attribute(
+        PurchaseDraft, "customer_id", [purchase_draft.customer_id]
+    ) == [purchase_draft]
+
+    # Сущность с тем же entity_id заменяет прежнюю и в индексе
+    replacement = PurchaseDraft(purchase_draft.entity_id, uuid4())
+    container.put(PurchaseDraft, replacement)
+
+    assert (
+        container.get_by_attribute(
+            PurchaseDraft, "customer_id", [purchase_draft.customer_id]
+        )
+        == []
+    )
+    assert container.get_by_attribute(
+        PurchaseDraft, "customer_id", [replacement.customer_id]
+    ) == [replacement]
+
+
+def test_get_by_changed_attribute(
+    product_factory: Callable[..., Product],
+) -> None:
+    container = ResourceContainer(resources_registry=ResourcesRegistry.get_map())
+    product = product_factory(name="product", amount=10, price=Decimal(1))
+
+    container.put(Product, product)
+    assert container.get_by_attribute(Product, "amount", [10]) == [product]
+
+    product.reserve(3)
+
+    assert container.get_by_attribute(Product, "amount", [7]) == [product]
+    assert container.get_by_attribute(Product, "amount", [10]) == []
+
+
 def test_get_by_wrong_attribute(
     purchase_draft_factory: Callable[[], PurchaseDraft],
 ) -> None:
@@ -116,3 +116,39 @@ def test_difference(purchase_draft_factory: Callable[[], PurchaseDraft]):
     assert difference_by_content_after_side.to_dict()[PurchaseDraft] == [
         to_dto(purchase_draft_1)
     ]
+
+
+def test_diff(purchase_draft_factory: Callable[[], PurchaseDraft]):
+    purchase_draft_updated = purchase_draft_factory()
+    purchase_draft_unchanged = purchase_draft_factory()
+    purchase_draft_deleted = purchase_draft_factory()
+    purchase_draft_created = purchase_draft_factory()
+
+    snapshot_before: ResourceSnapshot = get_resource_snapshot(
+        {
+            PurchaseDraft: [
+                purchase_draft_updated,
+                purchase_draft_unchanged,
+                purchase_draft_deleted,
+            ]
+        }
+    )
+
+    purchase_draft_updated.finalize()
+
+    snapshot_after: ResourceSnapshot = get_resource_snapshot(
+        {
+            PurchaseDraft: [
+                purchase_draft_updated,
+                purchase_draft_unchanged,
+                purchase_draft_created,
+            ]
+        }
+    )
+
+    diff = snapshot_after.diff(snapshot_before)[PurchaseDraft]
+
+    assert [item.snapshot for item in diff.created] == [to_dto(purchase_draft_created)]
+    assert [item.snapshot for item in diff.updated] == [to_dto(purchase_draft_updated)]
+    assert [item.snapshot for item in diff.deleted] == [to_dto(purchase_draft_deleted)]
+    assert diff.changed_fields == {purchase_draft_updated.entity_id: {"state"}}
@@ -0,0 +1,72 @@
+from decimal import Decimal
+from typing import Callable, Coroutine
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+
+from shop_project.domain.entities.product import Product
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.query.statement_cache import (
+    StatementCache,
+    statement_cache,
+)
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+
+
+def test_statement_cache_lru() -> None:
+    cache = StatementCache(max_size=2)
+
+    first = cache.get_or_build("a", lambda: select(1))
+    assert cache.get_or_build("a", lambda: select(2)) is first
+    cache.get_or_build("b", lambda: select(2))
+    cache.get_or_build("c", lambda: select(3))
+
+    assert cache.get_or_build("a", lambda: select(4)) is not first
+
+    stats = cache.get_stats()
+    assert (stats["a"].hits, stats["a"].misses) == (1, 2)
+    assert (stats["c"].hits, stats["c"].misses) == (0, 1)
+
+
+def test_statement_cache_stats_bounded() -> None:
+    cache = StatementCache(max_size=2, stats_max_size=3)
+
+    for key in range(10):
+        cache.get_or_build(key, lambda: select(1))
+
+    assert list(cache.get_stats()) == [7, 8, 9]
+
+
+@pytest.mark.asyncio
+async def test_statement_reused_with_new_values(
+    uow_factory: UnitOfWorkFactory,
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    products = [
+        product_factory(name="product", amount=1, price=Decimal(1)) for _ in range(3)
+    ]
+    for product in products:
+        await save_entity(product)
+
+    statement_cache.clear()
+
+    async def load_products(ids: list[UUID]) -> set[UUID]:
+        async with uow_factory.create(
+            QueryBuilder(mutating=False).load(Product).from_id(ids).no_lock().build()
+        ) as uow:
+            return {
+                product.entity_id for product in uow.get_resources().get_all(Product)
+            }
+
+    assert await load_products([products[0].entity_id]) == {products[0].entity_id}
+    assert await load_products([products[1].entity_id, products[2].entity_id]) == {
+        products[1].entity_id,
+        products[2].entity_id,
+    }
+
+    stats = list(statement_cache.get_stats().values())
+    assert len(stats) == 1
+    assert (stats[0].hits, stats[0].misses) == (1, 1)
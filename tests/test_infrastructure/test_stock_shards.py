@@ -0,0 +1,122 @@
+from decimal import Decimal
+from typing import Callable, Coroutine
+
+import pytest
+from sqlalchemy import select
+
+from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConditionalDecrementException,
+)
+from shop_project.domain.entities.product import Product
+from shop_project.domain.interfaces.persistable_entity import PersistableEntity
+from shop_project.infrastructure.persistence.database.models.product import (
+    Product as ProductORM,
+    ProductStockShard,
+)
+from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.query.query_plan import QueryPlan
+from shop_project.infrastructure.persistence.stock_shard_service import (
+    StockShardService,
+)
+from shop_project.infrastructure.persistence.stock_shards import split_amount
+from shop_project.infrastructure.persistence.unit_of_work import UnitOfWorkFactory
+
+
+def test_split_amount() -> None:
+    assert split_amount(10, 3) == [4, 3, 3]
+    assert split_amount(2, 4) == [1, 1, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_sharded_product_stock(
+    uow_factory: UnitOfWorkFactory,
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    product = product_factory(name="product", amount=10, price=Decimal(1))
+    await save_entity(product)
+    product_id = product.entity_id
+    shard_service = StockShardService(uow_factory.database)
+
+    async def get_shard_amounts() -> list[int]:
+        async with uow_factory.database.session(None) as session:
+            result = await session.execute(
+                select(ProductStockShard.amount)
+                .where(ProductStockShard.product_id == product_id)
+                .order_by(ProductStockShard.shard_index)
+            )
+            return list(result.scalars())
+
+    async def get_stored_amount() -> int | None:
+        async with uow_factory.database.session(None) as session:
+            return await session.scalar(
+                select(ProductORM.amount).where(ProductORM.entity_id == product_id)
+            )
+
+    async def get_amounts() -> tuple[int, int]:
+        # Остаток через чтение строк (NO_LOCK) и через ORM (блокирующий план)
+        async with uow_factory.create(
+            QueryBuilder(mutating=False)
+            .load(Product)
+            .from_id([product_id])
+            .no_lock()
+            .build()
+        ) as uow:
+            row_amount = uow.get_resources().get_by_id(Product, product_id).amount
+        async with uow_factory.create(
+            QueryBuilder(mutating=True)
+            .load(Product)
+            .from_id([product_id])
+            .for_update()
+            .build()
+        ) as uow:
+            orm_amount = uow.get_resources().get_by_id(Product, product_id).amount
+        return row_amount, orm_amount
+
+    def build_plan() -> QueryPlan:
+        return (
+            QueryBuilder(mutating=True)
+            .load(Product)
+            .from_id([product_id])
+            .for_update()
+            .build()
+        )
+
+    await shard_service.set_shard_count(product_id, 3)
+    assert await get_shard_amounts() == [4, 3, 3]
+    assert await get_amounts() == (10, 10)
+
+    # Атомарное списание уходит в один шард
+    async with uow_factory.create(build_plan()) as uow:
+        uow.conditional_decrement(Product, "amount", {product_id: 3})
+        uow.mark_commit()
+    assert sum(await get_shard_amounts()) == 7
+
+    # Списание через сущность больше любого шарда собирается из нескольких
+    async with uow_factory.create(build_plan()) as uow:
+        uow.get_resources().get_by_id(Product, product_id).reserve(6)
+        uow.mark_commit()
+    assert await get_amounts() == (1, 1)
+    assert all(amount >= 0 for amount in await get_shard_amounts())
+
+    async with uow_factory.create(build_plan()) as uow:
+        uow.get_resources().get_by_id(Product, product_id).restock(5)
+        uow.mark_commit()
+
+    # Столбец amount шардированного товара не меняется
+    assert await get_stored_amount() == 0
+
+    assert await shard_service.rebalance() == 1
+    assert await get_shard_amounts() == [2, 2, 2]
+    assert await shard_service.rebalance() == 0
+
+    with pytest.raises(ConditionalDecrementException):
+        async with uow_factory.create(build_plan()) as uow:
+            uow.conditional_decrement(Product, "amount", {product_id: 7})
+            uow.mark_commit()
+    assert await get_shard_amounts() == [2, 2, 2]
+
+    await shard_service.set_shard_count(product_id, 0)
+    assert await get_shard_amounts() == []
+    assert await get_amounts() == (6, 6)
+    assert await get_stored_amount() == 6
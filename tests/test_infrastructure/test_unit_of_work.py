@@ -1,7 +1,10 @@
 from datetime import timedelta
+from decimal import Decimal
 from typing import AsyncContextManager, Awaitable, Callable, Coroutine, Type
+from uuid import UUID, uuid4
 
 import pytest
+from dishka.async_container import AsyncContainer
 from dishka.container import Container
 
 from shop_project.application.entities.account import Account, SubjectEnum
@@ -11,8 +14,14 @@ from shop_project.application.entities.external_id_totp import ExternalIdTotp
 from shop_project.application.entities.operation_log.operation_log import OperationLog
 from shop_project.application.entities.task import Task
 from shop_project.application.shared.dto.mapper import to_dto
+from shop_project.application.shared.interfaces.interface_query_plan import IQueryPlan
 from shop_project.application.shared.interfaces.interface_unit_of_work import (
+    ConcurrentModificationException,
+    ConditionalDecrementException,
+    DeadlockDetectedException,
+    IUnitOfWork,
     LockTimeoutException,
+    RetryPolicy,
 )
 from shop_project.domain.entities.customer import Customer
 from shop_project.domain.entities.employee import Employee
@@ -29,12 +38,18 @@ from shop_project.domain.entities.shipment import Shipment
 from shop_project.domain.entities.shipment_summary import ShipmentSummary
 from shop_project.domain.interfaces.persistable_entity import PersistableEntity
 from shop_project.domain.services.shipment_cancel_service import ShipmentCancelService
-from shop_project.infrastructure.exceptions import ResourcesException
+from shop_project.infrastructure.exceptions import (
+    QueryPlanException,
+    ResourcesException,
+    UnitOfWorkException,
+)
 from shop_project.infrastructure.persistence.query.query_builder import QueryBuilder
+from shop_project.infrastructure.persistence.query.query_plan import QueryPlan
 from shop_project.infrastructure.persistence.unit_of_work import (
     UnitOfWork,
     UnitOfWorkFactory,
 )
+from shop_project.infrastructure.persistence.uow_retry import RetryMetrics
 from tests.helpers import AggregateContainer
 
 
@@ -975,3 +990,317 @@ async def test_timeout(
                 wait_timeout_ms=300,
             ) as uow2:
                 pass
+
+
+@pytest.mark.asyncio
+async def test_read_only_entities_frozen(
+    uow_factory: UnitOfWorkFactory,
+    purchase_draft_container_factory: Callable[[], AggregateContainer],
+    save_container: Callable[[AggregateContainer], Coroutine[None, None, None]],
+) -> None:
+    domain_container = purchase_draft_container_factory()
+    purchase_draft: PurchaseDraft = domain_container.aggregate  # type: ignore
+    await save_container(domain_container)
+
+    frozen_uow_factory = UnitOfWorkFactory(uow_factory.database, freeze_read_only=True)
+    async with frozen_uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(PurchaseDraft)
+        .from_id([purchase_draft.entity_id])
+        .no_lock()
+        .build()
+    ) as uow:
+        loaded = uow.get_resources().get_by_id(PurchaseDraft, purchase_draft.entity_id)
+
+        assert isinstance(loaded, PurchaseDraft)
+        assert loaded == purchase_draft
+        assert to_dto(loaded) == to_dto(purchase_draft)
+
+        with pytest.raises(UnitOfWorkException):
+            loaded.finalize()
+        with pytest.raises(UnitOfWorkException):
+            loaded.add_item(uuid4(), 1)
+
+        # Обёртка не меняет загруженную сущность
+        assert to_dto(loaded) == to_dto(purchase_draft)
+
+
+@pytest.mark.asyncio
+async def test_stream_ids_in_chunks(
+    uow_factory: UnitOfWorkFactory,
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    products = [
+        product_factory(name="product", amount=1, price=Decimal(1)) for _ in range(5)
+    ]
+    for product in products:
+        await save_entity(product)
+
+    chunks: list[list[UUID]] = []
+    async for entity_ids in uow_factory.stream_ids(
+        QueryBuilder(mutating=False)
+        .load(Product)
+        .from_attribute("name", ["product"])
+        .no_lock()
+        .build(),
+        chunk_size=2,
+    ):
+        chunks.append(entity_ids)
+
+        async with uow_factory.create(
+            QueryBuilder(mutating=True)
+            .load(Product)
+            .from_id(entity_ids)
+            .for_update()
+            .build()
+        ) as uow:
+            for product in uow.get_resources().get_all(Product):
+                product.restock(1)
+            uow.mark_commit()
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert {entity_id for chunk in chunks for entity_id in chunk} == {
+        product.entity_id for product in products
+    }
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(Product)
+        .from_id([product.entity_id for product in products])
+        .no_lock()
+        .build()
+    ) as uow:
+        assert all(
+            product.amount == 2 for product in uow.get_resources().get_all(Product)
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_retries_lock_conflicts(
+    uow_factory: UnitOfWorkFactory,
+    product_factory: Callable[..., Product],
+) -> None:
+    retry_factory = UnitOfWorkFactory(uow_factory.database)
+    policy = RetryPolicy(max_attempts=3, base_delay_ms=0)
+    product = product_factory(name="product", amount=1, price=Decimal(1))
+    attempts: list[int] = []
+
+    async def put_product(uow: IUnitOfWork) -> int:
+        attempts.append(len(attempts) + 1)
+        if len(attempts) == 1:
+            raise DeadlockDetectedException()
+
+        uow.get_resources().put(Product, product)
+        uow.mark_commit()
+        return len(attempts)
+
+    assert (
+        await retry_factory.run(
+            lambda: QueryBuilder(mutating=True).build(), put_product, policy
+        )
+        == 2
+    )
+
+    async def always_locked(uow: IUnitOfWork) -> None:
+        raise LockTimeoutException()
+
+    with pytest.raises(LockTimeoutException):
+        await retry_factory.run(
+            lambda: QueryBuilder(mutating=True).build(), always_locked, policy
+        )
+
+    stats = retry_factory.retry_metrics.get_stats()
+    assert stats.runs == 2
+    assert stats.retries == {"DeadlockDetectedException": 1, "LockTimeoutException": 2}
+    assert stats.exhausted == {"LockTimeoutException": 1}
+    assert stats.recovered == 1
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(Product)
+        .from_id([product.entity_id])
+        .no_lock()
+        .build()
+    ) as uow:
+        assert uow.get_resources().get_all(Product) == [product]
+
+
+@pytest.mark.asyncio
+async def test_run_retry_builds_fresh_query_plan(
+    uow_factory: UnitOfWorkFactory,
+    product_factory: Callable[..., Product],
+    fill_database: Callable[
+        [dict[Type[PersistableEntity], list[PersistableEntity]]], Awaitable[None]
+    ],
+) -> None:
+    product = product_factory(name="product", amount=2, price=Decimal(1))
+    await fill_database({Product: [product]})
+    query_plans: list[IQueryPlan] = []
+
+    def build_query_plan() -> IQueryPlan:
+        query_plan = (
+            QueryBuilder(mutating=True)
+            .load(Product)
+            .from_id([product.entity_id])
+            .for_update()
+            .build()
+        )
+        query_plans.append(query_plan)
+        return query_plan
+
+    async def take_one(uow: IUnitOfWork) -> int:
+        [loaded] = uow.get_resources().get_all(Product)
+        loaded.amount -= 1
+        uow.mark_commit()
+        if len(query_plans) == 1:
+            raise DeadlockDetectedException()
+
+        return loaded.amount
+
+    assert (
+        await uow_factory.run(
+            build_query_plan, take_one, RetryPolicy(max_attempts=2, base_delay_ms=0)
+        )
+        == 1
+    )
+    assert len(query_plans) == 2
+    assert query_plans[0] is not query_plans[1]
+
+    # Первая попытка откатилась
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(Product)
+        .from_id([product.entity_id])
+        .no_lock()
+        .build()
+    ) as uow:
+        [loaded] = uow.get_resources().get_all(Product)
+        assert loaded.amount == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_metrics_are_app_scoped(
+    base_async_container: AsyncContainer,
+    async_container: AsyncContainer,
+) -> None:
+    uow_factory = await async_container.get(UnitOfWorkFactory)
+
+    assert uow_factory.retry_metrics is await base_async_container.get(RetryMetrics)
+
+
+@pytest.mark.asyncio
+async def test_conditional_decrement(
+    uow_factory: UnitOfWorkFactory,
+    prepare_container: Callable[
+        [Type[PersistableEntity]], Coroutine[None, None, AggregateContainer]
+    ],
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    customer_container = await prepare_container(Customer)
+    first = product_factory(name="first", amount=1, price=Decimal(1))
+    second = product_factory(name="second", amount=5, price=Decimal(1))
+    for product in (first, second):
+        await save_entity(product)
+
+    def build_plan() -> QueryPlan:
+        return (
+            QueryBuilder(mutating=True)
+            .load(Customer)
+            .from_id([customer_container.aggregate.entity_id])
+            .for_update()
+            .load(Product)
+            .from_id([first.entity_id, second.entity_id])
+            .no_lock()
+            .build()
+        )
+
+    async with uow_factory.create(build_plan()) as uow:
+        uow.conditional_decrement(Product, "amount", {second.entity_id: 3})
+        uow.mark_commit()
+
+    # Второе списание не проходит, первое откатывается вместе с ним
+    with pytest.raises(ConditionalDecrementException) as exc_info:
+        async with uow_factory.create(build_plan()) as uow:
+            uow.conditional_decrement(
+                Product, "amount", {first.entity_id: 1, second.entity_id: 3}
+            )
+            uow.mark_commit()
+    assert exc_info.value.entity_ids == [second.entity_id]
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(Product)
+        .from_id([first.entity_id, second.entity_id])
+        .no_lock()
+        .build()
+    ) as uow:
+        amounts = {
+            product.entity_id: product.amount
+            for product in uow.get_resources().get_all(Product)
+        }
+        assert amounts == {first.entity_id: 1, second.entity_id: 2}
+
+
+@pytest.mark.asyncio
+async def test_optimistic_version_conflict(
+    uow_factory: UnitOfWorkFactory,
+    prepare_container: Callable[
+        [Type[PersistableEntity]], Coroutine[None, None, AggregateContainer]
+    ],
+    product_factory: Callable[..., Product],
+    save_entity: Callable[[PersistableEntity], Coroutine[None, None, None]],
+) -> None:
+    draft_container = await prepare_container(PurchaseDraft)
+    draft_id = draft_container.aggregate.entity_id
+    products = [
+        product_factory(name="product", amount=10, price=Decimal(1)) for _ in range(2)
+    ]
+    for product in products:
+        await save_entity(product)
+
+    def build_plan() -> QueryPlan:
+        return (
+            QueryBuilder(mutating=True)
+            .load(PurchaseDraft)
+            .from_id([draft_id])
+            .optimistic()
+            .build()
+        )
+
+    # Меняются только позиции черновика, версия родителя всё равно растёт
+    with pytest.raises(ConcurrentModificationException):
+        async with uow_factory.create(build_plan()) as stale_uow:
+            async with uow_factory.create(build_plan()) as uow:
+                uow.get_resources().get_by_id(PurchaseDraft, draft_id).add_item(
+                    products[0].entity_id, 1
+                )
+                uow.mark_commit()
+
+            stale_uow.get_resources().get_by_id(PurchaseDraft, draft_id).add_item(
+                products[1].entity_id, 1
+            )
+            stale_uow.mark_commit()
+
+    async with uow_factory.create(
+        QueryBuilder(mutating=False)
+        .load(PurchaseDraft)
+        .from_id([draft_id])
+        .no_lock()
+        .build()
+    ) as uow:
+        purchase_draft = uow.get_resources().get_by_id(PurchaseDraft, draft_id)
+        assert [item.product_id for item in purchase_draft.items] == [
+            products[0].entity_id
+        ]
+
+    with pytest.raises(QueryPlanException):
+        async with uow_factory.create(
+            QueryBuilder(mutating=True)
+            .load(Customer)
+            .from_id([uuid4()])
+            .optimistic()
+            .build()
+        ):
+            pass